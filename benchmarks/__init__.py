@@ -0,0 +1 @@
+"""Load benchmarks for the FastLibrarian API against a local PostgreSQL."""
@@ -0,0 +1,111 @@
+"""Measure duplicate clustering on a synthetic catalog.
+
+Uses the seeded catalog shape (``benchmarks.seed.generate``) with a share
+of its books duplicated as title variants: a trailing article, an edition
+suffix or a one-letter typo. The seeded titles' numbers are spelled as
+made-up words, since titles with different numbers are never compared and
+would make the run unrealistically fast. No database is needed; this times the
+CPU-bound part of ``fastlibrarian.modules.dedupe`` and reports how many of
+the injected duplicates were found.
+
+Usage::
+
+    python -m benchmarks.dedupe --size 1m
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+import uuid
+
+from benchmarks.seed import SIZES, generate
+from fastlibrarian.modules.dedupe import cluster_books
+from fastlibrarian.normalize import title_key
+
+
+NUMBER_RE = re.compile(r"\d+$")
+SYLLABLES = [c + v for c in "bdfgklmnprstvz" for v in "aeiou"]
+
+
+def spell(match: re.Match) -> str:
+    """Spell a number as a pronounceable made-up word."""
+    n = int(match.group())
+    word = ""
+    while True:
+        n, syllable = divmod(n, len(SYLLABLES))
+        word += SYLLABLES[syllable]
+        if not n:
+            return word.title()
+
+
+def variant(rng: random.Random, title: str) -> str:
+    kind = rng.randrange(3)
+    if kind == 0 and title.startswith("The "):
+        return f"{title[4:]}, The"
+    if kind == 1:
+        return f"{title} (Unabridged)"
+    # Swap two neighbouring letters of the longest word
+    words = title.split()
+    i = max(range(len(words)), key=lambda w: len(words[w]))
+    word = words[i]
+    j = rng.randrange(1, len(word) - 1)
+    words[i] = word[: j - 1] + word[j] + word[j - 1] + word[j + 1 :]
+    return " ".join(words)
+
+
+def build_blocks(
+    size: int,
+    duplicate_rate: float,
+    seed: int,
+) -> tuple[list[list[tuple[uuid.UUID, str]]], int]:
+    rng = random.Random(seed)
+    rows = generate(size, seed)
+    titles = {row[0]: NUMBER_RE.sub(spell, row[1]) for row in rows["books"]}
+    blocks: dict[uuid.UUID, list[tuple[uuid.UUID, str]]] = {}
+    for author_id, book_id in rows["author_books"]:
+        blocks.setdefault(author_id, []).append((book_id, title_key(titles[book_id])))
+    injected = 0
+    for block in blocks.values():
+        for _book_id, _key in list(block):
+            if rng.random() < duplicate_rate:
+                original = titles[_book_id]
+                block.append((uuid.uuid4(), title_key(variant(rng, original))))
+                injected += 1
+    return [b for b in blocks.values() if len(b) > 1], injected
+
+
+def run(size: int, duplicate_rate: float, threshold: float, seed: int) -> dict:
+    start = time.perf_counter()
+    blocks, injected = build_blocks(size, duplicate_rate, seed)
+    prepared = time.perf_counter() - start
+    start = time.perf_counter()
+    clusters, stats = cluster_books(blocks, threshold)
+    elapsed = time.perf_counter() - start
+    return {
+        "books": size,
+        "blocks": stats.blocks,
+        "oversized_blocks": stats.oversized,
+        "largest_block": max(len(b) for b in blocks),
+        "comparisons": stats.comparisons,
+        "injected_duplicates": injected,
+        "found_duplicates": sum(len(c) - 1 for c in clusters),
+        "prepare_seconds": round(prepared, 1),
+        "cluster_seconds": round(elapsed, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=SIZES, default="100k")
+    parser.add_argument("--duplicates", type=float, default=0.02)
+    parser.add_argument("--threshold", type=float, default=0.92)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    result = run(SIZES[args.size], args.duplicates, args.threshold, args.seed)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""A local stand-in for the Hardcover GraphQL API.
+
+Answers the author search and contributions operations FastLibrarian sends
+with deterministic data matching ``benchmarks.seed``: author ``n`` has
+``hardcover_id`` ``n``. Automatic persisted queries are supported like an
+Apollo server does. An optional delay simulates network latency.
+"""
+
+import asyncio
+import hashlib
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+def create_app(works_per_author: int = 20, latency: float = 0.0) -> FastAPI:
+    """Build the fake API.
+
+    Args:
+        works_per_author: Books returned for every author's contributions.
+        latency: Seconds to wait before answering each request.
+    """
+    app = FastAPI()
+    app.state.requests = 0
+
+    def search(name: str) -> dict:
+        hits = [
+            {"document": {"id": 900_000 + i, "name": f"{name} {i}", "bio": None}}
+            for i in range(3)
+        ]
+        hits.insert(0, {"document": {"id": 1, "name": name, "bio": "A writer."}})
+        return {"search": {"results": {"hits": hits}}}
+
+    def contributions(author_id: int, limit: int | None, offset: int) -> dict:
+        books = []
+        end = (
+            works_per_author if limit is None else min(offset + limit, works_per_author)
+        )
+        for i in range(offset, end):
+            book_id = author_id * 1000 + i
+            series_index = i // 5
+            books.append(
+                {
+                    "book": {
+                        "id": book_id,
+                        "title": f"Hardcover Work {author_id}-{i}",
+                        "description": None,
+                        "slug": f"work-{book_id}",
+                        "editions": [
+                            {"asin": None, "isbn_10": None, "isbn_13": None},
+                        ],
+                        "book_series": (
+                            [
+                                {
+                                    "position": i % 5 + 1,
+                                    "series": {
+                                        "id": author_id * 100 + series_index,
+                                        "name": f"Series {author_id}-{series_index}",
+                                    },
+                                },
+                            ]
+                            if i % 2
+                            else []
+                        ),
+                    },
+                },
+            )
+        return {"contributions": books}
+
+    # Documents registered by automatic persisted queries, by SHA-256
+    persisted: dict[str, str] = {}
+
+    # httpx appends a slash to the client's base URL
+    @app.post("/graphql")
+    @app.post("/graphql/")
+    async def graphql(request: Request) -> dict:
+        app.state.requests += 1
+        if latency:
+            await asyncio.sleep(latency)
+        payload = await request.json()
+        query = payload.get("query")
+        variables = payload.get("variables") or {}
+        extensions = payload.get("extensions") or {}
+        sha256 = (extensions.get("persistedQuery") or {}).get("sha256Hash")
+        if sha256:
+            if query is None:
+                query = persisted.get(sha256)
+                if query is None:
+                    return {
+                        "errors": [
+                            {
+                                "message": "PersistedQueryNotFound",
+                                "extensions": {"code": "PERSISTED_QUERY_NOT_FOUND"},
+                            },
+                        ],
+                    }
+            elif hashlib.sha256(query.encode()).hexdigest() == sha256:
+                persisted[sha256] = query
+        query = query or ""
+        if "contributions" in query:
+            return {
+                "data": contributions(
+                    int(variables.get("authorId", 0)),
+                    variables.get("limit"),
+                    variables.get("offset", 0),
+                ),
+            }
+        if "search" in query:
+            return {"data": search(variables.get("query", ""))}
+        return {"errors": [{"message": "Unsupported operation"}]}
+
+    return app
+
+
+class FakeHardcoverServer:
+    """Run the fake API with uvicorn in a background thread."""
+
+    def __init__(
+        self,
+        port: int = 8765,
+        works_per_author: int = 20,
+        latency: float = 0.0,
+    ) -> None:
+        self.app = create_app(works_per_author, latency)
+        self.server = uvicorn.Server(
+            uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning"),
+        )
+        self.url = f"http://127.0.0.1:{port}/graphql"
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        return self.app.state.requests
+
+    def __enter__(self) -> "FakeHardcoverServer":
+        self._thread.start()
+        while not self.server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError(f"Fake Hardcover failed to start on {self.url}")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self._thread.join()
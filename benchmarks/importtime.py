@@ -0,0 +1,102 @@
+"""Check the app's cold start import time against a budget.
+
+Runs ``python -X importtime`` in fresh interpreters for two stages:
+``import`` (``import fastlibrarian.main``) and ``app`` (building the app
+with ``create_app()``, as a worker does). Each stage's total is the smallest
+of several runs, since the first run also warms the OS file cache. Totals
+and the slowest top-level imports are printed, and the exit status is 1 if
+a stage is over its budget in ``importtime_budget.json`` or imported a
+module that should stay deferred. Update the budget in the same commit as
+a change that legitimately moves it.
+
+Usage::
+
+    python -m benchmarks.importtime --runs 5
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_FILE = Path(__file__).with_name("importtime_budget.json")
+
+STAGES = {
+    "import": "import fastlibrarian.main",
+    "app": "import fastlibrarian.main as m; m.create_app()",
+}
+
+
+def measure(code: str) -> dict[str, tuple[int, int, int]]:
+    """Nesting depth, self and cumulative microseconds per module imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        # Nesting is kept in the indentation: one space, then two per level
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (depth, int(self_us), int(cumulative_us))
+    return modules
+
+
+def total_ms(modules: dict[str, tuple[int, int, int]]) -> float:
+    return sum(self_us for _, self_us, _ in modules.values()) / 1000
+
+
+def run(runs: int, top: int) -> tuple[dict, list[str]]:
+    budget = json.loads(BUDGET_FILE.read_text())
+    # Modules every interpreter imports at startup (site, encodings, .pth
+    # hooks) are not the app's to budget
+    startup = measure("pass").keys()
+    report: dict = {}
+    failures = []
+    for stage, code in STAGES.items():
+        best = min(
+            (
+                {n: m for n, m in measure(code).items() if n not in startup}
+                for _ in range(runs)
+            ),
+            key=total_ms,
+        )
+        stage_ms = total_ms(best)
+        slowest = sorted(
+            ((n, c) for n, (depth, _, c) in best.items() if depth <= 1),
+            key=lambda item: -item[1],
+        )
+        limit_ms = budget[stage]["max_ms"]
+        deferred = [m for m in budget[stage]["deferred"] if m in best]
+        report[stage] = {
+            "total_ms": round(stage_ms, 1),
+            "budget_ms": limit_ms,
+            "slowest": {name: round(c / 1000, 1) for name, c in slowest[:top]},
+            "imported_deferred": deferred,
+        }
+        if stage_ms > limit_ms:
+            failures.append(f"{stage}: {stage_ms:.0f} ms is over {limit_ms} ms")
+        if deferred:
+            failures.append(f"{stage}: imported deferred modules {deferred}")
+    return report, failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    report, failures = run(args.runs, args.top)
+    print(json.dumps(report, indent=2))
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
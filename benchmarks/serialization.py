@@ -0,0 +1,105 @@
+"""Compare list response serialization paths on synthetic books.
+
+``before`` is the default FastAPI path (models returned from the handler,
+re-validated against ``response_model`` and encoded with
+``jsonable_encoder``); ``after`` returns ``json_list_response``. No database
+is needed: rows are plain objects shaped like loaded ``Book`` rows.
+
+Usage::
+
+    python -m benchmarks.serialization --books 50000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+
+from fastlibrarian.models.schemas import BookRead
+from fastlibrarian.responses import json_list_response
+
+
+def fake_books(count: int) -> list[SimpleNamespace]:
+    authors = [
+        SimpleNamespace(id=uuid.uuid4(), name=f"Author {i}")
+        for i in range(max(1, count // 8))
+    ]
+    series = [
+        SimpleNamespace(id=uuid.uuid4(), name=f"Series {i}")
+        for i in range(max(1, count // 5))
+    ]
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            title=f"Book {i}",
+            description="A long description of the book. " * 8,
+            editions=[{"isbn_13": f"979{i:010d}", "isbn_10": None, "asin": None}],
+            external_refs={"hardcover_id": i},
+            status="Wanted",
+            a_status="Ignored",
+            p_status=None,
+            authors=[authors[i % len(authors)]],
+            series=[series[i % len(series)]] if i % 3 else [],
+        )
+        for i in range(count)
+    ]
+
+
+def create_app(books: list[SimpleNamespace]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=list[BookRead])
+    async def before() -> list[BookRead]:
+        return [BookRead.model_validate(b) for b in books]
+
+    @app.get("/after", response_model=list[BookRead])
+    async def after():
+        return json_list_response(books, BookRead.model_validate, BookRead)
+
+    return app
+
+
+async def measure(app: FastAPI, path: str, runs: int) -> dict[str, float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            response = await c.get(path)
+            times.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 1),
+        "min_ms": round(min(times) * 1000, 1),
+        "bytes": len(response.content),
+    }
+
+
+async def run(books: int, runs: int) -> dict:
+    app = create_app(fake_books(books))
+    before = await measure(app, "/before", runs)
+    after = await measure(app, "/after", runs)
+    return {
+        "books": books,
+        "runs": runs,
+        "before": before,
+        "after": after,
+        "speedup": round(before["median_ms"] / after["median_ms"], 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--books", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.books, args.runs)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure the typeahead prefix index on a synthetic catalog.
+
+Loads the seeded catalog's author, series and book names
+(``benchmarks.seed.generate``) into ``fastlibrarian.typeahead`` without a
+database, then times lookups for prefixes of random names, one to eight
+characters long as a user types them. Reports build time, memory and
+lookup latency percentiles.
+
+Usage::
+
+    python -m benchmarks.typeahead --size 1m
+"""
+
+import argparse
+import json
+import random
+import time
+
+from benchmarks.seed import SIZES, generate
+from fastlibrarian.typeahead import TypeaheadIndex
+
+
+def run(size: int, lookups: int, seed: int) -> dict:
+    rows = generate(size, seed)
+    names = {
+        kind: [(row[0], row[1]) for row in rows[table]]
+        for kind, table in (
+            ("author", "authors"),
+            ("series", "series"),
+            ("book", "books"),
+        )
+    }
+    index = TypeaheadIndex()
+    start = time.perf_counter()
+    index.load(names)
+    built = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    all_names = [name for kind_rows in names.values() for _, name in kind_rows]
+    timings = []
+    hits = 0
+    for _ in range(lookups):
+        name = rng.choice(all_names)
+        query = name[: rng.randint(1, 8)]
+        start = time.perf_counter()
+        hits += len(index.lookup(query))
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "names": index.size,
+        "keys": index.keys,
+        "memory_mib": round(index.memory_bytes / 2**20, 1),
+        "build_seconds": round(built, 1),
+        "lookups": lookups,
+        "mean_hits": round(hits / lookups, 1),
+        "p50_us": round(timings[len(timings) // 2] * 1e6, 1),
+        "p99_us": round(timings[int(len(timings) * 0.99)] * 1e6, 1),
+        "max_us": round(timings[-1] * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", choices=SIZES, default="100k")
+    parser.add_argument("--lookups", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    result = run(SIZES[args.size], args.lookups, args.seed)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
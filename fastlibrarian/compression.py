@@ -0,0 +1,226 @@
+"""Negotiated response compression.
+
+gzip is always available; brotli and zstd are used when the optional
+``brotli`` and ``zstandard`` packages are installed (the ``compression``
+extra). Streamed responses such as NDJSON and the event stream are
+compressed chunk by chunk and flushed after every chunk, so clients receive
+each line as soon as it is sent. Large chunks are compressed in a worker
+thread to keep the event loop responsive.
+"""
+
+import asyncio
+import zlib
+from typing import Protocol
+
+from fastlibrarian.config import get_config
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Chunks at least this large are compressed off the event loop
+THREAD_THRESHOLD = 64 * 1024
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "application/problem+json",
+    "image/svg+xml",
+)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compress ``data`` and flush it so it can be decoded right away."""
+        ...
+
+    def finish(self) -> bytes: ...
+
+    def compress_all(self, data: bytes) -> bytes: ...
+
+
+class CompressorBase:
+    def compress_all(self, data: bytes) -> bytes:
+        """Compress a complete body."""
+        return self.compress(data) + self.finish()
+
+
+class GzipCompressor(CompressorBase):
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zlib.Z_SYNC_FLUSH,
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCompressor(CompressorBase):
+    def __init__(self, level: int) -> None:
+        # brotli quality ranges 0-11
+        self._compressor = brotli.Compressor(quality=round(level * 11 / 9))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor(CompressorBase):
+    def __init__(self, level: int) -> None:
+        # zstd levels range 1-22, levels above 19 need a lot of memory
+        self._compressor = zstandard.ZstdCompressor(level=level * 2).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK,
+        )
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Supported encodings in order of preference
+ENCODINGS: dict[str, type[Compressor]] = {}
+if zstandard is not None:
+    ENCODINGS["zstd"] = ZstdCompressor
+if brotli is not None:
+    ENCODINGS["br"] = BrotliCompressor
+ENCODINGS["gzip"] = GzipCompressor
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """Pick the preferred supported encoding allowed by ``Accept-Encoding``."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    wildcard = accepted.get("*", 0.0)
+    candidates = [
+        (accepted.get(encoding, wildcard), -rank, encoding)
+        for rank, encoding in enumerate(ENCODINGS)
+    ]
+    q, _, encoding = max(candidates)
+    return encoding if q > 0 else None
+
+
+def _is_compressible(headers: list[tuple[bytes, bytes]]) -> bool:
+    content_type = ""
+    for key, value in headers:
+        if key == b"content-encoding":
+            return False
+        if key == b"content-type":
+            content_type = value.decode("latin-1").lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+async def _run(func, data: bytes) -> bytes:
+    if len(data) >= THREAD_THRESHOLD:
+        return await asyncio.to_thread(func, data)
+    return func(data)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing responses for clients that accept it.
+
+    Complete bodies smaller than ``api.compression_min_size`` are sent as
+    is. Streamed bodies are always compressed since their size is unknown
+    when the headers are sent.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        config = get_config().api
+        if scope["type"] != "http" or not config.compression:
+            await self.app(scope, receive, send)
+            return
+        accept = next(
+            (v for k, v in scope["headers"] if k == b"accept-encoding"),
+            b"",
+        ).decode("latin-1")
+        encoding = negotiate(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: dict | None = None
+        compressor: Compressor | None = None
+        passthrough = False
+
+        async def send_compressed(message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                passthrough = not _is_compressible(headers)
+                if passthrough:
+                    await send(message)
+                else:
+                    # Wait for the first body chunk to decide
+                    start_message = {**message, "headers": headers}
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is not None:
+                headers = [
+                    (k, v)
+                    for k, v in start_message["headers"]
+                    if k != b"content-length"
+                ]
+                headers.append((b"vary", b"Accept-Encoding"))
+                if not more_body and len(body) < config.compression_min_size:
+                    passthrough = True
+                    start_message["headers"] = [
+                        *start_message["headers"],
+                        (b"vary", b"Accept-Encoding"),
+                    ]
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                compressor = ENCODINGS[encoding](config.compression_level)
+                headers.append((b"content-encoding", encoding.encode()))
+                if not more_body:
+                    body = await _run(compressor.compress_all, body)
+                    headers.append((b"content-length", str(len(body)).encode()))
+                    start_message["headers"] = headers
+                    await send(start_message)
+                    start_message = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                start_message["headers"] = headers
+                await send(start_message)
+                start_message = None
+
+            data = await _run(compressor.compress, body) if body else b""
+            if not more_body:
+                data += compressor.finish()
+            await send(
+                {"type": "http.response.body", "body": data, "more_body": more_body},
+            )
+
+        await self.app(scope, receive, send_compressed)
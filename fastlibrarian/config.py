@@ -1,7 +1,12 @@
+import asyncio
+import contextlib
 import enum
+import inspect
+from collections.abc import Awaitable, Callable
 from enum import Enum
 from pathlib import Path
 from typing import Any
+from urllib.parse import quote
 
 import rtoml
 from loguru import logger
@@ -15,14 +20,48 @@ class DatabaseConfig(BaseModel):
     user: str = Field(default="fastlib", min_length=1)
     password: str = Field(default="fastpassword", min_length=8)
     host: str = Field(default="localhost", min_length=1)
-    port: int = Field(default=5432, ge=1024, le=65535)
+    port: int = Field(default=5433, ge=1024, le=65535)
     database: str = Field(default="fastlibrarian", min_length=1)
-    url: str = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{database}"
+    url: str = Field(
+        default="",
+        description="Full database URL, used instead of the fields above if set",
+    )
     echo: bool = True
     pool_size: int = Field(default=10, ge=1, le=100)
     max_overflow: int = Field(default=20, ge=0, le=50)
+    sqlite_mmap_size: int = Field(
+        default=256 * 2**20,
+        ge=0,
+        description="Bytes of an SQLite database file read through mmap",
+    )
+    sqlite_cache_size: int = Field(
+        default=64 * 2**20,
+        ge=0,
+        description="Bytes of SQLite page cache per connection",
+    )
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
-    model_config = ConfigDict(extra="forbid")
+    @field_validator("url")
+    @classmethod
+    def validate_url(cls, v: str) -> str:
+        """Drop the placeholder URL that older versions saved to config.toml."""
+        if "annotation=" in v:
+            logger.warning("Ignoring invalid database.url, using the connection fields")
+            return ""
+        return v
+
+    @property
+    def connection_url(self) -> str:
+        """``url`` if set, else a PostgreSQL URL built from the connection fields."""
+        if self.url:
+            return self.url
+        user = quote(self.user, safe="")
+        password = quote(self.password, safe="")
+        return (
+            f"postgresql+asyncpg://{user}:{password}@{self.host}:{self.port}"
+            f"/{self.database}"
+        )
 
 
 class PreferencesConfig(BaseModel):
@@ -41,6 +80,8 @@ class PreferencesConfig(BaseModel):
         description="List of preferred languages for content",
     )
 
+    model_config = ConfigDict(frozen=True)
+
 
 class DownloadClientType(str, Enum):
     qbittorrent = "qbittorrent"
@@ -79,6 +120,90 @@ class DownloadClientConfig(BaseModel):
         description="Port for the download client",
     )
 
+    model_config = ConfigDict(frozen=True)
+
+
+class LibraryConfig(BaseModel):
+    """Library filesystem scanner configuration section."""
+
+    root_folders: list[str] = Field(
+        default_factory=list,
+        description="Folders scanned for ebooks and audiobooks already on disk",
+    )
+    scan_workers: int = Field(
+        default=8,
+        ge=1,
+        le=64,
+        description="Number of threads walking the library folders in parallel",
+    )
+    fuzzy_match_threshold: float = Field(
+        default=0.88,
+        ge=0.0,
+        le=1.0,
+        description="Minimum title similarity for matching a file to a book",
+    )
+    facet_index: bool = Field(
+        default=True,
+        description="Keep an in-memory tag/status index for facet counts",
+    )
+    typeahead_index: bool = Field(
+        default=True,
+        description="Keep an in-memory prefix index of names for typeahead",
+    )
+    typeahead_max_entries: int = Field(
+        default=1_000_000,
+        ge=1,
+        description="Most author, series and book names held by the typeahead index",
+    )
+    dedupe_threshold: float = Field(
+        default=0.92,
+        ge=0.5,
+        le=1.0,
+        description="Minimum title similarity for merging books by the same author",
+    )
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class RefreshConfig(BaseModel):
+    """Scheduled refresh of authors' books from Hardcover."""
+
+    enabled: bool = True
+    interval_hours: float = Field(
+        default=24.0,
+        ge=1.0,
+        description="Target time between refreshes of an author",
+    )
+    budget_share: float = Field(
+        default=0.5,
+        gt=0.0,
+        le=1.0,
+        description="Share of the Hardcover rate limit scheduled refreshes may use",
+    )
+    wanted_weight: float = Field(
+        default=2.0,
+        ge=0.0,
+        description="Extra refreshes per interval for authors with Wanted books",
+    )
+    recent_weight: float = Field(
+        default=1.0,
+        ge=0.0,
+        description="Extra refreshes per interval for authors with recent books",
+    )
+    recent_days: int = Field(
+        default=90,
+        ge=1,
+        description="Days a newly added book counts as a recent release",
+    )
+    failure_backoff_hours: float = Field(
+        default=1.0,
+        gt=0.0,
+        description="Wait before retrying an author whose refresh failed, "
+        "doubled after each further failure up to interval_hours",
+    )
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
 
 class APIConfig(BaseModel):
     """API configuration section."""
@@ -90,20 +215,58 @@ class APIConfig(BaseModel):
     cors_origins: list[str] = Field(default_factory=lambda: ["*"])
     host: str = "0.0.0.0"
     port: int = Field(default=8000, ge=1024, le=65535)
+    workers: int = Field(
+        default=1,
+        ge=1,
+        description="Worker processes started by the fastlibrarian command",
+    )
+    compression: bool = True
+    compression_level: int = Field(
+        default=5,
+        ge=1,
+        le=9,
+        description="1 favours CPU, 9 favours size; scaled to each codec's range",
+    )
+    compression_min_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Responses smaller than this many bytes are sent uncompressed",
+    )
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
 
 class ExternalAPIConfig(BaseModel):
     """External API configuration section."""
 
     hardcover_api_key: str = Field(default="", description="Hardcover API key")
+    hardcover_url: str = Field(
+        default="https://api.hardcover.app/v1/graphql",
+        description="Hardcover GraphQL endpoint",
+    )
+    hardcover_persisted_queries: bool = Field(
+        default=True,
+        description="Send query hashes before query text (APQ) when supported",
+    )
+    hardcover_cache_ttl: int = Field(default=3600, ge=1)  # seconds
     inventaire_enabled: bool = False
     rate_limit_requests: int = Field(default=100, ge=1)
     rate_limit_window: int = Field(default=3600, ge=1)  # seconds
     timeout: float = Field(default=30.0, ge=1.0)
+    search_deadline: float = Field(
+        default=1.5,
+        gt=0,
+        description="Seconds interactive searches wait for Hardcover before "
+        "answering with local results only",
+    )
+    bookshop_formats: list[str] = Field(
+        default_factory=lambda: ["hardcover", "paperback", "ebook", "audiobook"],
+        description="Bookshop format categories checked when enriching books",
+    )
+    bookshop_cache_ttl: int = Field(default=86400, ge=1)  # seconds
+    bookshop_concurrency: int = Field(default=4, ge=1, le=32)
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     @field_validator("hardcover_api_key")
     @classmethod
@@ -123,7 +286,21 @@ class LoggingConfig(BaseModel):
     retention: str = "7 days"
     file_path: str | None = None
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class MonitoringConfig(BaseModel):
+    """Request instrumentation configuration section."""
+
+    enabled: bool = True
+    server_timing: bool = Field(
+        default=True,
+        description="Add Server-Timing headers with DB time and query counts",
+    )
+    slow_request_ms: float = Field(default=1000.0, ge=0.0)
+    slow_request_queries: int = Field(default=50, ge=0)
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
 
 class SecurityConfig(BaseModel):
@@ -133,7 +310,7 @@ class SecurityConfig(BaseModel):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = Field(default=30, ge=1)
 
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
 
 class AppConfig(BaseSettings):
@@ -146,13 +323,23 @@ class AppConfig(BaseSettings):
         pattern="^(development|staging|production)$",
     )
 
+    config_reload_interval: float = Field(
+        default=5.0,
+        ge=0.0,
+        description="Seconds between checks of config.toml for changes, 0 disables",
+    )
+
     # Configuration sections
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     api: APIConfig = Field(default_factory=APIConfig)
     external_apis: ExternalAPIConfig = Field(default_factory=ExternalAPIConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
+    monitoring: MonitoringConfig = Field(default_factory=MonitoringConfig)
     security: SecurityConfig = Field(default_factory=SecurityConfig)
     download_clients: list[DownloadClientConfig] = Field(default_factory=list)
+    preferences: PreferencesConfig = Field(default_factory=PreferencesConfig)
+    library: LibraryConfig = Field(default_factory=LibraryConfig)
+    refresh: RefreshConfig = Field(default_factory=RefreshConfig)
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -161,6 +348,7 @@ class AppConfig(BaseSettings):
         case_sensitive=False,
         extra="forbid",
         validate_assignment=True,
+        frozen=True,
     )
 
     # @computed_field
@@ -224,14 +412,86 @@ def enum_to_value(obj):
     return obj
 
 
+ConfigSubscriber = Callable[[AppConfig, AppConfig], Awaitable[None] | None]
+
+
 class ConfigManager:
-    """Configuration manager with TOML file support using rtoml for performance."""
+    """Configuration manager with TOML file support using rtoml for performance.
+
+    The current ``AppConfig`` is an immutable snapshot that is swapped as a
+    whole when the configuration changes, so reading it is a plain attribute
+    access. Changes to ``config.toml`` are picked up by a polling watcher task
+    rather than on every read, and subscribers are notified of each swap.
+    """
 
     def __init__(self, config_path: Path | None = None, env_file: Path | None = None):
         self.config_path = config_path or Path("config.toml")
         self.env_file = env_file or Path(".env")
         self._config: AppConfig | None = None
         self._file_mtime: float | None = None
+        self._subscribers: list[ConfigSubscriber] = []
+        self._pending: set[asyncio.Task] = set()
+        self._watcher: asyncio.Task | None = None
+
+    def subscribe(self, callback: ConfigSubscriber) -> None:
+        """Call ``callback(old, new)`` whenever the configuration changes.
+
+        Coroutine callbacks are scheduled on the running event loop.
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ConfigSubscriber) -> None:
+        """Stop notifying ``callback`` of configuration changes."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def set_config(self, config: AppConfig) -> AppConfig:
+        """Swap in a new configuration snapshot and notify subscribers."""
+        old, self._config = self._config, config
+        if old is None or old == config:
+            return config
+        for callback in list(self._subscribers):
+            try:
+                result = callback(old, config)
+                if inspect.isawaitable(result):
+                    task = asyncio.get_running_loop().create_task(result)
+                    self._pending.add(task)
+                    task.add_done_callback(self._pending.discard)
+            except Exception as e:
+                logger.error(f"Configuration subscriber {callback!r} failed: {e}")
+        return config
+
+    def _file_changed(self) -> bool:
+        """Whether config.toml has been created, modified or removed."""
+        try:
+            return self.config_path.stat().st_mtime != self._file_mtime
+        except FileNotFoundError:
+            return self._file_mtime is not None
+
+    async def watch(self, interval: float) -> None:
+        """Poll config.toml every ``interval`` seconds and reload on change."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await asyncio.to_thread(self._file_changed):
+                    logger.info(f"{self.config_path} changed, reloading")
+                    self.load_config(force_reload=True)
+            except Exception as e:
+                logger.error(f"Configuration watcher failed: {e}")
+
+    def start_watcher(self, interval: float | None = None) -> None:
+        """Start the config file watcher on the running event loop."""
+        interval = self.config.config_reload_interval if interval is None else interval
+        if self._watcher is None and interval > 0:
+            self._watcher = asyncio.get_running_loop().create_task(self.watch(interval))
+
+    async def stop_watcher(self) -> None:
+        """Stop the config file watcher."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watcher
+            self._watcher = None
 
     def load_config(self, force_reload: bool = False) -> AppConfig:
         """Load configuration with hot reloading support using rtoml."""
@@ -253,23 +513,28 @@ class ConfigManager:
                 logger.info(f"Loaded configuration from {self.config_path} using rtoml")
             except Exception as e:
                 logger.error(f"Failed to load TOML config with rtoml: {e}")
+        else:
+            self._file_mtime = None
 
         # Create configuration with TOML overrides
         try:
-            # Override environment file if specified
-            if self.env_file.exists():
-                self._config = AppConfig(_env_file=str(self.env_file), **toml_config)
-            else:
-                self._config = AppConfig(**toml_config)
-
+            config = self._build_config(toml_config)
             logger.success("Configuration loaded successfully")
-            return self._config
+            return self.set_config(config)
 
         except Exception as e:
             logger.error(f"Failed to create configuration: {e}")
-            # Return default config if loading fails
-            self._config = AppConfig()
-            return self._config
+            # Keep the current config if reloading fails, else use defaults
+            if self._config is not None:
+                return self._config
+            return self.set_config(AppConfig())
+
+    def _build_config(self, toml_config: dict[str, Any]) -> AppConfig:
+        """Create configuration from TOML data and the environment."""
+        # Override environment file if specified
+        if self.env_file.exists():
+            return AppConfig(_env_file=str(self.env_file), **toml_config)
+        return AppConfig(**toml_config)
 
     def save_config(self, config: AppConfig | None = None) -> None:
         """Save configuration to TOML file using rtoml."""
@@ -303,26 +568,27 @@ class ConfigManager:
         config_dict = enum_to_value(config_dict)
         return rtoml.dumps(config_dict)
 
+    def parse_config_string(self, toml_string: str) -> AppConfig:
+        """Parse and validate a TOML string without applying it."""
+        return self._build_config(rtoml.loads(toml_string))
+
     def load_config_from_string(self, toml_string: str) -> AppConfig:
         """Load configuration from TOML string using rtoml."""
         try:
-            toml_config = rtoml.loads(toml_string)
-
-            # Create configuration with TOML data
-            if self.env_file.exists():
-                self._config = AppConfig(_env_file=str(self.env_file), **toml_config)
-            else:
-                self._config = AppConfig(**toml_config)
-
+            config = self.parse_config_string(toml_string)
             logger.success("Configuration loaded from string successfully")
-            return self._config
+            return self.set_config(config)
 
         except Exception as e:
             logger.error(f"Failed to load configuration from string: {e}")
             raise
 
     def reload_if_changed(self) -> AppConfig:
-        """Reload configuration if file has changed."""
+        """Reload configuration if file has changed.
+
+        This stats config.toml, so hot paths should read ``config`` instead and
+        leave change detection to the watcher.
+        """
         return self.load_config(force_reload=False)
 
     def validate_toml_file(self, file_path: Path | None = None) -> tuple[bool, str]:
@@ -350,7 +616,7 @@ class ConfigManager:
         """Get current configuration, loading if necessary."""
         if self._config is None:
             return self.load_config()
-        return self.reload_if_changed()
+        return self._config
 
 
 # Global instances
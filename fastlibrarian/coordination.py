@@ -0,0 +1,201 @@
+"""Coordination between worker processes sharing one database.
+
+FastLibrarian can run as several uvicorn/gunicorn workers, possibly on
+several nodes. Anything that must be global rather than per process goes
+through PostgreSQL, which every worker already shares:
+
+- ``lease`` takes a session-level advisory lock so only one worker runs a
+  job (library scans, scheduled refreshes) at a time.
+- ``RateLimiter`` keeps fixed-window request counters in ``rate_limits`` so
+  the Hardcover quota is shared instead of multiplied by the worker count.
+- ``invalidate`` clears a named in-process cache on every worker via
+  ``NOTIFY``.
+
+On other databases (single-process deployments) the same APIs fall back to
+in-process state.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections.abc import AsyncIterator, Hashable
+from contextlib import asynccontextmanager
+from typing import Protocol
+
+from loguru import logger
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.events import event_bus
+from fastlibrarian.models.coordination import rate_limits
+
+INVALIDATE_CHANNEL = "fastlibrarian_invalidate"
+
+_local_leases: dict[str, asyncio.Lock] = {}
+
+
+def _is_postgres() -> bool:
+    from fastlibrarian.db import get_engine
+
+    return get_engine().dialect.name == "postgresql"
+
+
+def lock_key(name: str) -> int:
+    """Stable signed 64-bit advisory lock key for a job name."""
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@asynccontextmanager
+async def lease(name: str) -> AsyncIterator[bool]:
+    """Try to take the cluster-wide lease for a job without waiting.
+
+    Yields True if this worker holds the lease for the duration of the
+    block, False if another worker holds it. The lease is released when the
+    block exits or the holder's database connection drops.
+    """
+    if not _is_postgres():
+        lock = _local_leases.setdefault(name, asyncio.Lock())
+        if lock.locked():
+            yield False
+            return
+        async with lock:
+            yield True
+        return
+
+    from fastlibrarian.db import get_engine
+
+    key = lock_key(name)
+    async with get_engine().connect() as conn:
+        acquired = await conn.scalar(select(func.pg_try_advisory_lock(key)))
+        await conn.commit()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                await conn.execute(select(func.pg_advisory_unlock(key)))
+                await conn.commit()
+
+
+class RateLimiter:
+    """A fixed-window rate limit shared by all workers.
+
+    Each ``acquire`` atomically increments the counter for the current
+    window in ``rate_limits``; when the window is full, callers wait for the
+    next one (up to ``max_wait`` seconds).
+    """
+
+    def __init__(self, name: str, limit: int, window: int) -> None:
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self._local: tuple[int, int] = (0, 0)
+
+    def configure(self, limit: int, window: int) -> None:
+        self.limit = limit
+        self.window = window
+
+    async def _increment(self, window_start: int) -> int:
+        if not _is_postgres():
+            start, count = self._local
+            count = count + 1 if start == window_start else 1
+            self._local = (window_start, count)
+            return count
+        statement = insert(rate_limits).values(
+            name=self.name,
+            window_start=window_start,
+            count=1,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[rate_limits.c.name],
+            set_={
+                "count": text(
+                    "CASE WHEN rate_limits.window_start = excluded.window_start "
+                    "THEN rate_limits.count + 1 ELSE 1 END",
+                ),
+                "window_start": statement.excluded.window_start,
+            },
+        ).returning(rate_limits.c.count)
+        async with AsyncSessionLocal() as session:
+            count = await session.scalar(statement)
+            await session.commit()
+        return count
+
+    async def acquire(self, max_wait: float = 0.0) -> bool:
+        """Take one request from the shared budget.
+
+        Returns:
+            True if the request may proceed, False if the budget stayed
+            exhausted for ``max_wait`` seconds.
+        """
+        deadline = time.time() + max_wait
+        while True:
+            now = time.time()
+            window_start = int(now // self.window * self.window)
+            count = await self._increment(window_start)
+            self.remaining = max(self.limit - count, 0)
+            if count <= self.limit:
+                return True
+            retry_at = window_start + self.window
+            if retry_at > deadline:
+                logger.warning(f"Rate limit '{self.name}' exhausted")
+                return False
+            await asyncio.sleep(retry_at - now)
+
+
+class Invalidatable(Protocol):
+    def invalidate(self, key: Hashable) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+_caches: dict[str, list[Invalidatable]] = {}
+
+
+def register_cache(namespace: str, cache: Invalidatable) -> None:
+    """Make a cache clearable cluster-wide under ``namespace``."""
+    _caches.setdefault(namespace, []).append(cache)
+
+
+def _invalidate_local(namespace: str, key: str | None) -> None:
+    for cache in _caches.get(namespace, []):
+        if key is None:
+            cache.clear()
+        else:
+            cache.invalidate(key)
+
+
+def _on_invalidate(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+        _invalidate_local(message["namespace"], message.get("key"))
+    except (ValueError, KeyError) as e:
+        logger.warning(f"Ignoring malformed invalidation: {e}")
+
+
+event_bus.listen(INVALIDATE_CHANNEL, _on_invalidate)
+
+
+async def invalidate(namespace: str, key: str | None = None) -> None:
+    """Clear a cache entry (or the whole cache) on every worker."""
+    _invalidate_local(namespace, key)
+    if not _is_postgres():
+        return
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            select(
+                func.pg_notify(
+                    INVALIDATE_CHANNEL,
+                    json.dumps({"namespace": namespace, "key": key}),
+                ),
+            ),
+        )
+        await session.commit()
+
+
+def cache_namespaces() -> list[str]:
+    """Names of the registered caches."""
+    return sorted(_caches)
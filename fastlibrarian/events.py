@@ -0,0 +1,323 @@
+"""Change feed for books, authors and series.
+
+Write paths publish ``ChangeEvent``s inside their transaction with
+PostgreSQL ``NOTIFY``, so events are only delivered once the change is
+committed. Every worker process runs one ``LISTEN`` connection and fans
+events out to its local SSE/WebSocket subscribers, which keeps clients
+connected to different uvicorn workers in sync. If that connection is
+lost it is reopened, and subscribers are told they missed events.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import Callable, Collection
+from typing import Literal
+from uuid import UUID
+
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.event import listens_for
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+
+CHANNEL = "fastlibrarian_changes"
+# Session.info key of events waiting for the commit on other databases
+PENDING_EVENTS = "fastlibrarian_pending_events"
+# Book ids per author/series lookup in ``book_update_events``
+LOOKUP_BATCH_SIZE = 1000
+# Seconds between liveness checks of the LISTEN connection
+LISTEN_CHECK_INTERVAL = 30.0
+# Seconds to wait before reopening a lost LISTEN connection
+RECONNECT_DELAY = 5.0
+
+EventKind = Literal["book", "author", "series"]
+EventAction = Literal["created", "updated", "deleted"]
+
+
+class ChangeEvent(BaseModel):
+    """A change to a book, author or series."""
+
+    kind: EventKind
+    action: EventAction
+    id: UUID
+    author_ids: list[UUID] = []
+    series_ids: list[UUID] = []
+
+
+class Subscription:
+    """A subscriber's event queue and filters.
+
+    Empty filters receive every event. Otherwise an event is delivered when
+    it concerns one of the subscribed authors, series or books, including
+    book events for books by a subscribed author or in a subscribed series.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=maxsize)
+        self.authors: set[UUID] = set()
+        self.series: set[UUID] = set()
+        self.books: set[UUID] = set()
+        self.kinds: set[str] = set()
+        self.dropped = 0
+        self._wakeup = asyncio.Event()
+
+    def set_filters(
+        self,
+        authors: list[UUID] | None = None,
+        series: list[UUID] | None = None,
+        books: list[UUID] | None = None,
+        kinds: list[str] | None = None,
+    ) -> None:
+        self.authors = set(authors or [])
+        self.series = set(series or [])
+        self.books = set(books or [])
+        self.kinds = set(kinds or [])
+
+    def matches(self, event: ChangeEvent) -> bool:
+        if self.kinds and event.kind not in self.kinds:
+            return False
+        if not (self.authors or self.series or self.books):
+            return True
+        return (
+            (event.kind == "author" and event.id in self.authors)
+            or (event.kind == "series" and event.id in self.series)
+            or (event.kind == "book" and event.id in self.books)
+            or not self.authors.isdisjoint(event.author_ids)
+            or not self.series.isdisjoint(event.series_ids)
+        )
+
+    def put(self, event: ChangeEvent) -> None:
+        """Queue an event, dropping the oldest one if the client is slow."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+        self._wakeup.set()
+
+    def mark_dropped(self) -> None:
+        """Record that events may have been missed, e.g. while reconnecting."""
+        self.dropped += 1
+        self._wakeup.set()
+
+    def take_dropped(self) -> int:
+        """Number of events missed since the last call, resetting it."""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    async def wait(self) -> None:
+        """Wait until an event is queued or events have been missed."""
+        while self.queue.empty() and not self.dropped:
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+
+class EventBus:
+    """Per-process fan-out of change events to local subscribers."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[Subscription] = set()
+        self._connection: AsyncConnection | None = None
+        self._task: asyncio.Task | None = None
+        self._channels: dict[str, Callable[[str], None]] = {
+            CHANNEL: self._on_change,
+        }
+        self.listening = False
+
+    def listen(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Call ``handler(payload)`` for notifications on another channel.
+
+        Channels share this process's LISTEN connection and must be
+        registered before ``start``.
+        """
+        self._channels[channel] = handler
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def queued_events(self) -> int:
+        """Events waiting in subscriber queues."""
+        return sum(s.queue.qsize() for s in self._subscribers)
+
+    def subscribe(self, maxsize: int = 256) -> Subscription:
+        subscription = Subscription(maxsize)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def dispatch(self, event: ChangeEvent) -> None:
+        for subscription in self._subscribers:
+            if subscription.matches(event):
+                subscription.put(event)
+
+    def _on_change(self, payload: str) -> None:
+        try:
+            self.dispatch(ChangeEvent.model_validate_json(payload))
+        except ValidationError as e:
+            logger.warning(f"Ignoring malformed change event: {e}")
+
+    def _on_notify(self, _connection, _pid, channel: str, payload: str) -> None:
+        self._channels[channel](payload)
+
+    async def _listen(self, resync: bool) -> None:
+        """Open the LISTEN connection and return once it is lost.
+
+        With ``resync``, subscribers are told they missed events once the
+        connection is listening again, since notifications sent while it
+        was down are lost.
+        """
+        from fastlibrarian.db import get_engine
+
+        lost = asyncio.Event()
+        self._connection = await get_engine().connect()
+        raw = await self._connection.get_raw_connection()
+        driver = raw.driver_connection
+        driver.add_termination_listener(lambda _connection: lost.set())
+        for channel in self._channels:
+            await driver.add_listener(channel, self._on_notify)
+        self.listening = True
+        logger.info(f"Listening for notifications on {sorted(self._channels)}")
+        if resync:
+            for subscription in self._subscribers:
+                subscription.mark_dropped()
+        while not driver.is_closed():
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(lost.wait(), LISTEN_CHECK_INTERVAL)
+                return
+            # Catches connections that died without closing their socket
+            await asyncio.wait_for(
+                driver.execute("SELECT 1"),
+                LISTEN_CHECK_INTERVAL,
+            )
+
+    async def _close(self) -> None:
+        self.listening = False
+        if self._connection is not None:
+            with contextlib.suppress(Exception):
+                await self._connection.close()
+            self._connection = None
+
+    async def _run(self) -> None:
+        reconnecting = False
+        while True:
+            try:
+                await self._listen(resync=reconnecting)
+                logger.warning("Change event listener disconnected, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Change event listener failed: {e}")
+            finally:
+                await self._close()
+            reconnecting = True
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def start(self) -> None:
+        """Listen for notifications in this process, reconnecting as needed."""
+        from fastlibrarian.db import get_engine
+
+        if get_engine().dialect.name != "postgresql" or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Close the LISTEN connection."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self._close()
+
+
+event_bus = EventBus()
+
+
+async def publish(db: AsyncSession, *events: ChangeEvent) -> None:
+    """Publish change events as part of the session's transaction.
+
+    Events are sent with a single ``pg_notify`` statement and delivered when
+    the transaction commits. On other databases they are kept on the session
+    and dispatched to the local subscribers after it commits, or dropped if
+    it rolls back.
+    """
+    if not events:
+        return
+    if db.bind.dialect.name != "postgresql":
+        # Begin the transaction, as pg_notify would, so its end is seen
+        await db.connection()
+        db.info.setdefault(PENDING_EVENTS, []).extend(events)
+        return
+    await db.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) p"),
+        {"channel": CHANNEL, "payloads": [e.model_dump_json() for e in events]},
+    )
+
+
+@listens_for(Session, "after_commit")
+def _dispatch_pending(session: Session) -> None:
+    for change in session.info.pop(PENDING_EVENTS, ()):
+        event_bus.dispatch(change)
+
+
+@listens_for(Session, "after_soft_rollback")
+def _drop_pending(session: Session, previous_transaction) -> None:
+    # Savepoint rollbacks keep the outer transaction's events
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_EVENTS, None)
+
+
+def book_event(book, action: EventAction) -> ChangeEvent:
+    """Build a change event for a ``Book`` row."""
+    return ChangeEvent(
+        kind="book",
+        action=action,
+        id=book.id,
+        author_ids=[a.id for a in book.authors],
+        series_ids=[s.id for s in book.series],
+    )
+
+
+async def book_update_events(
+    db: AsyncSession,
+    book_ids: Collection[UUID],
+) -> list[ChangeEvent]:
+    """Build ``updated`` events for books by id, looking up their authors and series.
+
+    For bulk writes that change books without loading them.
+    """
+    from fastlibrarian.models.shared import author_books, series_books
+
+    events = {
+        book_id: ChangeEvent(kind="book", action="updated", id=book_id)
+        for book_id in book_ids
+    }
+    for owner, field in (
+        (author_books.c.author_id, "author_ids"),
+        (series_books.c.series_id, "series_ids"),
+    ):
+        book_column = owner.table.c.book_id
+        ids = list(events)
+        for i in range(0, len(ids), LOOKUP_BATCH_SIZE):
+            result = await db.execute(
+                select(book_column, owner).where(
+                    book_column.in_(ids[i : i + LOOKUP_BATCH_SIZE]),
+                ),
+            )
+            for book_id, owner_id in result.all():
+                getattr(events[book_id], field).append(owner_id)
+    return list(events.values())
+
+
+def author_event(author, action: EventAction) -> ChangeEvent:
+    """Build a change event for an ``Author`` row."""
+    return ChangeEvent(kind="author", action=action, id=author.id)
+
+
+def series_event(series, action: EventAction) -> ChangeEvent:
+    """Build a change event for a ``Series`` row."""
+    return ChangeEvent(kind="series", action=action, id=series.id)
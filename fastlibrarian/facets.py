@@ -0,0 +1,290 @@
+"""In-memory bitmap index of book tags and statuses for facet counts.
+
+Every book gets a bit position, and each tag and each status is a bitset
+held in a Python ``int``. Filtering by several tags is a chain of ``&`` and
+counting is ``int.bit_count()``, both running over machine words in C, so
+counting every tag within a result set of a million books takes
+milliseconds without touching the database.
+
+The index is built with one streaming pass when the worker starts and kept
+current from the change feed: book events mark books dirty and they are
+reloaded in small batches. If the subscription dropped events the index is
+rebuilt. Each worker process keeps its own index.
+"""
+
+import asyncio
+import contextlib
+from collections.abc import Collection, Iterable, Sequence
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.config import AppConfig
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.events import Subscription, event_bus
+from fastlibrarian.metrics import track_job
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.schemas import BookStatus
+from fastlibrarian.models.shared import book_tags
+
+# Seconds to gather change events before reloading the books they touch
+BATCH_DELAY = 0.5
+# Seconds to wait before retrying a failed build
+RETRY_DELAY = 30.0
+# Rows fetched per round trip while building
+STREAM_BATCH = 10_000
+# Change events buffered between batches; overflowing forces a rebuild
+QUEUE_SIZE = 10_000
+
+STATUSES = [s.value for s in BookStatus]
+# Status code of positions whose book was deleted
+NO_STATUS = 255
+
+
+def _bitset(positions: Iterable[int]) -> int:
+    """Build a bitset with the given bits set."""
+    positions = list(positions)
+    if not positions:
+        return 0
+    bits = bytearray(max(positions) // 8 + 1)
+    for pos in positions:
+        bits[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(bits, "little")
+
+
+@dataclass(slots=True)
+class FacetCounts:
+    """Book counts for one combination of tag and status filters."""
+
+    total: int = 0
+    # Books per tag within the results
+    tags: dict[UUID, int] = field(default_factory=dict)
+    # Books per status, ignoring the status filter
+    statuses: dict[str, int] = field(default_factory=dict)
+
+
+class FacetIndex:
+    """Tag and status bitsets over all books."""
+
+    def __init__(self) -> None:
+        self._subscription: Subscription | None = None
+        self._task: asyncio.Task | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.ready = False
+        self._positions: dict[UUID, int] = {}
+        self._alive = 0
+        self._tags: dict[UUID, int] = {}
+        self._statuses: dict[str, int] = {}
+        # Current status code of each position and tags of each tagged one,
+        # so a refresh only rewrites the bitsets that changed
+        self._status_codes = bytearray()
+        self._book_tags: dict[int, frozenset[UUID]] = {}
+
+    @property
+    def size(self) -> int:
+        """Number of indexed books."""
+        return self._alive.bit_count()
+
+    def counts(self, tag_ids: Sequence[UUID], status: str | None = None) -> FacetCounts:
+        """Count the books having all ``tag_ids`` and ``status``."""
+        bits = self._alive
+        for tag_id in tag_ids:
+            bits &= self._tags.get(tag_id, 0)
+        statuses = {s: (bits & self._statuses.get(s, 0)).bit_count() for s in STATUSES}
+        if status is not None:
+            bits &= self._statuses.get(status, 0)
+        tags = {}
+        for tag_id, tag_bits in self._tags.items():
+            if count := (bits & tag_bits).bit_count():
+                tags[tag_id] = count
+        return FacetCounts(total=bits.bit_count(), tags=tags, statuses=statuses)
+
+    def tag_counts(self) -> dict[UUID, int]:
+        """Number of books with each tag."""
+        return {
+            tag_id: count
+            for tag_id, bits in self._tags.items()
+            if (count := (bits & self._alive).bit_count())
+        }
+
+    async def build(self) -> None:
+        """Rebuild the whole index from the database."""
+        positions: dict[UUID, int] = {}
+        codes = bytearray()
+        by_status: dict[str, list[int]] = {s: [] for s in STATUSES}
+        by_tag: dict[UUID, list[int]] = {}
+        book_tag_sets: dict[int, set[UUID]] = {}
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                select(Book.id, Book.status).execution_options(
+                    yield_per=STREAM_BATCH,
+                ),
+            )
+            async for partition in result.partitions():
+                for book_id, status in partition:
+                    pos = len(codes)
+                    positions[book_id] = pos
+                    codes.append(STATUSES.index(status.value))
+                    by_status[status.value].append(pos)
+            result = await db.stream(
+                select(book_tags.c.book_id, book_tags.c.tag_id).execution_options(
+                    yield_per=STREAM_BATCH,
+                ),
+            )
+            async for partition in result.partitions():
+                for book_id, tag_id in partition:
+                    # Books added since the first pass arrive as change events
+                    pos = positions.get(book_id)
+                    if pos is not None:
+                        by_tag.setdefault(tag_id, []).append(pos)
+                        book_tag_sets.setdefault(pos, set()).add(tag_id)
+
+        self._positions = positions
+        self._status_codes = codes
+        self._alive = (1 << len(codes)) - 1
+        self._statuses = {s: _bitset(p) for s, p in by_status.items()}
+        self._tags = {t: _bitset(p) for t, p in by_tag.items()}
+        self._book_tags = {pos: frozenset(t) for pos, t in book_tag_sets.items()}
+        self.ready = True
+        logger.info(f"Facet index built: {len(codes)} books, {len(by_tag)} tags")
+
+    async def refresh(self, db: AsyncSession, book_ids: Collection[UUID]) -> None:
+        """Reload the status and tags of ``book_ids``; missing books are removed."""
+        if not book_ids:
+            return
+        ids = list(book_ids)
+        result = await db.execute(
+            select(Book.id, Book.status).where(Book.id.in_(ids)),
+        )
+        statuses = {book_id: status.value for book_id, status in result.all()}
+        result = await db.execute(
+            select(book_tags.c.book_id, book_tags.c.tag_id).where(
+                book_tags.c.book_id.in_(ids),
+            ),
+        )
+        tags: dict[UUID, set[UUID]] = {}
+        for book_id, tag_id in result.all():
+            tags.setdefault(book_id, set()).add(tag_id)
+        self._apply(ids, statuses, tags)
+
+    def _apply(
+        self,
+        book_ids: Sequence[UUID],
+        statuses: dict[UUID, str],
+        tags: dict[UUID, set[UUID]],
+    ) -> None:
+        # Positions to set and clear in each bitset, applied with one
+        # operation per bitset for the whole batch
+        added: dict[object, list[int]] = {}
+        removed: dict[object, list[int]] = {}
+        for book_id in book_ids:
+            pos = self._positions.get(book_id)
+            status = statuses.get(book_id)
+            if pos is None:
+                if status is None:
+                    continue
+                pos = len(self._status_codes)
+                self._positions[book_id] = pos
+                self._status_codes.append(NO_STATUS)
+            old_code = self._status_codes[pos]
+            old_status = None if old_code == NO_STATUS else STATUSES[old_code]
+            old_tags = self._book_tags.get(pos, frozenset())
+            new_tags = frozenset(tags.get(book_id, ())) if status else frozenset()
+            if status is None:
+                # Deleted: the position is retired until the next rebuild
+                del self._positions[book_id]
+                removed.setdefault("alive", []).append(pos)
+                self._status_codes[pos] = NO_STATUS
+            else:
+                added.setdefault("alive", []).append(pos)
+                self._status_codes[pos] = STATUSES.index(status)
+            if status != old_status:
+                if old_status is not None:
+                    removed.setdefault(("status", old_status), []).append(pos)
+                if status is not None:
+                    added.setdefault(("status", status), []).append(pos)
+            for tag_id in old_tags - new_tags:
+                removed.setdefault(("tag", tag_id), []).append(pos)
+            for tag_id in new_tags - old_tags:
+                added.setdefault(("tag", tag_id), []).append(pos)
+            if new_tags:
+                self._book_tags[pos] = new_tags
+            else:
+                self._book_tags.pop(pos, None)
+
+        for key in added.keys() | removed.keys():
+            set_bits = _bitset(added.get(key, ()))
+            clear_bits = _bitset(removed.get(key, ()))
+            if key == "alive":
+                self._alive = (self._alive & ~clear_bits) | set_bits
+                continue
+            kind, value = key
+            bitsets = self._statuses if kind == "status" else self._tags
+            bits = (bitsets.get(value, 0) & ~clear_bits) | set_bits
+            if bits:
+                bitsets[value] = bits
+            else:
+                bitsets.pop(value, None)
+
+    async def _run(self) -> None:
+        queue = self._subscription.queue
+        while True:
+            try:
+                with track_job("facet-index-build"):
+                    await self.build()
+                while True:
+                    await self._subscription.wait()
+                    await asyncio.sleep(BATCH_DELAY)
+                    events = []
+                    while not queue.empty():
+                        events.append(queue.get_nowait())
+                    if self._subscription.dropped:
+                        logger.warning("Facet index missed change events, rebuilding")
+                        self._subscription.dropped = 0
+                        break
+                    async with AsyncSessionLocal() as db:
+                        await self.refresh(db, {e.id for e in events})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Facet index update failed: {e}")
+                self.ready = False
+                await asyncio.sleep(RETRY_DELAY)
+
+    def start(self) -> None:
+        """Build the index in the background and follow book changes."""
+        if self._task is not None:
+            return
+        # Subscribe before building so no change is missed in between
+        self._subscription = event_bus.subscribe(QUEUE_SIZE)
+        self._subscription.set_filters(kinds=["book"])
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop following changes and free the index."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._subscription is not None:
+            event_bus.unsubscribe(self._subscription)
+            self._subscription = None
+        self._reset()
+
+    async def on_config_change(self, old: AppConfig, new: AppConfig) -> None:
+        """Start or stop the index when ``library.facet_index`` changes."""
+        if old.library.facet_index == new.library.facet_index:
+            return
+        if new.library.facet_index:
+            self.start()
+        else:
+            await self.stop()
+
+
+facet_index = FacetIndex()
@@ -0,0 +1,187 @@
+"""Per-request SQL statement counts and timings.
+
+SQLAlchemy cursor events add each statement's count and duration to the
+``RequestStats`` of the request that issued it (tracked with a context
+variable, so concurrent requests don't mix). ``InstrumentationMiddleware``
+reports them in a ``Server-Timing`` header, logs requests over the
+configured budgets and aggregates latency histograms per route.
+"""
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from fastlibrarian.config import get_config
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass(slots=True)
+class RequestStats:
+    """SQL statements run on behalf of one request."""
+
+    queries: int = 0
+    db_time: float = 0.0
+    failed_queries: int = 0
+
+
+@dataclass(slots=True)
+class Histogram:
+    """A cumulative histogram with ``LATENCY_BUCKETS`` bucket bounds."""
+
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    count: int = 0
+    total: float = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+        self.count += 1
+        self.total += value
+
+
+@dataclass(slots=True)
+class RouteStats:
+    """Cumulative latency histogram and statement counts for one route."""
+
+    latency: Histogram = field(default_factory=Histogram)
+    queries: int = 0
+    db_time: float = 0.0
+    failed_queries: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def observe(self, elapsed: float, status: int, stats: RequestStats) -> None:
+        self.latency.observe(elapsed)
+        self.queries += stats.queries
+        self.db_time += stats.db_time
+        self.failed_queries += stats.failed_queries
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+# Keyed by (method, route path template)
+route_stats: dict[tuple[str, str], RouteStats] = {}
+
+
+def current_stats() -> RequestStats | None:
+    """Statistics of the request being handled, if any."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, params, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, params, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_start")
+    if stats is not None and starts:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - starts.pop()
+
+
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    stats = _current.get()
+    conn = context.connection
+    starts = conn.info.get("query_start") if conn is not None else None
+    if stats is not None and context.execution_context is not None and starts:
+        stats.queries += 1
+        stats.failed_queries += 1
+        stats.db_time += time.perf_counter() - starts.pop()
+
+
+def install() -> None:
+    """Listen for statements on every engine, including ones created later."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one series instead of one per URL
+    return getattr(route, "path", "<unmatched>")
+
+
+def server_timing(stats: RequestStats, start: float) -> bytes:
+    """``Server-Timing`` header value for a request started at ``start``."""
+    elapsed = time.perf_counter() - start
+    return (
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries", '
+        f"total;dur={elapsed * 1000:.1f}"
+    ).encode()
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware timing requests and their SQL statements.
+
+    Requests are measured until the response starts, so streaming
+    responses (such as the event stream) are timed to their first byte and
+    background tasks are not counted.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        config = get_config().monitoring
+        if scope["type"] != "http" or not config.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status = 500
+        finished = False
+
+        def finish() -> None:
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            elapsed = time.perf_counter() - start
+            route = _route_name(scope)
+            route_stats.setdefault((scope["method"], route), RouteStats()).observe(
+                elapsed,
+                status,
+                stats,
+            )
+            if (config.slow_request_ms and elapsed * 1000 > config.slow_request_ms) or (
+                config.slow_request_queries
+                and stats.queries > config.slow_request_queries
+            ):
+                logger.warning(
+                    f"Slow request {scope['method']} {route}: "
+                    f"{elapsed * 1000:.0f} ms, {stats.queries} queries "
+                    f"({stats.db_time * 1000:.0f} ms in the database)",
+                )
+
+        async def send_with_timing(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if config.server_timing:
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", server_timing(stats, start)),
+                    ]
+                finish()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            finish()
+            _current.reset(token)
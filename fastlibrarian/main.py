@@ -1,28 +1,136 @@
+"""FastLibrarian ASGI application.
+
+The app is built by ``create_app()``. Routers, models and the external API
+clients are imported there rather than at module import, and the database
+engine, change feed, facet and typeahead indexes and refresh scheduler
+start in the lifespan, so importing this module is cheap and each worker
+does the work once. ``fastlibrarian.main:app`` still works and builds the
+app on first access.
+"""
+
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-from fastlibrarian.routers import (
-    authors_router,
-    books_router,
-    config_router,
-    series_router,
-)
-
-app = FastAPI(
-    title="FastLibrarian API",
-    version="1.0.0",
-)
-
-# Allow frontend (adjust origins as needed)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Change to your frontend URL in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(authors_router)
-app.include_router(books_router)
-app.include_router(series_router)
-app.include_router(config_router)
+
+from fastlibrarian.config import config_manager
+
+
+def config_handlers() -> tuple[Callable, ...]:
+    """Subsystems that apply configuration changes without a restart."""
+    from fastlibrarian import db
+    from fastlibrarian.facets import facet_index
+    from fastlibrarian.modules import bookshop, hardcover
+    from fastlibrarian.modules.download_clients import download_clients
+    from fastlibrarian.scheduler import refresh_scheduler
+    from fastlibrarian.typeahead import typeahead_index
+
+    return (
+        db.on_config_change,
+        hardcover.on_config_change,
+        bookshop.on_config_change,
+        download_clients.on_config_change,
+        facet_index.on_config_change,
+        typeahead_index.on_config_change,
+        refresh_scheduler.on_config_change,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Start and stop per-process background resources.
+
+    Runs once in every worker process. Connections inherited from a parent
+    process (gunicorn --preload) are dropped so each worker opens its own.
+    """
+    from fastlibrarian import db
+    from fastlibrarian.events import event_bus
+    from fastlibrarian.facets import facet_index
+    from fastlibrarian.modules import bookshop, hardcover
+    from fastlibrarian.scheduler import refresh_scheduler
+    from fastlibrarian.typeahead import typeahead_index
+
+    engine = db.get_engine()
+    await engine.dispose(close=False)
+    if engine.dialect.name == "sqlite":
+        # Embedded mode has no Alembic migrations; create missing tables
+        await db.create_tables()
+    handlers = config_handlers()
+    for handler in handlers:
+        config_manager.subscribe(handler)
+    config_manager.start_watcher()
+    await event_bus.start()
+    if config_manager.config.library.facet_index:
+        facet_index.start()
+    if config_manager.config.library.typeahead_index:
+        typeahead_index.start()
+    if config_manager.config.refresh.enabled:
+        refresh_scheduler.start()
+    yield
+    await refresh_scheduler.stop()
+    await typeahead_index.stop()
+    await facet_index.stop()
+    await event_bus.stop()
+    await config_manager.stop_watcher()
+    for handler in handlers:
+        config_manager.unsubscribe(handler)
+    await hardcover.close_client()
+    await bookshop.close_client()
+
+
+def create_app() -> FastAPI:
+    """Build the FastAPI application with its middleware and routers."""
+    from fastapi.middleware.cors import CORSMiddleware
+
+    from fastlibrarian import instrumentation
+    from fastlibrarian.compression import CompressionMiddleware
+    from fastlibrarian.routers import (
+        authors_router,
+        books_router,
+        config_router,
+        events_router,
+        library_router,
+        metrics_router,
+        series_router,
+        tags_router,
+        typeahead_router,
+    )
+
+    app = FastAPI(
+        title="FastLibrarian API",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+
+    # Allow frontend (adjust origins as needed)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Change to your frontend URL in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    instrumentation.install()
+    app.add_middleware(instrumentation.InstrumentationMiddleware)
+    app.add_middleware(CompressionMiddleware)
+
+    app.include_router(authors_router)
+    app.include_router(books_router)
+    app.include_router(series_router)
+    app.include_router(config_router)
+    app.include_router(library_router)
+    app.include_router(events_router)
+    app.include_router(metrics_router)
+    app.include_router(tags_router)
+    app.include_router(typeahead_router)
+    return app
+
+
+def __getattr__(name: str) -> FastAPI:
+    # Build ``app`` on first access for ``fastlibrarian.main:app`` users
+    if name == "app":
+        app = create_app()
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,343 @@
+"""Prometheus metrics in the text exposition format.
+
+Covers HTTP requests (from ``instrumentation``), the database connection
+pool, calls to external APIs, background jobs, change event subscribers,
+coalesced lookups and download clients. Metrics are per worker process.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from loguru import logger
+
+from fastlibrarian.instrumentation import LATENCY_BUCKETS, Histogram, route_stats
+
+# Seconds to wait for a download client before reporting it down
+DOWNLOAD_CLIENT_TIMEOUT = 5.0
+# Download client calls run on their own threads: a timed out call keeps its
+# thread until the client answers, which must not starve the default executor
+_download_client_executor = ThreadPoolExecutor(
+    max_workers=4,
+    thread_name_prefix="metrics-download-clients",
+)
+
+external_latency: dict[str, Histogram] = {}
+external_responses: Counter[tuple[str, str]] = Counter()
+jobs_in_flight: Counter[str] = Counter()
+jobs_completed: Counter[tuple[str, str]] = Counter()
+# Calls per singleflight group, run ("executed") or joined ("shared")
+coalesced_calls: Counter[tuple[str, str]] = Counter()
+
+
+def record_external(service: str, status: int | str, elapsed: float) -> None:
+    """Record one call to an external API.
+
+    Args:
+        service: API name, e.g. ``"hardcover"``.
+        status: HTTP status code, or ``"error"`` if no response was received.
+        elapsed: Call duration in seconds.
+    """
+    external_latency.setdefault(service, Histogram()).observe(elapsed)
+    external_responses[service, str(status)] += 1
+
+
+@contextmanager
+def track_job(name: str) -> Iterator[None]:
+    """Count a background job as in flight for the duration of the block."""
+    jobs_in_flight[name] += 1
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        jobs_in_flight[name] -= 1
+        jobs_completed[name, outcome] += 1
+
+
+def _escape(value: object) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+class MetricsWriter:
+    """Build a text exposition one metric family at a time."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def family(self, name: str, kind: str, help: str) -> None:
+        self.lines.append(f"# HELP {name} {help}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, /, **labels: object) -> None:
+        if labels:
+            rendered = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            name = f"{name}{{{rendered}}}"
+        self.lines.append(f"{name} {value}")
+
+    def histogram(
+        self,
+        name: str,
+        histogram: Histogram,
+        /,
+        **labels: object,
+    ) -> None:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, histogram.buckets, strict=True):
+            cumulative += count
+            self.sample(f"{name}_bucket", cumulative, **labels, le=bound)
+        self.sample(f"{name}_bucket", histogram.count, **labels, le="+Inf")
+        self.sample(f"{name}_sum", histogram.total, **labels)
+        self.sample(f"{name}_count", histogram.count, **labels)
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _write_http(out: MetricsWriter) -> None:
+    out.family(
+        "fastlibrarian_http_request_duration_seconds",
+        "histogram",
+        "Time until the response started, per route.",
+    )
+    for (method, route), stats in route_stats.items():
+        out.histogram(
+            "fastlibrarian_http_request_duration_seconds",
+            stats.latency,
+            method=method,
+            route=route,
+        )
+    out.family(
+        "fastlibrarian_http_responses_total",
+        "counter",
+        "Responses per route and status code.",
+    )
+    for (method, route), stats in route_stats.items():
+        for status, count in sorted(stats.statuses.items()):
+            out.sample(
+                "fastlibrarian_http_responses_total",
+                count,
+                method=method,
+                route=route,
+                status=status,
+            )
+    out.family(
+        "fastlibrarian_http_db_queries_total",
+        "counter",
+        "SQL statements run by requests, per route.",
+    )
+    out.family(
+        "fastlibrarian_http_db_seconds_total",
+        "counter",
+        "Time requests spent in the database, per route.",
+    )
+    out.family(
+        "fastlibrarian_http_db_failed_queries_total",
+        "counter",
+        "SQL statements run by requests that raised an error, per route.",
+    )
+    for (method, route), stats in route_stats.items():
+        labels = {"method": method, "route": route}
+        out.sample("fastlibrarian_http_db_queries_total", stats.queries, **labels)
+        out.sample("fastlibrarian_http_db_seconds_total", stats.db_time, **labels)
+        out.sample(
+            "fastlibrarian_http_db_failed_queries_total",
+            stats.failed_queries,
+            **labels,
+        )
+
+
+def _write_db_pool(out: MetricsWriter) -> None:
+    from fastlibrarian import db
+
+    pool = db.get_engine().sync_engine.pool
+    gauges = {
+        "size": "Configured number of pooled connections.",
+        "checkedout": "Connections currently in use.",
+        "checkedin": "Idle connections in the pool.",
+        "overflow": "Connections opened beyond the pool size.",
+    }
+    for stat, help in gauges.items():
+        if hasattr(pool, stat):
+            name = f"fastlibrarian_db_pool_{stat}"
+            out.family(name, "gauge", help)
+            # QueuePool counts overflow from -pool_size until the pool is full
+            out.sample(name, max(getattr(pool, stat)(), 0))
+
+
+def _write_external(out: MetricsWriter) -> None:
+    from fastlibrarian.modules.hardcover import get_rate_limiter
+
+    rate_limiter = get_rate_limiter()
+
+    out.family(
+        "fastlibrarian_external_request_duration_seconds",
+        "histogram",
+        "External API call latency.",
+    )
+    for service, histogram in external_latency.items():
+        out.histogram(
+            "fastlibrarian_external_request_duration_seconds",
+            histogram,
+            service=service,
+        )
+    out.family(
+        "fastlibrarian_external_responses_total",
+        "counter",
+        "External API calls per status code ('error' when the call failed).",
+    )
+    for (service, status), count in sorted(external_responses.items()):
+        out.sample(
+            "fastlibrarian_external_responses_total",
+            count,
+            service=service,
+            status=status,
+        )
+    out.family(
+        "fastlibrarian_rate_limit_remaining",
+        "gauge",
+        "Requests left in the current shared rate limit window.",
+    )
+    out.sample(
+        "fastlibrarian_rate_limit_remaining",
+        rate_limiter.remaining,
+        name=rate_limiter.name,
+    )
+    out.family(
+        "fastlibrarian_rate_limit_limit",
+        "gauge",
+        "Requests allowed per rate limit window.",
+    )
+    out.sample(
+        "fastlibrarian_rate_limit_limit",
+        rate_limiter.limit,
+        name=rate_limiter.name,
+    )
+
+
+def _write_jobs(out: MetricsWriter) -> None:
+    from fastlibrarian.events import event_bus
+
+    out.family(
+        "fastlibrarian_jobs_in_flight",
+        "gauge",
+        "Background jobs currently running in this worker.",
+    )
+    for name, count in sorted(jobs_in_flight.items()):
+        out.sample("fastlibrarian_jobs_in_flight", count, job=name)
+    out.family(
+        "fastlibrarian_jobs_completed_total",
+        "counter",
+        "Background jobs finished, by outcome.",
+    )
+    for (name, outcome), count in sorted(jobs_completed.items()):
+        out.sample(
+            "fastlibrarian_jobs_completed_total",
+            count,
+            job=name,
+            outcome=outcome,
+        )
+    out.family(
+        "fastlibrarian_event_subscribers",
+        "gauge",
+        "Connected change event subscribers.",
+    )
+    out.sample("fastlibrarian_event_subscribers", event_bus.subscriber_count)
+    out.family(
+        "fastlibrarian_event_queue_depth",
+        "gauge",
+        "Change events waiting to be sent to subscribers.",
+    )
+    out.sample("fastlibrarian_event_queue_depth", event_bus.queued_events)
+
+
+def _write_coalesced(out: MetricsWriter) -> None:
+    out.family(
+        "fastlibrarian_coalesced_calls_total",
+        "counter",
+        "Lookups run ('executed') or joined while identical ones ran ('shared').",
+    )
+    for (group, outcome), count in sorted(coalesced_calls.items()):
+        out.sample(
+            "fastlibrarian_coalesced_calls_total",
+            count,
+            group=group,
+            outcome=outcome,
+        )
+
+
+def _torrent_counts(index: int) -> Counter[str]:
+    from fastlibrarian.modules.download_clients import download_clients
+    from fastlibrarian.modules.qbittorrent import get_our_torrents
+
+    return Counter(t.state for t in get_our_torrents(download_clients.get(index)))
+
+
+async def _write_download_clients(out: MetricsWriter) -> None:
+    from fastlibrarian.config import get_config
+
+    clients = get_config().download_clients
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(
+            asyncio.wait_for(
+                loop.run_in_executor(
+                    _download_client_executor,
+                    _torrent_counts,
+                    index,
+                ),
+                DOWNLOAD_CLIENT_TIMEOUT,
+            )
+            for index in range(len(clients))
+        ),
+        return_exceptions=True,
+    )
+    out.family(
+        "fastlibrarian_download_client_up",
+        "gauge",
+        "Whether the download client answered.",
+    )
+    out.family(
+        "fastlibrarian_download_client_torrents",
+        "gauge",
+        "Torrents in the fastlibrarian category, by state.",
+    )
+    for client_config, result in zip(clients, results, strict=True):
+        client = (
+            f"{client_config.client_type.value}@"
+            f"{client_config.client_ip}:{client_config.client_port}"
+        )
+        if isinstance(result, BaseException):
+            logger.debug(f"Download client {client} unavailable for metrics: {result}")
+            out.sample("fastlibrarian_download_client_up", 0, client=client)
+            continue
+        out.sample("fastlibrarian_download_client_up", 1, client=client)
+        for state, count in sorted(result.items()):
+            out.sample(
+                "fastlibrarian_download_client_torrents",
+                count,
+                client=client,
+                state=state,
+            )
+
+
+async def render() -> str:
+    """Render all metrics in the Prometheus text format."""
+    start = time.perf_counter()
+    out = MetricsWriter()
+    _write_http(out)
+    _write_db_pool(out)
+    _write_external(out)
+    _write_jobs(out)
+    _write_coalesced(out)
+    await _write_download_clients(out)
+    out.family(
+        "fastlibrarian_metrics_render_seconds",
+        "gauge",
+        "Time taken to collect these metrics.",
+    )
+    out.sample("fastlibrarian_metrics_render_seconds", time.perf_counter() - start)
+    return out.render()
@@ -1,14 +1,16 @@
 """Author model for FastLibrarian API."""
 
+from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import UUID, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import UUID, DateTime, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from fastlibrarian.db import Base
 from fastlibrarian.models.shared import Tags, author_books
+from fastlibrarian.normalize import name_key
+from fastlibrarian.sql import JSONType
 
 if TYPE_CHECKING:
     from fastlibrarian.models.shared import Tags
@@ -21,6 +23,12 @@ class Author(Base):
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # name_key(name), kept in sync by _set_name_key
+    name_key: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        index=True,
+    )
     bio: Mapped[str | None] = mapped_column(Text, nullable=True)
     books = relationship(
         "Book",
@@ -29,7 +37,28 @@ class Author(Base):
         passive_deletes=True,
         lazy="selectin",
     )
-    external_refs: Mapped[JSONB] = mapped_column(JSONB, nullable=True, default=dict)
+    external_refs: Mapped[dict | None] = mapped_column(
+        JSONType,
+        nullable=True,
+        default=dict,
+    )
+    # When update_author_books last refreshed the books from Hardcover
+    last_refreshed_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+        index=True,
+    )
+    # Scheduled refreshes that failed in a row, and when to try again
+    refresh_failures: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    refresh_retry_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+    )
     tags: Mapped[list["Tags"]] = relationship(
         "Tags",
         secondary="author_tags",
@@ -37,3 +66,12 @@ class Author(Base):
         passive_deletes=True,
         lazy="selectin",
     )
+
+    @validates("name")
+    def _set_name_key(self, _key: str, name: str) -> str:
+        self.name_key = name_key(name) if name else None
+        return name
+
+
+# Keyset pagination orders by (lower(name), id)
+Index("ix_authors_lower_name_id", func.lower(Author.name), Author.id)
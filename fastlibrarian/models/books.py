@@ -3,14 +3,15 @@
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import UUID, String, Text
+from sqlalchemy import UUID, Column, ForeignKey, Index, String, Table, Text, func
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from fastlibrarian.db import Base
 from fastlibrarian.models.schemas import BookStatus
 from fastlibrarian.models.shared import Tags, author_books, series_books
+from fastlibrarian.normalize import title_key
+from fastlibrarian.sql import JSONType
 
 if TYPE_CHECKING:
     from fastlibrarian.models.shared import Tags
@@ -23,11 +24,18 @@ class Book(Base):
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
+    # title_key(title), kept in sync by _set_title_key
+    title_key: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        index=True,
+    )
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[BookStatus] = mapped_column(
         SQLEnum(BookStatus, name="book_status"),
         nullable=False,
         default=BookStatus.Ignored,
+        index=True,
     )
     a_status: Mapped[BookStatus] = mapped_column(
         SQLEnum(BookStatus, name="book_status"),
@@ -40,13 +48,16 @@ class Book(Base):
         default=BookStatus.Ignored,
     )
 
-    external_refs: Mapped[JSONB] = mapped_column(
-        JSONB,
+    external_refs: Mapped[dict | None] = mapped_column(
+        JSONType,
         nullable=True,
         default=dict,
     )
-    editions: Mapped[JSONB] = mapped_column(
-        JSONB,
+    # Fingerprint of the Hardcover data last stored (hardcover.work_hash), so
+    # refreshes skip unchanged works
+    content_hash: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    editions: Mapped[list | None] = mapped_column(
+        JSONType,
         nullable=True,
         default=dict,
     )
@@ -71,3 +82,27 @@ class Book(Base):
         passive_deletes=True,
         lazy="selectin",
     )
+
+    @validates("title")
+    def _set_title_key(self, _key: str, title: str) -> str:
+        self.title_key = title_key(title) if title else None
+        return title
+
+
+# Normalized ISBN-13/ASIN of every edition, for identifier -> book lookups
+book_identifiers = Table(
+    "book_identifiers",
+    Base.metadata,
+    Column("identifier", String(16), primary_key=True),
+    Column(
+        "book_id",
+        UUID(as_uuid=True),
+        ForeignKey("books.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+    Column("kind", String(8), nullable=False),
+)
+
+# Keyset pagination of faceted browsing orders by (lower(title), id)
+Index("ix_books_lower_title_id", func.lower(Book.title), Book.id)
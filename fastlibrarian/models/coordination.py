@@ -0,0 +1,23 @@
+"""Tables used to coordinate work between worker processes."""
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Table
+
+from fastlibrarian.db import Base
+
+# Fixed-window request counters shared by every worker
+rate_limits = Table(
+    "rate_limits",
+    Base.metadata,
+    Column("name", String(64), primary_key=True),
+    Column("window_start", BigInteger, nullable=False),
+    Column("count", Integer, nullable=False),
+)
+
+# Progress of incremental jobs, e.g. the add_date up to which dedupe has run
+job_state = Table(
+    "job_state",
+    Base.metadata,
+    Column("name", String(64), primary_key=True),
+    Column("watermark", DateTime, nullable=True),
+    Column("updated_at", DateTime, nullable=False),
+)
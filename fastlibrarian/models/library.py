@@ -0,0 +1,34 @@
+"""Library file model for FastLibrarian API."""
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import UUID, BigInteger, Float, ForeignKey, String, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from fastlibrarian.db import Base
+
+if TYPE_CHECKING:
+    from fastlibrarian.models.books import Book
+
+
+class LibraryFile(Base):
+    """A file found on disk by the library scanner.
+
+    ``size``, ``mtime`` and ``inode`` are cached so rescans can skip files
+    that have not changed since the previous scan.
+    """
+
+    __tablename__ = "library_files"
+
+    path: Mapped[str] = mapped_column(Text, primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    mtime: Mapped[float] = mapped_column(Float, nullable=False)
+    inode: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    media_type: Mapped[str] = mapped_column(String(16), nullable=False)
+    book_id: Mapped[UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("books.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    book: Mapped["Book | None"] = relationship("Book", lazy="noload")
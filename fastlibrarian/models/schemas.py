@@ -1,10 +1,12 @@
 """Pydantic schemas for FastLibrarian API models."""
 
+from datetime import datetime
 from enum import Enum
 from functools import cached_property
+from typing import Generic, Literal, TypeVar
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, computed_field
+from pydantic import BaseModel, ConfigDict, Field, computed_field
 
 
 class FastLibrarianConfig(BaseModel):
@@ -149,3 +151,196 @@ class BookRead(BookBase):
 AuthorRead.model_rebuild()
 SeriesRead.model_rebuild()
 BookRead.model_rebuild()
+
+
+class LibraryScanResult(BaseModel):
+    """Summary of a library filesystem scan."""
+
+    scanned: int = 0
+    unchanged: int = 0
+    added: int = 0
+    changed: int = 0
+    removed: int = 0
+    matched: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class DedupeResult(BaseModel):
+    """Summary of a duplicate detection and merge run."""
+
+    dry_run: bool = False
+    incremental: bool = False  # Only authors changed since the last run
+    keys_filled: int = 0  # Rows whose missing title/name key was computed
+    authors_checked: int = 0
+    author_clusters: int = 0
+    authors_merged: int = 0
+    books_checked: int = 0
+    blocks: int = 0  # Authors whose books were compared
+    oversized_blocks: int = 0  # Authors with too many books for fuzzy matching
+    comparisons: int = 0  # Fuzzy title comparisons
+    book_clusters: int = 0
+    books_merged: int = 0
+    examples: list[list[UUID]] = []  # Some clusters found by a dry run
+    elapsed_seconds: float = 0.0
+
+
+class WorksRefresh(BaseModel):
+    """Outcome of refreshing an author's books from Hardcover."""
+
+    works: int = 0  # Works Hardcover listed
+    added: int = 0
+    changed: int = 0  # Books whose Hardcover data differed from the stored hash
+    unchanged: int = 0
+    removed: int = 0  # Books with a Hardcover id no longer listed; kept
+
+
+class RefreshStatus(BaseModel):
+    """State of the scheduled author refresh."""
+
+    enabled: bool
+    running: bool  # Whether this worker runs the scheduler
+    authors: int  # Authors with a Hardcover id
+    due: int
+    never_refreshed: int
+    failing: int = 0  # Authors whose last scheduled refresh failed
+    spacing_seconds: float  # Current pause between refreshes
+    cycle_hours: float  # Time to refresh every author at the current pace
+    next_run_at: datetime | None = None
+    last_run_at: datetime | None = None  # Last refresh by this worker
+    last_author_id: UUID | None = None
+    last_result: WorksRefresh | None = None
+
+
+class BookshopEnrichRequest(BaseModel):
+    """Books to enrich with Bookshop availability.
+
+    The whole library is enriched by the ``POST /library/bookshop`` job.
+    """
+
+    book_ids: list[UUID] = Field(min_length=1, max_length=500)
+    formats: list[str] | None = None  # Defaults to the configured formats
+
+
+class BookshopEnrichResult(BaseModel):
+    """Summary of a Bookshop enrichment of the whole library."""
+
+    books: int = 0
+    available: int = 0  # Books with at least one format on Bookshop
+    elapsed_seconds: float = 0.0
+
+
+class BibliographyBook(BaseModel):
+    """A book in an author's bibliography."""
+
+    id: UUID
+    title: str
+    position: float | None = None  # Reading order within the series
+    status: BookStatus
+    a_status: BookStatus
+    p_status: BookStatus | None = None
+
+
+class BibliographySeries(BaseModel):
+    """A series with the author's books in reading order."""
+
+    id: UUID
+    name: str
+    books: list[BibliographyBook] = []
+
+
+class AuthorBibliography(BaseModel):
+    """An author's books grouped by series."""
+
+    id: UUID
+    name: str
+    bio: str | None = None
+    external_refs: dict | None = None
+    series: list[BibliographySeries] = []
+    standalone: list[BibliographyBook] = []  # Books in no series
+
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a cursor-paginated list."""
+
+    items: list[T]
+    next_cursor: str | None = None  # None on the last page
+
+
+class AuthorSummary(AuthorBase):
+    """Author list entry with book counts by status."""
+
+    id: UUID
+    book_counts: dict[str, int] = {}  # "total" and one entry per BookStatus
+    books: list[BookShort] | None = None  # Only with include=books
+
+
+class SeriesSummary(SeriesBase):
+    """Series list entry with book counts by status."""
+
+    id: UUID
+    book_counts: dict[str, int] = {}  # "total" and one entry per BookStatus
+    books: list[BookShort] | None = None  # Only with include=books
+
+
+class TagBase(BaseModel):
+    """Base schema for Tags."""
+
+    name: str = Field(min_length=1, max_length=50)
+    description: str | None = None
+
+
+class TagCreate(TagBase):
+    """Schema for creating or updating a Tag."""
+
+
+class TagRead(TagBase):
+    """Schema for reading a Tag."""
+
+    id: UUID
+    book_count: int = 0
+
+
+class TagCount(BaseModel):
+    """A tag and how many books in a result set have it."""
+
+    id: UUID
+    name: str
+    count: int
+
+
+class BookFacets(BaseModel):
+    """Books matching tag and status filters, with facet counts."""
+
+    total: int
+    tags: list[TagCount] = []  # Tags within the results, most common first
+    statuses: dict[str, int] = {}  # Per status, ignoring the status filter
+    books: Page[BookShort]
+    indexed: bool = False  # Counts came from the in-memory facet index
+
+
+class TypeaheadHit(BaseModel):
+    """An author, series or book whose name matches a typeahead query."""
+
+    kind: Literal["author", "series", "book"]
+    id: UUID
+    name: str
+
+
+class Typeahead(BaseModel):
+    """Typeahead matches for a query."""
+
+    items: list[TypeaheadHit] = []
+    indexed: bool = False  # Matches came from the in-memory prefix index
+
+
+class TypeaheadStats(BaseModel):
+    """Size of this worker's typeahead index."""
+
+    ready: bool
+    names: int
+    keys: int  # Indexed word starts
+    memory_bytes: int
+    max_entries: int
@@ -3,12 +3,13 @@
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import UUID, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import UUID, Index, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from fastlibrarian.db import Base
 from fastlibrarian.models.shared import series_books
+from fastlibrarian.normalize import name_key
+from fastlibrarian.sql import JSONType
 
 if TYPE_CHECKING:
     from fastlibrarian.models.shared import Tags
@@ -21,9 +22,15 @@ class Series(Base):
 
     id: Mapped[UUID] = mapped_column(UUID, primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # name_key(name), kept in sync by _set_name_key
+    name_key: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        index=True,
+    )
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    external_refs: Mapped[JSONB] = mapped_column(
-        JSONB,
+    external_refs: Mapped[dict | None] = mapped_column(
+        JSONType,
         nullable=True,
         default=dict,
     )
@@ -42,3 +49,12 @@ class Series(Base):
         passive_deletes=True,
         lazy="selectin",
     )
+
+    @validates("name")
+    def _set_name_key(self, _key: str, name: str) -> str:
+        self.name_key = name_key(name) if name else None
+        return name
+
+
+# Keyset pagination orders by (lower(name), id)
+Index("ix_series_lower_name_id", func.lower(Series.name), Series.id)
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import UUID, Column, ForeignKey, String, Table, Text
+from sqlalchemy import UUID, Column, Float, ForeignKey, Index, String, Table, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from fastlibrarian.db import Base
@@ -125,4 +125,11 @@ series_books = Table(
         ForeignKey("books.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    # Reading order within the series; Hardcover allows fractional positions
+    Column("position", Float, nullable=True),
 )
+
+# Tag -> tagged rows lookups; the primary keys only serve owner -> tags
+Index("ix_book_tags_tag_id_book_id", book_tags.c.tag_id, book_tags.c.book_id)
+Index("ix_author_tags_tag_id_author_id", author_tags.c.tag_id, author_tags.c.author_id)
+Index("ix_series_tags_tag_id_series_id", series_tags.c.tag_id, series_tags.c.series_id)
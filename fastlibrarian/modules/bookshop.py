@@ -1,6 +1,131 @@
+import asyncio
+import time
+from dataclasses import dataclass
 from typing import Any
 
 import httpx
+from loguru import logger
+from sqlalchemy import select
+
+from fastlibrarian.cache import TTLCache
+from fastlibrarian.config import AppConfig, get_config
+from fastlibrarian.coordination import lease, register_cache
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.metrics import record_external, track_job
+from fastlibrarian.models.schemas import BookshopEnrichResult
+
+SEARCH_ATTRIBUTES = [
+    "title",
+    "subtitle",
+    "ean",
+    "primary_contributor",
+    "contributors",
+]
+
+# Fields shared by every query sent to the multi-search endpoint
+QUERY_TEMPLATE: dict[str, Any] = {
+    "indexUid": "products",
+    "attributesToHighlight": ["*"],
+    "highlightPreTag": "__ais-highlight__",
+    "highlightPostTag": "__/ais-highlight__",
+    "offset": 0,
+    "matchingStrategy": "frequency",
+    "attributesToSearchOn": SEARCH_ATTRIBUTES,
+}
+PRODUCT_FACETS = ["format_category", "is_drm_free", "is_primary"]
+PRIMARY_FILTER = [['"is_primary"="true"']]
+
+ENRICH_JOB_NAME = "bookshop-enrich"
+# Books looked up and committed together when enriching the whole library
+ENRICH_BATCH_SIZE = 200
+
+_enrich_lock = asyncio.Lock()
+last_enrich_result: BookshopEnrichResult | None = None
+
+_client: httpx.AsyncClient | None = None
+
+# Results shared by all Bookshop instances, keyed by query and by EAN. Built
+# on first use, see get_caches
+_query_cache: TTLCache | None = None
+_ean_cache: TTLCache | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the pooled HTTP client shared by all Bookshop instances."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=get_config().external_apis.timeout,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+def get_caches() -> tuple[TTLCache, TTLCache]:
+    """Get the query and EAN caches, created from the current config."""
+    global _query_cache, _ean_cache
+    if _query_cache is None or _ean_cache is None:
+        ttl = get_config().external_apis.bookshop_cache_ttl
+        _query_cache = TTLCache(maxsize=20_000, ttl=ttl)
+        _ean_cache = TTLCache(maxsize=100_000, ttl=ttl)
+        register_cache("bookshop", _query_cache)
+        register_cache("bookshop", _ean_cache)
+    return _query_cache, _ean_cache
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def on_config_change(old: AppConfig, new: AppConfig) -> None:
+    """Apply a new request timeout and cache TTL in place."""
+    if _client is not None and old.external_apis.timeout != new.external_apis.timeout:
+        _client.timeout = httpx.Timeout(new.external_apis.timeout)
+    for cache in (_query_cache, _ean_cache):
+        if cache is not None:
+            cache.ttl = new.external_apis.bookshop_cache_ttl
+
+
+def product_query(
+    query: str,
+    format: str | None = None,
+    limit: int = 21,
+) -> dict[str, Any]:
+    """Build a single product query for the ``queries`` array."""
+    return {
+        **QUERY_TEMPLATE,
+        "q": query,
+        "facets": PRODUCT_FACETS,
+        "filter": [[f'"format_category"={format}']] if format else PRIMARY_FILTER,
+        "limit": limit,
+    }
+
+
+@dataclass(frozen=True)
+class BookshopQuery:
+    """A product search, optionally restricted to one format category."""
+
+    q: str
+    format: str | None = None
+    limit: int = 5
+
+    def body(self) -> dict[str, Any]:
+        return product_query(self.q, self.format, self.limit)
+
+
+def summarize_hit(hit: dict[str, Any]) -> dict[str, Any]:
+    """Keep the fields of a product hit needed for availability."""
+    return {
+        "ean": hit.get("ean"),
+        "title": hit.get("title"),
+        "format": hit.get("format_category"),
+        "price": hit.get("price", hit.get("list_price")),
+        "slug": hit.get("slug"),
+    }
 
 
 class Bookshop:
@@ -8,100 +133,24 @@ class Bookshop:
 
     BASE_URL = "https://bookshop.org/api/next/instantsearch/multi-search"
 
-    # Query body for a simple search (single query)
-    SIMPLE_QUERY_BODY = lambda self, query: {
-        "queries": [
-            {
-                "indexUid": "products",
-                "q": query,
-                "facets": [
-                    "format_category",
-                    "is_drm_free",
-                    "is_primary",
-                ],
-                "filter": [
-                    [
-                        '"is_primary"="true"',
-                    ],
-                ],
-                "attributesToHighlight": [
-                    "*",
-                ],
-                "highlightPreTag": "__ais-highlight__",
-                "highlightPostTag": "__/ais-highlight__",
-                "limit": 21,
-                "offset": 0,
-                "matchingStrategy": "frequency",
-                "attributesToSearchOn": [
-                    "title",
-                    "subtitle",
-                    "ean",
-                    "primary_contributor",
-                    "contributors",
-                ],
-            },
-        ],
-    }
+    # Queries sent per multi-search request
+    MAX_QUERIES_PER_REQUEST = 20
 
-    # Query body for a more complex search (multiple queries)
-    COMPLEX_QUERY_BODY = lambda self, query, format: {
-        "queries": [
-            {
-                "indexUid": "products",
-                "q": query,
-                "facets": [
-                    "format_category",
-                    "is_drm_free",
-                    "is_primary",
-                ],
-                "filter": [
-                    [
-                        f'"format_category"={format}',
-                    ],
-                ],
-                "attributesToHighlight": [
-                    "*",
-                ],
-                "highlightPreTag": "__ais-highlight__",
-                "highlightPostTag": "__/ais-highlight__",
-                "limit": 21,
-                "offset": 0,
-                "matchingStrategy": "frequency",
-                "attributesToSearchOn": [
-                    "title",
-                    "subtitle",
-                    "ean",
-                    "primary_contributor",
-                    "contributors",
-                ],
-            },
-            {
-                "indexUid": "products",
-                "q": query,
-                "facets": [
-                    "format_category",
-                ],
-                "attributesToHighlight": [
-                    "*",
-                ],
-                "highlightPreTag": "__ais-highlight__",
-                "highlightPostTag": "__/ais-highlight__",
-                "limit": 1,
-                "offset": 0,
-                "matchingStrategy": "frequency",
-                "attributesToSearchOn": [
-                    "title",
-                    "subtitle",
-                    "ean",
-                    "primary_contributor",
-                    "contributors",
-                ],
-            },
-        ],
-    }
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        self.client = client or get_client()
+        self.concurrency = get_config().external_apis.bookshop_concurrency
+        self.query_cache, self.ean_cache = get_caches()
 
-    def __init__(self):
-        self.client = httpx.AsyncClient()
+    async def _post(self, body: dict[str, Any]) -> httpx.Response:
+        """POST to the multi-search endpoint, recording the call's metrics."""
+        start = time.perf_counter()
+        try:
+            resp = await self.client.post(self.BASE_URL, json=body)
+        except httpx.HTTPError:
+            record_external("bookshop", "error", time.perf_counter() - start)
+            raise
+        record_external("bookshop", resp.status_code, time.perf_counter() - start)
+        return resp
 
     async def search(
         self,
@@ -118,17 +167,176 @@ class Bookshop:
         Returns:
             Optional[Dict[str, Any]]: The API response JSON, or None on error.
         """
-        body = (
-            self.COMPLEX_QUERY_BODY(query, format)
-            if use_complex
-            else self.SIMPLE_QUERY_BODY(query)
-        )
+        if use_complex:
+            queries = [
+                product_query(query, format),
+                {
+                    **QUERY_TEMPLATE,
+                    "q": query,
+                    "facets": ["format_category"],
+                    "limit": 1,
+                },
+            ]
+        else:
+            queries = [product_query(query)]
         try:
-            resp = await self.client.post(self.BASE_URL, json=body)
+            resp = await self._post({"queries": queries})
             resp.raise_for_status()
             return resp.json()
         except httpx.HTTPError:
             return None
 
+    async def _post_queries(
+        self,
+        queries: list[BookshopQuery],
+        semaphore: asyncio.Semaphore,
+    ) -> list[list[dict[str, Any]]]:
+        """Send one multi-search request and return the hits for each query."""
+        async with semaphore:
+            try:
+                resp = await self._post({"queries": [q.body() for q in queries]})
+                resp.raise_for_status()
+                results = resp.json().get("results", [])
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning(f"Bookshop multi-search failed: {e}")
+                return [[] for _ in queries]
+        hits = [[summarize_hit(h) for h in r.get("hits", [])] for r in results]
+        hits += [[] for _ in range(len(queries) - len(hits))]
+        for query, query_hits in zip(queries, hits, strict=False):
+            self.query_cache.set(query, query_hits)
+            for hit in query_hits:
+                if hit["ean"]:
+                    self.ean_cache.set(str(hit["ean"]), hit)
+        return hits
+
+    async def multi_search(
+        self,
+        queries: list[BookshopQuery],
+    ) -> list[list[dict[str, Any]]]:
+        """Run many queries, batched into as few requests as possible.
+
+        Cached queries are answered without a request; the rest are split into
+        ``MAX_QUERIES_PER_REQUEST``-sized multi-search requests sent
+        concurrently.
+
+        Returns:
+            The summarized hits for each query, in order.
+        """
+        results: list[list[dict[str, Any]] | None] = [
+            self.query_cache.get(q) for q in queries
+        ]
+        missing = list(
+            dict.fromkeys(
+                q for q, r in zip(queries, results, strict=True) if r is None
+            ),
+        )
+        if missing:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            size = self.MAX_QUERIES_PER_REQUEST
+            batches = [missing[i : i + size] for i in range(0, len(missing), size)]
+            fetched: dict[BookshopQuery, list[dict[str, Any]]] = {}
+            for batch, hits in zip(
+                batches,
+                await asyncio.gather(
+                    *(self._post_queries(b, semaphore) for b in batches),
+                ),
+                strict=True,
+            ):
+                fetched.update(zip(batch, hits, strict=True))
+            results = [
+                r if r is not None else fetched[q]
+                for q, r in zip(queries, results, strict=True)
+            ]
+        return results
+
+    def get_by_ean(self, ean: str) -> dict[str, Any] | None:
+        """Get a cached product by EAN (ISBN-13)."""
+        return self.ean_cache.get(str(ean))
+
+    async def availability(
+        self,
+        books: list[tuple[str, list[str]]],
+        formats: list[str],
+    ) -> list[dict[str, dict[str, Any] | None]]:
+        """Look up which formats are available for many books at once.
+
+        Args:
+            books: ``(search text, known ISBN-13s)`` for each book.
+            formats: Format categories to check.
+
+        Returns:
+            For each book, the best hit per format or None when unavailable.
+            Hits whose EAN is one of the book's ISBNs are preferred.
+        """
+        queries = [BookshopQuery(text, fmt) for text, _ in books for fmt in formats]
+        hits = iter(await self.multi_search(queries))
+        availability = []
+        for _, isbns in books:
+            by_format = {}
+            for fmt in formats:
+                format_hits = next(hits)
+                by_format[fmt] = next(
+                    (h for h in format_hits if h["ean"] and str(h["ean"]) in isbns),
+                    format_hits[0] if format_hits else None,
+                )
+            availability.append(by_format)
+        return availability
+
     async def aclose(self):
-        await self.client.aclose()
+        if self.client is not _client:
+            await self.client.aclose()
+
+
+async def enrich_library(formats: list[str]) -> BookshopEnrichResult:
+    """Enrich every book with Bookshop availability, a batch at a time.
+
+    Each batch is looked up and committed in its own session, so memory and
+    transactions stay small however large the library is.
+    """
+    from fastlibrarian.models.books import Book
+    from fastlibrarian.routers.books import enrich_bookshop_availability
+
+    start = time.perf_counter()
+    summary = BookshopEnrichResult()
+    last_id = None
+    while True:
+        async with AsyncSessionLocal() as db:
+            statement = select(Book.id).order_by(Book.id).limit(ENRICH_BATCH_SIZE)
+            if last_id is not None:
+                statement = statement.where(Book.id > last_id)
+            book_ids = list((await db.scalars(statement)).all())
+            if not book_ids:
+                break
+            enriched = await enrich_bookshop_availability(db, book_ids, formats)
+        last_id = book_ids[-1]
+        summary.books += len(book_ids)
+        summary.available += sum(
+            any(hit is not None for hit in by_format.values())
+            for by_format in enriched.values()
+        )
+    summary.elapsed_seconds = round(time.perf_counter() - start, 3)
+    logger.info(f"Bookshop enrichment finished: {summary.model_dump()}")
+    return summary
+
+
+def enrich_in_progress() -> bool:
+    """Whether this worker is enriching the whole library."""
+    return _enrich_lock.locked()
+
+
+async def run_enrich_library(formats: list[str]) -> BookshopEnrichResult | None:
+    """Enrich the whole library, skipping if an enrichment is running.
+
+    Only one worker runs it at a time; the others skip.
+    """
+    global last_enrich_result
+    if _enrich_lock.locked():
+        logger.warning("Bookshop enrichment already in progress, skipping.")
+        return None
+    async with _enrich_lock, lease(ENRICH_JOB_NAME) as acquired:
+        if not acquired:
+            logger.warning("Bookshop enrichment running on another worker, skipping.")
+            return None
+        with track_job(ENRICH_JOB_NAME):
+            last_enrich_result = await enrich_library(formats)
+    return last_enrich_result
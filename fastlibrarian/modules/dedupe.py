@@ -0,0 +1,642 @@
+"""Duplicate detection and merging for books and authors.
+
+Authors are duplicates when their ``name_key``s match and they are not
+linked to different Hardcover authors. Books are only compared with other
+books by the same author (blocking), so the work grows with the size of
+the largest bibliography rather than the square of the library. Within a
+block, exact ``title_key`` matches are grouped first and the remaining
+distinct keys are compared by token sort similarity.
+
+Each cluster keeps its best copy (owned or wanted over ignored, linked to
+Hardcover, oldest). The other copies' editions, statuses, authors, series,
+tags, identifiers and library files are folded into it with a few bulk
+statements per batch, then they are deleted.
+
+Runs are incremental: only authors added since the previous run, and
+authors with books added since then, are checked unless ``full`` is set.
+"""
+
+import asyncio
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import perf_counter
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import UUID as SQLUUID
+from sqlalchemy import (
+    Select,
+    Table,
+    bindparam,
+    column,
+    delete,
+    select,
+    true,
+    union,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.config import get_config
+from fastlibrarian.coordination import lease
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.events import ChangeEvent, book_update_events, publish
+from fastlibrarian.metrics import track_job
+from fastlibrarian.models.authors import Author
+from fastlibrarian.models.books import Book, book_identifiers
+from fastlibrarian.models.coordination import job_state
+from fastlibrarian.models.library import LibraryFile
+from fastlibrarian.models.schemas import BookStatus, DedupeResult
+from fastlibrarian.models.series import Series
+from fastlibrarian.models.shared import (
+    author_books,
+    author_tags,
+    book_tags,
+    series_books,
+)
+from fastlibrarian.normalize import (
+    DIGITS_RE,
+    name_key,
+    similar,
+    title_key,
+    token_sort,
+    trigrams,
+)
+from fastlibrarian.sql import insert, localtimestamp
+
+JOB_NAME = "dedupe"
+# Duplicates merged per transaction
+MERGE_BATCH_SIZE = 1000
+# Rows per UPDATE batch when filling in missing keys
+BACKFILL_BATCH_SIZE = 5000
+# Ids per IN list when loading and deleting merged rows
+LOOKUP_BATCH_SIZE = 1000
+# Groups of titles up to this size are compared pairwise; in larger ones a
+# title is only compared with titles sharing one of its rarest trigrams
+PAIRWISE_GROUP_SIZE = 64
+# Swapping two letters changes at most 4 trigrams, so one of this many is
+# left for a title differing by a single typo
+RARE_TRIGRAMS = 5
+# Authors with more distinct titles than this (usually bulk imported
+# catalogs rather than bibliographies) only get exact key matching
+MAX_FUZZY_BLOCK = 5000
+# Clusters listed in the result of a dry run
+EXAMPLE_CLUSTERS = 20
+
+STATUS_RANK = {
+    BookStatus.Have: 0,
+    BookStatus.Wanted: 1,
+    BookStatus.Ignored: 2,
+    BookStatus.Delete: 3,
+}
+
+_dedupe_lock = asyncio.Lock()
+last_dedupe_result: DedupeResult | None = None
+
+
+class DisjointSet:
+    """Union-find over ids, used to turn duplicate pairs into clusters."""
+
+    def __init__(self) -> None:
+        self.parent: dict[UUID, UUID] = {}
+
+    def find(self, id: UUID) -> UUID:
+        parent = self.parent.setdefault(id, id)
+        while parent != id:
+            grandparent = self.parent[parent]
+            self.parent[id] = grandparent
+            id, parent = parent, grandparent
+        return id
+
+    def union(self, a: UUID, b: UUID) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+    def clusters(self) -> list[list[UUID]]:
+        """Groups of more than one id."""
+        groups: dict[UUID, list[UUID]] = {}
+        for id in self.parent:
+            groups.setdefault(self.find(id), []).append(id)
+        return [ids for ids in groups.values() if len(ids) > 1]
+
+
+@dataclass(slots=True)
+class BlockStats:
+    blocks: int = 0
+    oversized: int = 0  # Blocks too large for fuzzy matching
+    comparisons: int = 0
+
+
+def _candidates(group: list[str], sorted_keys: dict[str, str]) -> dict[str, set]:
+    """Keys sharing one of each key's rarest trigrams within ``group``."""
+    grams = {key: trigrams(sorted_keys[key]) for key in group}
+    frequency = Counter(gram for key in group for gram in grams[key])
+    index: dict[str, list[str]] = {}
+    for key in group:
+        for gram in grams[key]:
+            index.setdefault(gram, []).append(key)
+    candidates: dict[str, set] = {key: set() for key in group}
+    for key in group:
+        for gram in sorted(grams[key], key=frequency.__getitem__)[:RARE_TRIGRAMS]:
+            for other in index[gram]:
+                if other != key:
+                    candidates[key].add(other)
+                    candidates[other].add(key)
+    return candidates
+
+
+def _compare_keys(
+    keys: Sequence[str],
+    threshold: float,
+    stats: BlockStats,
+) -> Iterable[tuple[str, str]]:
+    """Yield pairs of similar keys among the distinct keys of one block.
+
+    Only keys with the same numbers can match, so keys are grouped by them
+    first. Within a group, each key is only compared with longer keys short
+    enough to reach ``threshold`` and, in large groups, sharing one of its
+    rarest trigrams.
+    """
+    sorted_keys = {key: token_sort(key) for key in keys}
+    groups: dict[tuple[str, ...], list[str]] = {}
+    for key in keys:
+        groups.setdefault(tuple(DIGITS_RE.findall(key)), []).append(key)
+    # similar() needs 2 * shorter / (shorter + longer) >= threshold
+    stretch = (2 - threshold) / threshold
+    for group in groups.values():
+        group.sort(key=lambda k: (len(k), k))
+        order = {key: i for i, key in enumerate(group)}
+        candidates = (
+            _candidates(group, sorted_keys)
+            if len(group) > PAIRWISE_GROUP_SIZE
+            else None
+        )
+        for i, a in enumerate(group):
+            longest = len(a) * stretch
+            others = (
+                group[i + 1 :]
+                if candidates is None
+                else sorted(
+                    (b for b in candidates[a] if order[b] > i),
+                    key=order.__getitem__,
+                )
+            )
+            for b in others:
+                if len(b) > longest:
+                    break
+                stats.comparisons += 1
+                if similar(sorted_keys[a], sorted_keys[b], threshold):
+                    yield a, b
+
+
+def cluster_books(
+    blocks: Iterable[Sequence[tuple[UUID, str]]],
+    threshold: float,
+) -> tuple[list[list[UUID]], BlockStats]:
+    """Find clusters of duplicate books.
+
+    Args:
+        blocks: ``(book_id, title_key)`` pairs of each author's books. A
+            book by several authors appears in several blocks.
+        threshold: Minimum ``similar`` ratio of two titles.
+    """
+    stats = BlockStats()
+    dsu = DisjointSet()
+    for block in blocks:
+        stats.blocks += 1
+        by_key: dict[str, list[UUID]] = {}
+        for book_id, key in block:
+            by_key.setdefault(key, []).append(book_id)
+        for ids in by_key.values():
+            for other in ids[1:]:
+                dsu.union(ids[0], other)
+        if len(by_key) > MAX_FUZZY_BLOCK:
+            stats.oversized += 1
+        elif threshold < 1.0 and len(by_key) > 1:
+            for a, b in _compare_keys(list(by_key), threshold, stats):
+                dsu.union(by_key[a][0], by_key[b][0])
+    return dsu.clusters(), stats
+
+
+def cluster_authors(
+    rows: Iterable[tuple[UUID, str, object, datetime]],
+) -> list[list[UUID]]:
+    """Group authors sharing a name key, survivor first.
+
+    Authors linked to different Hardcover ids are namesakes and are kept
+    apart; unlinked authors join the group only if it has a single one.
+    """
+    by_key: dict[str, list[tuple[UUID, object, datetime]]] = {}
+    for author_id, key, hardcover_id, add_date in rows:
+        by_key.setdefault(key, []).append((author_id, hardcover_id, add_date))
+    clusters = []
+    for members in by_key.values():
+        if len(members) < 2:
+            continue
+        linked: dict[object, list] = {}
+        unlinked = []
+        for member in members:
+            if member[1] is None:
+                unlinked.append(member)
+            else:
+                linked.setdefault(member[1], []).append(member)
+        groups = list(linked.values())
+        if len(groups) <= 1:
+            groups = [(groups[0] if groups else []) + unlinked]
+        for group in groups:
+            if len(group) > 1:
+                # Hardcover-linked first, then the oldest
+                group.sort(key=lambda m: (m[1] is None, m[2], str(m[0])))
+                clusters.append([m[0] for m in group])
+    return clusters
+
+
+def _book_rank(book) -> tuple:
+    return (
+        STATUS_RANK.get(book.status, len(STATUS_RANK)),
+        not (book.external_refs or {}).get("hardcover_id"),
+        book.add_date,
+        str(book.id),
+    )
+
+
+def _best_status(statuses: Iterable[BookStatus | None]) -> BookStatus | None:
+    present = [s for s in statuses if s is not None]
+    return min(present, key=STATUS_RANK.get) if present else None
+
+
+def _merge_editions(books: Sequence) -> list[dict]:
+    editions = []
+    seen = set()
+    for book in books:
+        for edition in book.editions if isinstance(book.editions, list) else []:
+            identity = tuple(edition.get(k) for k in ("isbn_13", "isbn_10", "asin"))
+            if not any(identity) or identity not in seen:
+                seen.add(identity)
+                editions.append(edition)
+    return editions
+
+
+def _merge_refs(rows: Sequence) -> dict:
+    """External refs of all rows, the first (surviving) row's winning."""
+    refs = {}
+    for row in reversed(rows):
+        refs.update(row.external_refs or {})
+    return refs
+
+
+@dataclass(slots=True)
+class MergePlan:
+    """Surviving row of every merged id, and the survivors' new values."""
+
+    survivors: dict[UUID, UUID] = field(default_factory=dict)
+    updates: list[dict] = field(default_factory=list)
+
+
+def _chunks(ids: Sequence[UUID]) -> Iterable[Sequence[UUID]]:
+    for i in range(0, len(ids), LOOKUP_BATCH_SIZE):
+        yield ids[i : i + LOOKUP_BATCH_SIZE]
+
+
+def _merge_map(survivors: dict[UUID, UUID]):
+    """``(old_id, new_id)`` rows as a CTE, which PostgreSQL and SQLite share."""
+    return (
+        values(
+            column("old_id", SQLUUID(as_uuid=True)),
+            column("new_id", SQLUUID(as_uuid=True)),
+            name="merge_map",
+        )
+        .data(list(survivors.items()))
+        .cte("merge_map")
+    )
+
+
+async def _relink(
+    db: AsyncSession,
+    table: Table,
+    column_name: str,
+    survivors: dict[UUID, UUID],
+) -> None:
+    """Copy ``table`` rows of merged ids to their survivors.
+
+    Rows the survivor already has are kept as they are; the merged ids'
+    rows go away with them through ``ON DELETE CASCADE``.
+    """
+    merge_map = _merge_map(survivors)
+    columns = [
+        merge_map.c.new_id if c.name == column_name else c for c in table.columns
+    ]
+    await db.execute(
+        insert(table)
+        .from_select(
+            [c.name for c in table.columns],
+            select(*columns)
+            .join(merge_map, table.c[column_name] == merge_map.c.old_id)
+            # SQLite can't tell ON CONFLICT from a join's ON without a WHERE
+            .where(true()),
+        )
+        .on_conflict_do_nothing(),
+    )
+
+
+async def _fill_keys(db: AsyncSession) -> int:
+    """Compute missing keys, e.g. of rows bulk loaded without the ORM."""
+    filled = 0
+    for model, source, target, make_key in (
+        (Author, Author.name, Author.name_key, name_key),
+        (Series, Series.name, Series.name_key, name_key),
+        (Book, Book.title, Book.title_key, title_key),
+    ):
+        result = await db.execute(
+            select(model.id, source).where(target.is_(None), source.is_not(None)),
+        )
+        rows = result.all()
+        statement = (
+            update(model.__table__)
+            .where(model.__table__.c.id == bindparam("row_id"))
+            .values({target.key: bindparam("key")})
+        )
+        for i in range(0, len(rows), BACKFILL_BATCH_SIZE):
+            await db.execute(
+                statement,
+                [
+                    {"row_id": id, "key": make_key(value)}
+                    for id, value in rows[i : i + BACKFILL_BATCH_SIZE]
+                ],
+            )
+        filled += len(rows)
+    if filled:
+        await db.commit()
+    return filled
+
+
+async def _author_candidates(db: AsyncSession, since: datetime | None) -> list:
+    statement = select(
+        Author.id,
+        Author.name_key,
+        Author.external_refs["hardcover_id"].as_string(),
+        Author.add_date,
+    ).where(Author.name_key.is_not(None))
+    if since is not None:
+        new_keys = select(Author.name_key).where(Author.add_date > since)
+        statement = statement.where(Author.name_key.in_(new_keys))
+    return (await db.execute(statement)).all()
+
+
+async def _merge_authors(db: AsyncSession, clusters: list[list[UUID]]) -> int:
+    """Merge each cluster of authors into its first author."""
+    merged = 0
+    for i in range(0, len(clusters), MERGE_BATCH_SIZE):
+        batch = clusters[i : i + MERGE_BATCH_SIZE]
+        ids = [id for cluster in batch for id in cluster]
+        rows = {}
+        for chunk in _chunks(ids):
+            result = await db.execute(
+                select(Author.id, Author.bio, Author.external_refs).where(
+                    Author.id.in_(chunk),
+                ),
+            )
+            rows.update((row.id, row) for row in result.all())
+        plan = MergePlan()
+        for cluster in batch:
+            members = [rows[id] for id in cluster if id in rows]
+            if len(members) < 2:
+                continue
+            survivor = members[0]
+            for member in members[1:]:
+                plan.survivors[member.id] = survivor.id
+            plan.updates.append(
+                {
+                    "row_id": survivor.id,
+                    "new_bio": next((m.bio for m in members if m.bio), None),
+                    "new_refs": _merge_refs(members),
+                },
+            )
+        if not plan.survivors:
+            continue
+        await db.execute(
+            update(Author.__table__)
+            .where(Author.__table__.c.id == bindparam("row_id"))
+            .values(bio=bindparam("new_bio"), external_refs=bindparam("new_refs")),
+            plan.updates,
+        )
+        for table in (author_books, author_tags):
+            await _relink(db, table, "author_id", plan.survivors)
+        for chunk in _chunks(list(plan.survivors)):
+            await db.execute(delete(Author).where(Author.id.in_(chunk)))
+        await publish(
+            db,
+            *(
+                ChangeEvent(kind="author", action="deleted", id=id)
+                for id in plan.survivors
+            ),
+            *(
+                ChangeEvent(kind="author", action="updated", id=u["row_id"])
+                for u in plan.updates
+            ),
+        )
+        await db.commit()
+        merged += len(plan.survivors)
+    return merged
+
+
+def _dirty_authors(since: datetime) -> Select:
+    """Authors added since ``since`` or with books added since then."""
+    return union(
+        select(Author.id).where(Author.add_date > since),
+        select(author_books.c.author_id)
+        .join(Book, Book.id == author_books.c.book_id)
+        .where(Book.add_date > since),
+    )
+
+
+async def _load_blocks(
+    db: AsyncSession,
+    since: datetime | None,
+) -> tuple[list[list[tuple[UUID, str]]], int]:
+    """Each checked author's ``(book_id, title_key)`` pairs, and the book count."""
+    statement = (
+        select(author_books.c.author_id, Book.id, Book.title_key)
+        .join(Book, Book.id == author_books.c.book_id)
+        .where(Book.title_key.is_not(None))
+        .order_by(author_books.c.author_id)
+    )
+    if since is not None:
+        statement = statement.where(
+            author_books.c.author_id.in_(_dirty_authors(since)),
+        )
+    blocks: list[list[tuple[UUID, str]]] = []
+    books: set[UUID] = set()
+    current = None
+    result = await db.stream(statement.execution_options(yield_per=10_000))
+    async for partition in result.partitions():
+        for author_id, book_id, key in partition:
+            if author_id != current:
+                current = author_id
+                blocks.append([])
+            blocks[-1].append((book_id, key))
+            books.add(book_id)
+    return [block for block in blocks if len(block) > 1], len(books)
+
+
+async def _merge_books(db: AsyncSession, clusters: list[list[UUID]]) -> int:
+    """Merge each cluster of books into its best copy."""
+    merged = 0
+    for i in range(0, len(clusters), MERGE_BATCH_SIZE):
+        batch = clusters[i : i + MERGE_BATCH_SIZE]
+        ids = [id for cluster in batch for id in cluster]
+        rows = {}
+        for chunk in _chunks(ids):
+            result = await db.execute(
+                select(
+                    Book.id,
+                    Book.status,
+                    Book.a_status,
+                    Book.p_status,
+                    Book.editions,
+                    Book.external_refs,
+                    Book.add_date,
+                ).where(Book.id.in_(chunk)),
+            )
+            rows.update((row.id, row) for row in result.all())
+        plan = MergePlan()
+        for cluster in batch:
+            members = sorted((rows[id] for id in cluster if id in rows), key=_book_rank)
+            if len(members) < 2:
+                continue
+            survivor = members[0]
+            for member in members[1:]:
+                plan.survivors[member.id] = survivor.id
+            plan.updates.append(
+                {
+                    "row_id": survivor.id,
+                    "new_status": _best_status(m.status for m in members),
+                    "new_a_status": _best_status(m.a_status for m in members),
+                    "new_p_status": _best_status(m.p_status for m in members),
+                    "new_editions": _merge_editions(members),
+                    "new_refs": _merge_refs(members),
+                },
+            )
+        if not plan.survivors:
+            continue
+        await db.execute(
+            update(Book.__table__)
+            .where(Book.__table__.c.id == bindparam("row_id"))
+            .values(
+                status=bindparam("new_status"),
+                a_status=bindparam("new_a_status"),
+                p_status=bindparam("new_p_status"),
+                editions=bindparam("new_editions"),
+                external_refs=bindparam("new_refs"),
+            ),
+            plan.updates,
+        )
+        for table in (author_books, series_books, book_tags, book_identifiers):
+            await _relink(db, table, "book_id", plan.survivors)
+        merge_map = _merge_map(plan.survivors)
+        await db.execute(
+            update(LibraryFile)
+            .where(LibraryFile.book_id == merge_map.c.old_id)
+            .values(book_id=merge_map.c.new_id),
+        )
+        for chunk in _chunks(list(plan.survivors)):
+            await db.execute(delete(Book).where(Book.id.in_(chunk)))
+        await publish(
+            db,
+            *(
+                ChangeEvent(kind="book", action="deleted", id=id)
+                for id in plan.survivors
+            ),
+            *await book_update_events(db, [u["row_id"] for u in plan.updates]),
+        )
+        await db.commit()
+        merged += len(plan.survivors)
+    return merged
+
+
+async def dedupe(
+    db: AsyncSession,
+    full: bool = False,
+    dry_run: bool = False,
+    threshold: float | None = None,
+) -> DedupeResult:
+    """Find and merge duplicate authors and books.
+
+    Args:
+        full: Check every author instead of those changed since the last run.
+        dry_run: Only report what would be merged.
+        threshold: Minimum title similarity, defaults to
+            ``library.dedupe_threshold``.
+    """
+    start = perf_counter()
+    threshold = threshold or get_config().library.dedupe_threshold
+    summary = DedupeResult(dry_run=dry_run)
+    started_at = (await db.execute(select(localtimestamp()))).scalar_one()
+    since = None
+    if not full:
+        result = await db.execute(
+            select(job_state.c.watermark).where(job_state.c.name == JOB_NAME),
+        )
+        since = result.scalar_one_or_none()
+    summary.incremental = since is not None
+
+    if not dry_run:
+        summary.keys_filled = await _fill_keys(db)
+
+    author_rows = await _author_candidates(db, since)
+    author_clusters = cluster_authors(author_rows)
+    summary.authors_checked = len(author_rows)
+    summary.author_clusters = len(author_clusters)
+    if not dry_run:
+        summary.authors_merged = await _merge_authors(db, author_clusters)
+
+    blocks, summary.books_checked = await _load_blocks(db, since)
+    # Comparing titles is CPU bound; keep the event loop free meanwhile
+    book_clusters, stats = await asyncio.to_thread(cluster_books, blocks, threshold)
+    summary.blocks = stats.blocks
+    summary.oversized_blocks = stats.oversized
+    summary.comparisons = stats.comparisons
+    summary.book_clusters = len(book_clusters)
+    if dry_run:
+        summary.examples = book_clusters[:EXAMPLE_CLUSTERS]
+    else:
+        summary.books_merged = await _merge_books(db, book_clusters)
+        state = {"watermark": started_at, "updated_at": started_at}
+        await db.execute(
+            insert(job_state)
+            .values(name=JOB_NAME, **state)
+            .on_conflict_do_update(index_elements=["name"], set_=state),
+        )
+        await db.commit()
+
+    summary.elapsed_seconds = round(perf_counter() - start, 3)
+    logger.info(f"Dedupe finished: {summary.model_dump(exclude={'examples'})}")
+    return summary
+
+
+def dedupe_in_progress() -> bool:
+    """Whether a dedupe run is currently running."""
+    return _dedupe_lock.locked()
+
+
+async def run_dedupe(full: bool = False, dry_run: bool = False) -> DedupeResult | None:
+    """Run dedupe in its own session, skipping if one is running.
+
+    Only one worker runs it at a time; the others skip.
+    """
+    global last_dedupe_result
+    if _dedupe_lock.locked():
+        logger.warning("Dedupe already in progress, skipping.")
+        return None
+    async with _dedupe_lock, lease(JOB_NAME) as acquired:
+        if not acquired:
+            logger.warning("Dedupe running on another worker, skipping.")
+            return None
+        with track_job(JOB_NAME):
+            async with AsyncSessionLocal() as db:
+                last_dedupe_result = await dedupe(db, full=full, dry_run=dry_run)
+    return last_dedupe_result
@@ -0,0 +1,60 @@
+"""Connected download clients built from the live configuration."""
+
+from typing import Any
+
+from loguru import logger
+
+from fastlibrarian.config import (
+    AppConfig,
+    DownloadClientConfig,
+    DownloadClientType,
+    get_config,
+)
+from fastlibrarian.modules.qbittorrent import connect_to_qbt
+
+
+def connect(client_config: DownloadClientConfig) -> Any:
+    """Connect to a download client."""
+    if client_config.client_type == DownloadClientType.qbittorrent:
+        return connect_to_qbt(
+            client_config.client_ip,
+            client_config.client_port,
+            client_config.client_username,
+            client_config.client_password,
+        )
+    raise ValueError(f"Unsupported download client type: {client_config.client_type}")
+
+
+class DownloadClientManager:
+    """Cache of connected download clients, one per configured client.
+
+    Clients connect lazily on first use. When the configuration changes only
+    clients whose settings changed are dropped and reconnected, so the others
+    keep their sessions.
+    """
+
+    def __init__(self) -> None:
+        self._clients: dict[int, tuple[DownloadClientConfig, Any]] = {}
+
+    def get(self, index: int = 0) -> Any:
+        """Get the connected client for ``download_clients[index]``."""
+        client_config = get_config().download_clients[index]
+        cached = self._clients.get(index)
+        if cached is not None and cached[0] == client_config:
+            return cached[1]
+        client = connect(client_config)
+        self._clients[index] = (client_config, client)
+        return client
+
+    def on_config_change(self, old: AppConfig, new: AppConfig) -> None:
+        """Drop clients whose configuration changed or was removed."""
+        for index, (client_config, _) in list(self._clients.items()):
+            if (
+                index >= len(new.download_clients)
+                or new.download_clients[index] != client_config
+            ):
+                del self._clients[index]
+                logger.info(f"Download client {index} will reconnect with new config")
+
+
+download_clients = DownloadClientManager()
@@ -1,118 +1,524 @@
+"""Hardcover GraphQL API client.
+
+Every operation is a parameterized document defined once below: values are
+sent as ``variables``, never interpolated into the query text, so names with
+quotes are safe and identical calls produce identical requests. Documents
+are minified and hashed at import for automatic persisted queries (APQ):
+the client first sends only the hash and falls back to the full text when
+the server does not know it, or for good when the server does not support
+APQ. Successful results are cached per operation and variables, and
+identical calls made while one is in flight wait for it instead of sending
+their own request.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
 import httpx
 from loguru import logger
 
-from fastlibrarian.config import ExternalAPIConfig
+from fastlibrarian.cache import TTLCache
+from fastlibrarian.config import AppConfig, ExternalAPIConfig, get_config
+from fastlibrarian.coordination import RateLimiter, register_cache
+from fastlibrarian.metrics import record_external
+from fastlibrarian.singleflight import Group
+
+_client: httpx.AsyncClient | None = None
+
+# Cleared with POST /config/caches/invalidate?namespace=hardcover; a key is
+# the operation name and its variables as compact JSON with sorted keys.
+# Built on first use, see get_response_cache
+_response_cache: TTLCache | None = None
+# Requests in flight, by the same key as the response cache
+_in_flight = Group("hardcover")
+
+# Contributions fetched per request by HardcoverAPI.get_works
+WORKS_PAGE_SIZE = 100
+
+# Error codes and messages of the Apollo APQ protocol
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+# Cleared when the server says it does not support persisted queries
+_persisted_queries_supported = True
+
+# Shared by all workers so the quota is not multiplied by the worker count.
+# Built on first use, see get_rate_limiter
+_rate_limiter: RateLimiter | None = None
+
+
+def api_key(config: ExternalAPIConfig) -> str:
+    """The configured Hardcover API key, or an empty string."""
+    return config.hardcover_api_key or os.getenv("HARD_COVER_API_KEY", "")
+
+
+def auth_headers(config: ExternalAPIConfig) -> dict[str, str]:
+    """Authorization header for the configured Hardcover API key."""
+    return {"authorization": f"Bearer {api_key(config)}"}
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the pooled HTTP client shared by all HardcoverAPI instances."""
+    global _client
+    if _client is None or _client.is_closed:
+        config = get_config().external_apis
+        _client = httpx.AsyncClient(
+            headers=auth_headers(config),
+            base_url=config.hardcover_url,
+            timeout=config.timeout,
+        )
+    return _client
+
+
+def get_response_cache() -> TTLCache:
+    """Get the cache of Hardcover results, created from the current config."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = TTLCache(
+            maxsize=10_000,
+            ttl=get_config().external_apis.hardcover_cache_ttl,
+        )
+        register_cache("hardcover", _response_cache)
+    return _response_cache
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the shared Hardcover rate limit, created from the current config."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        config = get_config().external_apis
+        _rate_limiter = RateLimiter(
+            "hardcover",
+            config.rate_limit_requests,
+            config.rate_limit_window,
+        )
+    return _rate_limiter
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def on_config_change(old: AppConfig, new: AppConfig) -> None:
+    """Rotate the API key, timeout, rate limit and cache TTL in place.
+
+    A new endpoint starts with an empty cache and tries persisted queries
+    again.
+    """
+    global _persisted_queries_supported
+    if old.external_apis == new.external_apis:
+        return
+    if _rate_limiter is not None:
+        _rate_limiter.configure(
+            new.external_apis.rate_limit_requests,
+            new.external_apis.rate_limit_window,
+        )
+    new_endpoint = old.external_apis.hardcover_url != new.external_apis.hardcover_url
+    if _response_cache is not None:
+        _response_cache.ttl = new.external_apis.hardcover_cache_ttl
+        if new_endpoint:
+            _response_cache.clear()
+    if new_endpoint:
+        _persisted_queries_supported = True
+    if _client is not None:
+        _client.headers.update(auth_headers(new.external_apis))
+        _client.timeout = httpx.Timeout(new.external_apis.timeout)
+        _client.base_url = new.external_apis.hardcover_url
+
+
+async def post(payload: dict) -> httpx.Response | None:
+    """POST a GraphQL payload within the shared rate limit.
+
+    Returns:
+        The response, or None if the rate limit stayed exhausted for the
+        configured timeout.
+    """
+    if not await get_rate_limiter().acquire(
+        max_wait=get_config().external_apis.timeout
+    ):
+        return None
+    start = time.perf_counter()
+    try:
+        resp = await get_client().post("", json=payload)
+    except httpx.HTTPError:
+        record_external("hardcover", "error", time.perf_counter() - start)
+        raise
+    record_external("hardcover", resp.status_code, time.perf_counter() - start)
+    return resp
+
+
+@dataclass(frozen=True)
+class Operation:
+    """A named, parameterized GraphQL document.
+
+    The document is minified once, and its SHA-256 is what persisted query
+    requests send instead of the text.
+    """
+
+    name: str
+    document: str
+    sha256: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        document = " ".join(self.document.split())
+        object.__setattr__(self, "document", document)
+        object.__setattr__(
+            self, "sha256", hashlib.sha256(document.encode()).hexdigest()
+        )
+
+    def cache_key(self, variables: dict[str, Any]) -> str:
+        """Key of a result in the response cache."""
+        encoded = json.dumps(variables, sort_keys=True, separators=(",", ":"))
+        return f"{self.name}:{encoded}"
+
+
+SEARCH_AUTHORS = Operation(
+    "SearchAuthors",
+    """
+    query SearchAuthors($query: String!) {
+      search(query: $query, query_type: "Author", per_page: 5, page: 1) {
+        results
+      }
+    }
+    """,
+)
+
+SEARCH_BOOKS = Operation(
+    "SearchBooks",
+    """
+    query SearchBooks($query: String!) {
+      search(query: $query, query_type: "Book", per_page: 5, page: 1) {
+        results
+      }
+    }
+    """,
+)
+
+SEARCH_SERIES = Operation(
+    "SearchSeries",
+    """
+    query SearchSeries($query: String!) {
+      search(query: $query, query_type: "Series", per_page: 5, page: 1) {
+        results {
+          ... on SeriesSearchResult {
+            id
+            name
+            description
+          }
+        }
+      }
+    }
+    """,
+)
+
+# book_status_id 4 marks books Hardcover deduplicated into another
+AUTHOR_WORKS = Operation(
+    "AuthorWorks",
+    """
+    query AuthorWorks($authorId: Int!, $limit: Int!, $offset: Int!) {
+      contributions(
+        where: {author_id: {_eq: $authorId}, book: {book_status_id: {_neq: "4"}}}
+        order_by: {id: asc}
+        limit: $limit
+        offset: $offset
+      ) {
+        book {
+          id
+          title
+          description
+          slug
+          editions {
+            asin
+            isbn_10
+            isbn_13
+          }
+          book_series {
+            position
+            series {
+              name
+              id
+            }
+          }
+        }
+      }
+    }
+    """,
+)
+
+
+class HardcoverError(Exception):
+    """A Hardcover request failed or was rate limited."""
+
+
+def _error_codes(body: dict[str, Any]) -> set[str]:
+    codes = set()
+    for error in body.get("errors") or []:
+        codes.add(error.get("message", ""))
+        codes.add((error.get("extensions") or {}).get("code", ""))
+    return codes
+
+
+def _persisted_queries_unsupported(body: dict[str, Any]) -> bool:
+    """Whether a hash-only request failed because APQ is not supported.
+
+    Servers without APQ either say so or reject the request for missing
+    its query text. Other errors, such as rate limits, are not a reason to
+    stop sending hashes.
+    """
+    for error in body.get("errors") or []:
+        message = error.get("message", "")
+        code = (error.get("extensions") or {}).get("code", "")
+        if PERSISTED_QUERY_NOT_SUPPORTED in (message, code):
+            return True
+        lowered = message.lower()
+        if "query" in lowered and any(
+            reason in lowered for reason in ("not present", "missing", "required")
+        ):
+            return True
+    return False
+
+
+async def _send(payload: dict[str, Any]) -> dict[str, Any] | None:
+    """POST a payload, returning the decoded body or None on failure."""
+    resp = await post(payload)
+    if resp is None:
+        return None
+    logger.debug(f"Hardcover API response: {resp.text}")
+    try:
+        body = resp.json()
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+async def execute(
+    operation: Operation,
+    variables: dict[str, Any],
+) -> dict[str, Any] | None:
+    """Run an operation, returning its ``data`` or None on failure.
+
+    Results without errors are cached for ``hardcover_cache_ttl`` seconds.
+    Concurrent calls with the same operation and variables share one
+    request.
+    """
+    key = operation.cache_key(variables)
+    cached = get_response_cache().get(key)
+    if cached is not None:
+        return cached
+    return await _in_flight.do(key, lambda: _execute(operation, variables, key))
+
+
+async def _execute(
+    operation: Operation,
+    variables: dict[str, Any],
+    key: str,
+) -> dict[str, Any] | None:
+    global _persisted_queries_supported
+    payload: dict[str, Any] = {"operationName": operation.name, "variables": variables}
+    body = None
+    if (
+        get_config().external_apis.hardcover_persisted_queries
+        and _persisted_queries_supported
+    ):
+        payload["extensions"] = {
+            "persistedQuery": {"version": 1, "sha256Hash": operation.sha256},
+        }
+        body = await _send(payload)
+        if body is None:
+            return None
+        codes = _error_codes(body)
+        if PERSISTED_QUERY_NOT_FOUND in codes:
+            # Send the text once so the server registers the hash
+            body = None
+        elif _persisted_queries_unsupported(body):
+            logger.info("Hardcover does not support persisted queries, sending text")
+            _persisted_queries_supported = False
+            payload.pop("extensions")
+            body = None
+    if body is None:
+        body = await _send({**payload, "query": operation.document})
+    if body is None:
+        return None
+    data = body.get("data")
+    if body.get("errors"):
+        logger.warning(f"Hardcover {operation.name} errors: {body['errors']}")
+    elif isinstance(data, dict):
+        get_response_cache().set(key, data)
+    return data
+
+
+def search_query(text: str) -> str:
+    """Search text with case and spacing normalized.
+
+    Hardcover's search ignores both, so normalizing lets "le guin" and
+    "Le  Guin" share a cache entry and an in-flight request.
+    """
+    return " ".join(text.split()).lower()
+
+
+def _author_summary(doc: dict[str, Any]) -> dict[str, Any]:
+    return {"name": doc.get("name"), "bio": doc.get("bio"), "id": doc.get("id")}
+
+
+def _book_summary(doc: dict[str, Any]) -> dict[str, Any]:
+    authors = []
+    for c in doc.get("contributions", []):
+        author = c.get("author")
+        if author:
+            authors.append(
+                {
+                    "id": author.get("id"),
+                    "name": author.get("name"),
+                    "bio": author.get("bio"),
+                },
+            )
+    if not authors and doc.get("author_names"):
+        authors = [{"name": doc["author_names"][0]}]
+    return {
+        "title": doc.get("title"),
+        "description": doc.get("description"),
+        "authors": authors,
+        "series": doc.get("featured_series"),
+    }
+
+
+def work_hash(work: dict[str, Any]) -> str:
+    """Fingerprint of the Hardcover data stored for a work.
+
+    Covers the title, description, editions and series, normalized so that
+    whitespace and the order Hardcover lists editions and series in don't
+    count as changes.
+    """
+    editions = sorted(
+        (e.get("isbn_13") or "", e.get("isbn_10") or "", e.get("asin") or "")
+        for e in work.get("editions") or []
+    )
+    series = sorted(
+        (str(s.get("series_id") or ""), s.get("name") or "", s.get("position") or 0)
+        for s in work.get("book_series") or []
+    )
+    payload = [
+        " ".join((work.get("title") or "").split()),
+        " ".join((work.get("description") or "").split()),
+        editions,
+        series,
+    ]
+    encoded = json.dumps(payload, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _work(book: dict[str, Any]) -> dict[str, Any]:
+    book_series = [
+        {
+            "position": bs.get("position"),
+            "series_id": bs.get("series", {}).get("id"),
+            "name": bs.get("series", {}).get("name"),
+        }
+        for bs in book.get("book_series", [])
+    ]
+    work = {
+        "id": book.get("id"),
+        "title": book.get("title"),
+        "description": book.get("description"),
+        "editions": book.get("editions", []),
+        "book_series": book_series,
+        "slug": book.get("slug"),
+    }
+    work["content_hash"] = work_hash(work)
+    return work
 
 
 class HardcoverAPI:
     """A class to interact with the Hardcover API for book-related operations."""
 
     def __init__(self) -> None:
-        """Initialize the HardcoverAPI with the base URL and headers."""
-        url = "https://api.hardcover.app/v1/graphql"
-        self.headers = {
-            "authorization": f"Bearer {ExternalAPIConfig().hardcover_api_key}",
-        }
-        self.client = httpx.AsyncClient(headers=self.headers, base_url=url)
+        """Initialize the HardcoverAPI with the shared, configured client."""
+        self.client = get_client()
 
     async def search_author(self, author: str):
         """Search for an author using the Hardcover GraphQL API."""
-        url = ""
-        query = f"""
-        {{
-          search(
-            query: "{author}",
-            query_type: "Author",
-            per_page: 5,
-            page: 1
-          )
-          {{
-            results
-          }}
-        }}
-        """
-        payload = {"query": query}
-
-        resp = await self.client.post(url=url, json=payload)
-        logger.debug(f"Hardcover API response: {resp.text}")
-        if resp.status_code != 200:
+        data = await execute(SEARCH_AUTHORS, {"query": search_query(author)})
+        if not data:
             return None
-        data = resp.json()
-        # Adjust parsing to match the actual API response structure
-        results = data.get("data", {}).get("search", {}).get("results", {})
+        results = (data.get("search") or {}).get("results") or {}
         hits = results.get("hits", [])
         for hit in hits:
             doc = hit.get("document", {})
             if doc.get("name", "").lower() == author.lower():
-                return {
-                    "name": doc.get("name"),
-                    "bio": doc.get("bio"),
-                    "id": doc.get("id"),
-                }
+                return _author_summary(doc)
         if hits:
-            doc = hits[0].get("document", {})
-            return {"name": doc.get("name"), "bio": doc.get("bio"), "id": doc.get("id")}
+            return _author_summary(hits[0].get("document", {}))
         return None
 
-    async def get_works(self, id: str):
-        """Extract and return works for an author from Hardcover, structured for db."""
-        # _neq: "4" filters deduped
-        query = f"""{{
-        contributions(where: {{author_id: {{_eq: {id}}}, book: {{book_status_id: {{_neq: "4"}}}}}}) {{ 
-                    book {{
-                        id
-                        title
-                        description
-                        slug
-                        editions {{
-                            asin
-                            isbn_10
-                            isbn_13
-                        }}
-                        book_series {{
-                            position
-                            series {{
-                                name
-                                id
-                                }}
-                        }}
-                    }}
-
-                }}
-        }}
-        """
-        payload = {"query": query}
-        url = ""
-        resp = await self.client.post(url=url, json=payload)
-        logger.debug(f"Hardcover API response: {resp.text}")
-        if resp.status_code != 200:
+    async def search_book(self, title: str):
+        """Search for a book, preferring an exact (case-insensitive) title match."""
+        data = await execute(SEARCH_BOOKS, {"query": search_query(title)})
+        if not data:
             return None
-        data = resp.json()
-        results = data.get("data", {}).get("contributions", [])
-        books = []
-        for result in results:
-            book = result.get("book")
-            if not book:
-                continue
-            print(book.get("slug"))
-            editions = book.get("editions", [])
-
-            book_series = [
-                {
-                    "position": bs.get("position"),
-                    "series_id": bs.get("series", {}).get("id"),
-                    "name": bs.get("series", {}).get("name"),
-                }
-                for bs in book.get("book_series", [])
-            ]
-            books.append(
-                {
-                    "id": book.get("id"),
-                    "title": book.get("title"),
-                    "description": book.get("description"),
-                    "editions": editions,
-                    "book_series": book_series,
-                    "slug": book.get("slug"),
-                },
-            )
-        return books
+        results = (data.get("search") or {}).get("results") or {}
+        hits = results.get("hits", [])
+        for hit in hits:
+            doc = hit.get("document", {})
+            if doc.get("title", "").lower() == title.lower():
+                return _book_summary(doc)
+        if hits:
+            return _book_summary(hits[0].get("document", {}))
+        return None
+
+    async def search_series(self, name: str):
+        """Search for a series, preferring an exact (case-insensitive) name match."""
+        data = await execute(SEARCH_SERIES, {"query": search_query(name)})
+        if not data:
+            return None
+        results = (data.get("search") or {}).get("results") or []
+        for series in results:
+            if series.get("name", "").lower() == name.lower():
+                return series
+        if results:
+            return results[0]
+        return None
+
+    async def _works_page(self, author_id: int, offset: int) -> list[dict]:
+        data = await execute(
+            AUTHOR_WORKS,
+            {"authorId": author_id, "limit": WORKS_PAGE_SIZE, "offset": offset},
+        )
+        if data is None:
+            raise HardcoverError(f"Fetching works of author {author_id} failed")
+        return data.get("contributions", [])
+
+    async def get_works(self, id: str | int) -> AsyncIterator[list[dict]]:
+        """Yield an author's works from Hardcover a page at a time, structured for db.
+
+        The next page is requested before a page is yielded, so it downloads
+        while the caller stores the current one, and at most two pages are in
+        memory.
+
+        Raises:
+            HardcoverError: If a page could not be fetched.
+        """
+        author_id = int(id)
+        fetch = asyncio.create_task(self._works_page(author_id, 0))
+        offset = 0
+        try:
+            while True:
+                results = await fetch
+                offset += WORKS_PAGE_SIZE
+                last = len(results) < WORKS_PAGE_SIZE
+                if not last:
+                    fetch = asyncio.create_task(self._works_page(author_id, offset))
+                yield [_work(r["book"]) for r in results if r.get("book")]
+                if last:
+                    return
+        finally:
+            if not fetch.done():
+                fetch.cancel()
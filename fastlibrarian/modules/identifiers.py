@@ -0,0 +1,133 @@
+"""ISBN/ASIN normalization and the ``book_identifiers`` lookup index."""
+
+import re
+from collections.abc import Iterable
+from uuid import UUID
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.models.books import book_identifiers
+
+ISBN = "isbn"
+ASIN = "asin"
+
+# Identifiers per IN (...) query, well below the driver's bind parameter limit
+LOOKUP_BATCH_SIZE = 10_000
+
+SEPARATORS_RE = re.compile(r"[\s\-_.]")
+ISBN_10_RE = re.compile(r"^\d{9}[\dX]$")
+ISBN_13_RE = re.compile(r"^97[89]\d{10}$")
+ASIN_RE = re.compile(r"^B[0-9A-Z]{9}$")
+
+
+def isbn13_check_digit(first12: str) -> str:
+    """Compute the ISBN-13 check digit for the first 12 digits."""
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def isbn10_to_isbn13(isbn10: str) -> str:
+    """Convert an ISBN-10 to its 978-prefixed ISBN-13."""
+    first12 = f"978{isbn10[:9]}"
+    return first12 + isbn13_check_digit(first12)
+
+
+def is_valid_isbn10(isbn10: str) -> bool:
+    """Check the ISBN-10 checksum."""
+    if not ISBN_10_RE.match(isbn10):
+        return False
+    total = sum((10 - i) * (10 if c == "X" else int(c)) for i, c in enumerate(isbn10))
+    return total % 11 == 0
+
+
+def is_valid_isbn13(isbn13: str) -> bool:
+    """Check the ISBN-13 checksum."""
+    return bool(ISBN_13_RE.match(isbn13)) and (
+        isbn13_check_digit(isbn13[:12]) == isbn13[12]
+    )
+
+
+def normalize_identifier(value: str | int | None) -> tuple[str, str] | None:
+    """Normalize an ISBN-10, ISBN-13 or ASIN.
+
+    ISBNs are returned as ISBN-13 so both forms of the same edition share a
+    key; ASINs are upper-cased. Amazon uses a book's ISBN-10 as its ASIN, so
+    numeric ASINs normalize to ISBNs as well.
+
+    Returns:
+        ``(kind, identifier)`` or None if ``value`` is not an identifier.
+    """
+    if value is None:
+        return None
+    value = SEPARATORS_RE.sub("", str(value)).upper()
+    if is_valid_isbn13(value):
+        return ISBN, value
+    if is_valid_isbn10(value):
+        return ISBN, isbn10_to_isbn13(value)
+    if ASIN_RE.match(value):
+        return ASIN, value
+    return None
+
+
+def edition_identifiers(editions: list[dict] | None) -> set[tuple[str, str]]:
+    """Collect the normalized identifiers of a book's editions."""
+    identifiers = set()
+    for edition in editions if isinstance(editions, list) else []:
+        for key in ("isbn_13", "isbn_10", "asin"):
+            normalized = normalize_identifier(edition.get(key))
+            if normalized:
+                identifiers.add(normalized)
+    return identifiers
+
+
+async def index_books(
+    db: AsyncSession,
+    books: Iterable[tuple[UUID, list[dict] | None]],
+) -> None:
+    """Add ``book_identifiers`` rows for new ``(book id, editions)`` pairs."""
+    rows = [
+        {"identifier": identifier, "kind": kind, "book_id": book_id}
+        for book_id, editions in books
+        for kind, identifier in edition_identifiers(editions)
+    ]
+    if rows:
+        await db.execute(insert(book_identifiers), rows)
+
+
+async def sync_book_identifiers(
+    db: AsyncSession,
+    book_id: UUID,
+    editions: list[dict] | None,
+) -> None:
+    """Replace a book's rows in ``book_identifiers`` from its editions."""
+    await db.execute(
+        delete(book_identifiers).where(book_identifiers.c.book_id == book_id),
+    )
+    await index_books(db, [(book_id, editions)])
+
+
+async def resolve_identifiers(
+    db: AsyncSession,
+    values: Iterable[str],
+) -> dict[str, list[UUID]]:
+    """Resolve many identifiers to book ids with batched index lookups.
+
+    Returns:
+        Book ids for each input value; values that are not identifiers or
+        match no book map to an empty list.
+    """
+    normalized = {value: normalize_identifier(value) for value in values}
+    keys = list({n[1] for n in normalized.values() if n})
+    books: dict[str, list[UUID]] = {}
+    for i in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        result = await db.execute(
+            select(book_identifiers.c.identifier, book_identifiers.c.book_id).where(
+                book_identifiers.c.identifier.in_(keys[i : i + LOOKUP_BATCH_SIZE]),
+            ),
+        )
+        for identifier, book_id in result.all():
+            books.setdefault(identifier, []).append(book_id)
+    return {
+        value: list(books.get(n[1], [])) if n else [] for value, n in normalized.items()
+    }
@@ -1,4 +1,6 @@
-import qbittorrentapi as qbt
+# Seconds to connect to and to wait for a response from qBittorrent, so a
+# hung client cannot block a worker thread indefinitely
+REQUEST_TIMEOUT = (5.0, 15.0)
 
 
 def connect_to_qbt(host, port, username, password):
@@ -10,7 +12,16 @@ def connect_to_qbt(host, port, username, password):
     :param password: Password for authentication.
     :return: An authenticated qBittorrent API client instance.
     """
-    client = qbt.Client(host=host, port=port, username=username, password=password)
+    # Imported on first connect, as most processes never talk to qBittorrent
+    import qbittorrentapi as qbt
+
+    client = qbt.Client(
+        host=host,
+        port=port,
+        username=username,
+        password=password,
+        REQUESTS_ARGS={"timeout": REQUEST_TIMEOUT},
+    )
     client.auth_log_in()
     return client
 
@@ -0,0 +1,377 @@
+"""Library filesystem scanner.
+
+Walks the configured library folders, caches ``(path, size, mtime, inode)``
+for every ebook and audiobook file in ``library_files`` and matches new or
+changed files to ``Book`` rows by identifier or fuzzy title/author.
+"""
+
+import asyncio
+import difflib
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.config import AppConfig, PreferencesConfig, get_config
+from fastlibrarian.coordination import lease
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.events import book_update_events, publish
+from fastlibrarian.metrics import track_job
+from fastlibrarian.models.authors import Author
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.library import LibraryFile
+from fastlibrarian.models.schemas import BookStatus, LibraryScanResult
+from fastlibrarian.models.shared import author_books
+from fastlibrarian.modules.identifiers import resolve_identifiers
+from fastlibrarian.normalize import BRACKETS_RE, normalize
+from fastlibrarian.sql import insert
+
+MEDIA_EBOOK = "ebook"
+MEDIA_AUDIO = "audio"
+
+# Rows or ids per statement when syncing the file cache and book statuses
+WRITE_BATCH_SIZE = 1000
+
+ISBN_13_RE = re.compile(r"(?<!\d)97[89](?:[- ]?\d){10}(?!\d)")
+ISBN_10_RE = re.compile(r"(?<![\dA-Za-z])\d(?:[- ]?\d){8}[- ]?[\dXx](?![\dA-Za-z])")
+ASIN_RE = re.compile(r"(?<![A-Z0-9])B0[A-Z0-9]{8}(?![A-Z0-9])")
+LEADING_NUMBER_RE = re.compile(r"^\d+\s*[-._ ]\s*")
+
+_scan_lock = asyncio.Lock()
+last_scan_result: LibraryScanResult | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class ScannedFile:
+    """Stat information for a single file found on disk."""
+
+    path: str
+    size: int
+    mtime: float
+    inode: int
+    media_type: str
+
+    @property
+    def signature(self) -> tuple[int, float, int]:
+        return (self.size, self.mtime, self.inode)
+
+
+def extract_identifiers(text: str) -> list[str]:
+    """Extract ISBN-13, ISBN-10 and ASIN identifiers from a file name."""
+    found = [
+        m.group().replace("-", "").replace(" ", "") for m in ISBN_13_RE.finditer(text)
+    ]
+    found += [
+        m.group().replace("-", "").replace(" ", "").upper()
+        for m in ISBN_10_RE.finditer(text)
+    ]
+    found += ASIN_RE.findall(text.upper())
+    return found
+
+
+def _extension_map(preferences: PreferencesConfig) -> dict[str, str]:
+    """Map lowercase file extensions (with dot) to a media type."""
+    extensions = {
+        f".{ext.lower().lstrip('.')}": MEDIA_EBOOK
+        for ext in preferences.ebook_file_types
+    }
+    extensions.update(
+        {
+            f".{ext.lower().lstrip('.')}": MEDIA_AUDIO
+            for ext in preferences.audio_file_types
+        },
+    )
+    return extensions
+
+
+def _scan_directory(
+    path: str,
+    extensions: dict[str, str],
+) -> tuple[list[ScannedFile], list[str]]:
+    """Scan a single directory, returning matching files and subdirectories."""
+    files: list[ScannedFile] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    media_type = extensions.get(os.path.splitext(entry.name)[1].lower())
+                    if media_type is None or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError as e:
+                    logger.warning(f"Skipping {entry.path}: {e}")
+                    continue
+                files.append(
+                    ScannedFile(
+                        path=entry.path,
+                        size=stat.st_size,
+                        mtime=stat.st_mtime,
+                        inode=stat.st_ino,
+                        media_type=media_type,
+                    ),
+                )
+    except OSError as e:
+        logger.warning(f"Cannot scan directory {path}: {e}")
+    return files, subdirs
+
+
+def walk_library(
+    roots: list[str],
+    extensions: dict[str, str],
+    workers: int = 8,
+) -> list[ScannedFile]:
+    """Walk library roots with ``os.scandir``, one directory per thread task."""
+    files: list[ScannedFile] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as pool:
+        pending = {pool.submit(_scan_directory, root, extensions) for root in roots}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                dir_files, subdirs = future.result()
+                files.extend(dir_files)
+                pending.update(
+                    pool.submit(_scan_directory, subdir, extensions)
+                    for subdir in subdirs
+                )
+    return files
+
+
+class BookMatcher:
+    """In-memory lookup of books by identifier and normalized title."""
+
+    def __init__(self, threshold: float = 0.88) -> None:
+        self.threshold = threshold
+        self.by_identifier: dict[str, UUID] = {}
+        self.by_title: dict[str, list[UUID]] = {}
+        self.authors: dict[UUID, list[str]] = {}
+        self._memo: dict[tuple[str, str], UUID | None] = {}
+
+    @classmethod
+    async def load(
+        cls,
+        db: AsyncSession,
+        paths: list[str],
+        threshold: float = 0.88,
+    ) -> "BookMatcher":
+        """Load titles and author names for every book.
+
+        Identifiers are only resolved for those found in ``paths``, with
+        batched lookups against the ``book_identifiers`` index.
+        """
+        matcher = cls(threshold)
+        identifiers = {i for p in paths for i in extract_identifiers(Path(p).name)}
+        for identifier, book_ids in (
+            await resolve_identifiers(db, identifiers)
+        ).items():
+            if book_ids:
+                matcher.by_identifier[identifier] = book_ids[0]
+        result = await db.execute(select(Book.id, Book.title))
+        for book_id, title in result.all():
+            matcher.by_title.setdefault(normalize(title), []).append(book_id)
+        result = await db.execute(
+            select(author_books.c.book_id, Author.name).join(
+                Author,
+                Author.id == author_books.c.author_id,
+            ),
+        )
+        for book_id, name in result.all():
+            matcher.authors.setdefault(book_id, []).append(normalize(name))
+        return matcher
+
+    def _title_candidates(self, path: Path) -> list[str]:
+        """Possible titles from the file name and its parent folder."""
+        candidates = []
+        for name in (path.stem, path.parent.name):
+            cleaned = BRACKETS_RE.sub(" ", name).replace("_", " ")
+            cleaned = LEADING_NUMBER_RE.sub("", cleaned)
+            for part in [cleaned, *cleaned.split(" - ")]:
+                key = normalize(part)
+                if key and key not in candidates:
+                    candidates.append(key)
+        return candidates
+
+    def _pick(self, book_ids: list[UUID], path_key: str) -> UUID:
+        """Prefer a book whose author appears in the path."""
+        for book_id in book_ids:
+            if any(a and a in path_key for a in self.authors.get(book_id, [])):
+                return book_id
+        return book_ids[0]
+
+    def match(self, file_path: str) -> UUID | None:
+        """Match a file to a book id, or return None."""
+        path = Path(file_path)
+        for identifier in extract_identifiers(path.name):
+            if identifier in self.by_identifier:
+                return self.by_identifier[identifier]
+        path_key = normalize(str(path.parent))
+        candidates = self._title_candidates(path)
+        memo_key = (path_key, "|".join(candidates))
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+        book_id = None
+        for candidate in candidates:
+            if candidate in self.by_title:
+                book_id = self._pick(self.by_title[candidate], path_key)
+                break
+        if book_id is None:
+            for candidate in candidates:
+                close = difflib.get_close_matches(
+                    candidate,
+                    self.by_title.keys(),
+                    n=3,
+                    cutoff=self.threshold,
+                )
+                if close:
+                    book_id = self._pick(
+                        [b for title in close for b in self.by_title[title]],
+                        path_key,
+                    )
+                    break
+        self._memo[memo_key] = book_id
+        return book_id
+
+
+def _match_files(matcher: BookMatcher, pending: list[ScannedFile]) -> list[dict]:
+    """``library_files`` rows for ``pending``, with their matched book ids."""
+    return [
+        {
+            "path": scanned.path,
+            "size": scanned.size,
+            "mtime": scanned.mtime,
+            "inode": scanned.inode,
+            "media_type": scanned.media_type,
+            "book_id": matcher.match(scanned.path),
+        }
+        for scanned in pending
+    ]
+
+
+async def scan_library(
+    db: AsyncSession,
+    config: AppConfig | None = None,
+    full: bool = False,
+) -> LibraryScanResult:
+    """Scan library folders and sync the file cache and book statuses.
+
+    Only files whose ``(size, mtime, inode)`` differ from the cached values
+    are matched and written, unless ``full`` is set, in which case every
+    file is re-matched.
+    """
+    config = config or get_config()
+    start = perf_counter()
+    extensions = _extension_map(config.preferences)
+    files = await asyncio.to_thread(
+        walk_library,
+        config.library.root_folders,
+        extensions,
+        config.library.scan_workers,
+    )
+
+    result = await db.execute(
+        select(
+            LibraryFile.path, LibraryFile.size, LibraryFile.mtime, LibraryFile.inode
+        ),
+    )
+    cached = {path: (size, mtime, inode) for path, size, mtime, inode in result.all()}
+
+    summary = LibraryScanResult(scanned=len(files))
+    pending: list[ScannedFile] = []
+    for scanned in files:
+        previous = cached.pop(scanned.path, None)
+        if previous is None:
+            summary.added += 1
+            pending.append(scanned)
+        elif previous != scanned.signature:
+            summary.changed += 1
+            pending.append(scanned)
+        elif full:
+            pending.append(scanned)
+        else:
+            summary.unchanged += 1
+    removed = list(cached)
+    summary.removed = len(removed)
+
+    if pending:
+        matcher = await BookMatcher.load(
+            db,
+            [scanned.path for scanned in pending],
+            config.library.fuzzy_match_threshold,
+        )
+        # Fuzzy matching is CPU bound, so keep it off the event loop
+        rows = await asyncio.to_thread(_match_files, matcher, pending)
+        have: dict[str, set[UUID]] = {MEDIA_EBOOK: set(), MEDIA_AUDIO: set()}
+        for row in rows:
+            if row["book_id"] is not None:
+                summary.matched += 1
+                have[row["media_type"]].add(row["book_id"])
+        for i in range(0, len(rows), WRITE_BATCH_SIZE):
+            statement = insert(LibraryFile).values(rows[i : i + WRITE_BATCH_SIZE])
+            statement = statement.on_conflict_do_update(
+                index_elements=[LibraryFile.path],
+                set_={
+                    "size": statement.excluded.size,
+                    "mtime": statement.excluded.mtime,
+                    "inode": statement.excluded.inode,
+                    "media_type": statement.excluded.media_type,
+                    "book_id": statement.excluded.book_id,
+                },
+            )
+            await db.execute(statement)
+        for media_type, column in ((MEDIA_EBOOK, "status"), (MEDIA_AUDIO, "a_status")):
+            book_ids = list(have[media_type])
+            for i in range(0, len(book_ids), WRITE_BATCH_SIZE):
+                await db.execute(
+                    update(Book)
+                    .where(Book.id.in_(book_ids[i : i + WRITE_BATCH_SIZE]))
+                    .values({column: BookStatus.Have}),
+                )
+        matched = have[MEDIA_EBOOK] | have[MEDIA_AUDIO]
+        if matched:
+            await publish(db, *await book_update_events(db, matched))
+
+    for i in range(0, len(removed), WRITE_BATCH_SIZE):
+        await db.execute(
+            delete(LibraryFile).where(
+                LibraryFile.path.in_(removed[i : i + WRITE_BATCH_SIZE]),
+            ),
+        )
+    await db.commit()
+
+    summary.elapsed_seconds = round(perf_counter() - start, 3)
+    logger.info(f"Library scan finished: {summary.model_dump()}")
+    return summary
+
+
+def scan_in_progress() -> bool:
+    """Whether a library scan is currently running."""
+    return _scan_lock.locked()
+
+
+async def run_library_scan(full: bool = False) -> LibraryScanResult | None:
+    """Run a library scan in its own session, skipping if one is running.
+
+    Only one worker scans at a time; the others skip.
+    """
+    global last_scan_result
+    if _scan_lock.locked():
+        logger.warning("Library scan already in progress, skipping.")
+        return None
+    async with _scan_lock, lease("library-scan") as acquired:
+        if not acquired:
+            logger.warning("Library scan running on another worker, skipping.")
+            return None
+        with track_job("library-scan"):
+            async with AsyncSessionLocal() as db:
+                last_scan_result = await scan_library(db, full=full)
+    return last_scan_result
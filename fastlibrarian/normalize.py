@@ -0,0 +1,82 @@
+"""Normalized keys for matching titles and names.
+
+Keys are stored next to the original columns (``books.title_key``,
+``authors.name_key``, ``series.name_key``) so lookups and duplicate
+detection are index lookups instead of fuzzy scans.
+"""
+
+import difflib
+import re
+import unicodedata
+
+BRACKETS_RE = re.compile(r"[\[({][^\])}]*[\])}]")
+TRAILING_ARTICLE_RE = re.compile(r"^(.*?),\s*(the|a|an)$")
+LEADING_ARTICLE_RE = re.compile(r"^(the|a|an) ")
+NON_ALNUM_RE = re.compile(r"[^0-9a-z]+")
+DIGITS_RE = re.compile(r"\d+")
+
+# Longest key stored; keys only need to be long enough to tell books apart
+MAX_KEY_LENGTH = 255
+
+
+def normalize(text: str) -> str:
+    """Normalize a title or name for comparison."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace("&", " and ").replace("'", "").replace("\u2019", "")
+    text = NON_ALNUM_RE.sub(" ", text).strip()
+    return LEADING_ARTICLE_RE.sub("", text)
+
+
+def title_key(title: str) -> str:
+    """Key under which editions of the same book collide.
+
+    Bracketed parts such as "(Unabridged)" or "[Stormlight Archive #1]" are
+    dropped and a trailing article is ignored like a leading one, so "The
+    Way of Kings" and "Way of Kings, The (Book 1)" share a key.
+    """
+    title = BRACKETS_RE.sub(" ", title).strip()
+    match = TRAILING_ARTICLE_RE.match(title.lower())
+    if match:
+        title = title[: len(match.group(1))]
+    return normalize(title)[:MAX_KEY_LENGTH]
+
+
+def name_key(name: str) -> str:
+    """Key for author and series names, ignoring word order.
+
+    "Sanderson, Brandon" and "Brandon Sanderson" share a key.
+    """
+    return token_sort(normalize(name))[:MAX_KEY_LENGTH]
+
+
+def token_sort(key: str) -> str:
+    """A key with its words sorted, for order-insensitive comparison."""
+    return " ".join(sorted(key.split()))
+
+
+def trigrams(key: str) -> set[str]:
+    """Character trigrams of a key, padded so short keys still have some."""
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def similar(a: str, b: str, threshold: float) -> bool:
+    """Whether two ``token_sort``ed keys are at least ``threshold`` similar.
+
+    Keys whose numbers differ ("saga 1" and "saga 2") never match, as they
+    are usually different volumes rather than spelling variants. Cheap upper
+    bounds of the ratio are checked before computing it.
+    """
+    if a == b:
+        return True
+    if 2 * min(len(a), len(b)) / (len(a) + len(b)) < threshold:
+        return False
+    if DIGITS_RE.findall(a) != DIGITS_RE.findall(b):
+        return False
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    return (
+        matcher.real_quick_ratio() >= threshold
+        and matcher.quick_ratio() >= threshold
+        and matcher.ratio() >= threshold
+    )
@@ -0,0 +1,116 @@
+"""Keyset (cursor) pagination for name-ordered lists.
+
+Pages are ordered by ``(lower(name), id)``, backed by an index on the same
+expressions, so fetching any page is an index range scan no matter how deep
+it is. The cursor is the last row's sort key, opaque to clients.
+"""
+
+import base64
+import json
+from collections.abc import Sequence
+from uuid import UUID
+
+from sqlalchemy import Column, Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.schemas import BookShort, BookStatus
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(name: str, id: UUID) -> str:
+    """Encode the sort key of the last row on a page."""
+    raw = json.dumps([name.lower(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, UUID]:
+    """Decode a cursor from ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name, id = json.loads(raw)
+        return str(name), UUID(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_page(
+    statement: Select,
+    name: Column,
+    id: Column,
+    cursor: str | None,
+    limit: int,
+) -> Select:
+    """Restrict a select to the page after ``cursor``.
+
+    One extra row is fetched to tell whether there is a next page.
+    """
+    if cursor:
+        last_name, last_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(func.lower(name), id) > (last_name, last_id))
+    return statement.order_by(func.lower(name), id).limit(limit + 1)
+
+
+def next_cursor(rows: Sequence, limit: int) -> str | None:
+    """Cursor for the page after ``rows`` (fetched with ``limit + 1``)."""
+    if len(rows) <= limit:
+        return None
+    last = rows[limit - 1]
+    return encode_cursor(last.name, last.id)
+
+
+async def book_status_counts(
+    db: AsyncSession,
+    owner: Column,
+    ids: Sequence[UUID],
+) -> dict[UUID, dict[str, int]]:
+    """Count each owner's books by status in one grouped query.
+
+    Args:
+        owner: The owner column of a link table, e.g. ``author_books.c.author_id``.
+        ids: Owners to count books for.
+    """
+    link = owner.table
+    keys = ("total", *(s.value for s in BookStatus))
+    statement = (
+        select(
+            owner,
+            func.count().label("total"),
+            *(
+                func.count().filter(Book.status == status).label(status.value)
+                for status in BookStatus
+            ),
+        )
+        .join(Book, Book.id == link.c.book_id)
+        .where(owner.in_(ids))
+        .group_by(owner)
+    )
+    counts = {id: dict.fromkeys(keys, 0) for id in ids}
+    for row in (await db.execute(statement)).mappings():
+        counts[row[owner.name]] = {key: row[key] for key in keys}
+    return counts
+
+
+async def owned_books(
+    db: AsyncSession,
+    owner: Column,
+    ids: Sequence[UUID],
+) -> dict[UUID, list[BookShort]]:
+    """Load each owner's books, ordered by title, in one query."""
+    link = owner.table
+    result = await db.execute(
+        select(owner, Book.id, Book.title)
+        .join(Book, Book.id == link.c.book_id)
+        .where(owner.in_(ids))
+        .order_by(Book.title),
+    )
+    books: dict[UUID, list[BookShort]] = {}
+    for owner_id, book_id, title in result.all():
+        books.setdefault(owner_id, []).append(BookShort(id=book_id, title=title))
+    return books
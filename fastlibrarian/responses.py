@@ -0,0 +1,71 @@
+"""Fast JSON responses for large lists of models.
+
+Route handlers that return models normally have them validated a second time
+against ``response_model`` and encoded through ``jsonable_encoder``. Returning
+a ``Response`` from these helpers skips both: models are built once and
+serialized straight to bytes by pydantic-core. Handlers keep their
+``response_model`` for the OpenAPI schema.
+"""
+
+from collections.abc import Callable, Iterator, Sequence
+from functools import cache
+from typing import Any, TypeVar
+
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+T = TypeVar("T")
+
+# Lists longer than this are streamed in chunks of CHUNK_SIZE items
+STREAM_THRESHOLD = 5_000
+CHUNK_SIZE = 1_000
+
+
+@cache
+def list_adapter(model: type[BaseModel]) -> TypeAdapter:
+    """Cached ``TypeAdapter`` for ``list[model]``."""
+    return TypeAdapter(list[model])
+
+
+def _stream_array(
+    items: Sequence[T],
+    build: Callable[[T], BaseModel],
+    adapter: TypeAdapter,
+) -> Iterator[bytes]:
+    yield b"["
+    for start in range(0, len(items), CHUNK_SIZE):
+        chunk = adapter.dump_json([build(i) for i in items[start : start + CHUNK_SIZE]])
+        if start:
+            yield b","
+        yield chunk[1:-1]
+    yield b"]"
+
+
+def json_list_response(
+    items: Sequence[T],
+    build: Callable[[T], Any],
+    model: type[BaseModel],
+) -> Response:
+    """Serialize ``items`` as a JSON array of ``model``.
+
+    Args:
+        items: Rows to serialize, already loaded with the relationships
+            ``build`` needs.
+        build: Converts one row to a ``model`` instance.
+        model: Schema of the array items.
+
+    Returns:
+        A plain response, or for more than ``STREAM_THRESHOLD`` items a
+        streamed one built chunk by chunk in a worker thread, so the event
+        loop stays free and the whole list of models is never held at once.
+    """
+    adapter = list_adapter(model)
+    if len(items) <= STREAM_THRESHOLD:
+        return Response(
+            adapter.dump_json([build(i) for i in items]),
+            media_type="application/json",
+        )
+    return StreamingResponse(
+        _stream_array(items, build, adapter),
+        media_type="application/json",
+    )
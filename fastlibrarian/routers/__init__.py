@@ -1,4 +1,9 @@
 from .authors import router as authors_router
 from .books import router as books_router
 from .config import router as config_router
+from .events import router as events_router
+from .library import router as library_router
+from .metrics import router as metrics_router
 from .series import router as series_router
+from .tags import router as tags_router
+from .typeahead import router as typeahead_router
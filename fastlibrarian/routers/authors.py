@@ -1,19 +1,78 @@
-from uuid import UUID
+import asyncio
+from dataclasses import dataclass, field
+from typing import Literal
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+)
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import (
+    Text,
+    cast,
+    exists,
+    func,
+    literal_column,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
 
-from fastlibrarian.db import get_db
+from fastlibrarian.config import get_config
+from fastlibrarian.db import AsyncSessionLocal, get_db
+from fastlibrarian.events import (
+    ChangeEvent,
+    author_event,
+    book_update_events,
+    publish,
+)
 from fastlibrarian.models.authors import Author
 from fastlibrarian.models.books import Book
-from fastlibrarian.models.schemas import AuthorCreate, AuthorRead, BookShort
+from fastlibrarian.models.schemas import (
+    AuthorBibliography,
+    AuthorCreate,
+    AuthorRead,
+    AuthorSummary,
+    BibliographyBook,
+    BibliographySeries,
+    BookShort,
+    Page,
+    WorksRefresh,
+)
 from fastlibrarian.models.series import Series
+from fastlibrarian.models.shared import Tags, author_books, author_tags, series_books
+from fastlibrarian.modules import hardcover
 from fastlibrarian.modules.hardcover import HardcoverAPI as hcapi
+from fastlibrarian.modules.hardcover import HardcoverError
+from fastlibrarian.modules.identifiers import index_books, sync_book_identifiers
+from fastlibrarian.normalize import name_key, title_key
+from fastlibrarian.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    book_status_counts,
+    keyset_page,
+    next_cursor,
+    owned_books,
+)
+from fastlibrarian.responses import json_list_response
+from fastlibrarian.singleflight import Group
+from fastlibrarian.sql import insert, localtimestamp
 
 router = APIRouter(prefix="/authors", tags=["authors"])
 
+# Hardcover author searches, held until they finish even if their request
+# answered without them
+_remote_searches: set[asyncio.Task] = set()
+# Author detail loads in flight, by ID
+_author_loads = Group("author")
+
 
 async def search_inventaire_author(name: str):
     """Search for author on Inventaire."""
@@ -21,78 +80,245 @@ async def search_inventaire_author(name: str):
     return
 
 
-async def update_author_books(author_id: UUID, db: AsyncSession):
-    """Update books for an author."""
+async def _series_id(
+    db: AsyncSession,
+    work_series: dict,
+    series_ids: dict[str, UUID],
+) -> UUID | None:
+    """Id of a work's series by normalized name, creating the series if new."""
+    series_name = work_series.get("name")
+    if not series_name:
+        return None
+    key = name_key(series_name)
+    if key not in series_ids:
+        result = await db.execute(select(Series.id).where(Series.name_key == key))
+        series_id = result.scalars().first()
+        if series_id is None:
+            hc_series_id = work_series.get("series_id")
+            series_id = uuid4()
+            db.add(
+                Series(
+                    id=series_id,
+                    name=series_name,
+                    external_refs={"hardcover_id": hc_series_id}
+                    if hc_series_id
+                    else {},
+                ),
+            )
+        series_ids[key] = series_id
+    return series_ids[key]
+
+
+@dataclass
+class KnownBooks:
+    """An author's stored books, indexed for matching Hardcover works."""
+
+    by_ref: dict[str, UUID] = field(default_factory=dict)  # By Hardcover id
+    by_title: dict[str, UUID] = field(default_factory=dict)  # By title key
+    hashes: dict[UUID, str | None] = field(default_factory=dict)
+    refs: dict[UUID, dict] = field(default_factory=dict)
+
+
+async def _known_books(db: AsyncSession, author_id: UUID) -> KnownBooks:
+    """Load what matching needs of an author's books in one query."""
+    result = await db.execute(
+        select(Book.id, Book.title_key, Book.content_hash, Book.external_refs)
+        .join(author_books, author_books.c.book_id == Book.id)
+        .where(author_books.c.author_id == author_id),
+    )
+    known = KnownBooks()
+    for book_id, key, content_hash, refs in result.all():
+        refs = refs or {}
+        if refs.get("hardcover_id") is not None:
+            known.by_ref[str(refs["hardcover_id"])] = book_id
+        if key:
+            known.by_title.setdefault(key, book_id)
+        known.hashes[book_id] = content_hash
+        known.refs[book_id] = refs
+    return known
+
+
+async def _store_works(
+    db: AsyncSession,
+    author: Author,
+    works: list[dict],
+    known: KnownBooks,
+    seen: set[UUID],
+    series_ids: dict[str, UUID],
+    report: WorksRefresh,
+) -> None:
+    """Store one page of Hardcover works as books of ``author`` and commit.
+
+    Works are matched to stored books by Hardcover id, then by normalized
+    title. Matches whose content hash is unchanged are skipped; others are
+    updated in one statement. Link rows are inserted directly rather than
+    through the relationships, so neither the author's nor a series' whole
+    book list is loaded or grown.
+    """
+    new_books = []
+    changed = []
+    links = []
+    events = []
+    for work in works:
+        report.works += 1
+        ref = str(work["id"]) if work.get("id") is not None else None
+        key = title_key(work.get("title") or "")
+        book_id = (ref and known.by_ref.get(ref)) or known.by_title.get(key)
+        if book_id in seen:
+            # Another edition of a work already stored in this run
+            continue
+        if book_id and known.hashes.get(book_id) == work["content_hash"]:
+            seen.add(book_id)
+            report.unchanged += 1
+            continue
+        # --- Check if series exists ---
+        series_id = None
+        series_position = None
+        if work.get("book_series"):
+            # Take the first series if present
+            first_series = work["book_series"][0]
+            series_position = first_series.get("position")
+            series_id = await _series_id(db, first_series, series_ids)
+        external_refs = {
+            "hardcover_id": work.get("id"),
+            "hardcover_slug": work.get("slug"),
+        }
+        if book_id:
+            # Local titles are kept; Hardcover's data is refreshed
+            changed.append(
+                {
+                    "id": book_id,
+                    "description": work.get("description"),
+                    "editions": work.get("editions"),
+                    "external_refs": {**known.refs.get(book_id, {}), **external_refs},
+                    "content_hash": work["content_hash"],
+                },
+            )
+            report.changed += 1
+        else:
+            # --- Add new book ---
+            book = Book(
+                id=uuid4(),
+                title=work.get("title"),
+                description=work.get("description"),
+                editions=work.get("editions"),
+                external_refs=external_refs,
+                content_hash=work["content_hash"],
+            )
+            db.add(book)
+            new_books.append(book)
+            book_id = book.id
+            known.by_title.setdefault(key, book_id)
+            report.added += 1
+            events.append(
+                ChangeEvent(
+                    kind="book",
+                    action="created",
+                    id=book_id,
+                    author_ids=[author.id],
+                    series_ids=[series_id] if series_id else [],
+                ),
+            )
+        seen.add(book_id)
+        if series_id:
+            links.append(
+                {
+                    "series_id": series_id,
+                    "book_id": book_id,
+                    "position": series_position,
+                },
+            )
+    await db.flush()
+    if new_books:
+        await db.execute(
+            insert(author_books),
+            [{"author_id": author.id, "book_id": book.id} for book in new_books],
+        )
+    if changed:
+        await db.execute(update(Book), changed)
+        for row in changed:
+            await sync_book_identifiers(db, row["id"], row["editions"])
+    if links:
+        statement = insert(series_books)
+        await db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[series_books.c.series_id, series_books.c.book_id],
+                set_={"position": statement.excluded.position},
+            ),
+            links,
+        )
+    await index_books(db, [(book.id, book.editions) for book in new_books])
+    events += await book_update_events(db, [row["id"] for row in changed])
+    await publish(db, *events)
+    await db.commit()
+
+
+async def update_author_books(
+    author_id: UUID,
+    db: AsyncSession,
+) -> WorksRefresh | None:
+    """Update books for an author.
+
+    Works are fetched from Hardcover in pages, and each page is written and
+    committed while the next one downloads, so memory stays bounded for
+    authors with thousands of works. Only works whose content hash changed
+    are written. If a page fails, the books of earlier pages are kept and a
+    later update continues from them.
+
+    Returns:
+        Counts of added, changed, unchanged and removed works, or None if
+        the author could not be refreshed.
+    """
     if not author_id:
         logger.error("Author ID is required for updating books.")
-        return
+        return None
     logger.info(f"Updating books for author {author_id}")
     # Fetch the author from the database
     statement = select(Author).where(Author.id == author_id)
-    result = await db.execute(statement)
+    result = await db.execute(statement.options(noload(Author.books)))
     author = result.scalars().first()
     if not author:
         logger.error(f"Author with ID {author_id} not found.")
-        return
+        return None
+    # Read before the works are stored: a rollback expires ``author``
+    name = author.name
     hc_author_id = author.external_refs.get("hardcover_id")
     if not hc_author_id:
-        logger.error(f"No Hardcover ID found for author {author.name}.")
-        return
-    hc = hcapi()
-    works = await hc.get_works(hc_author_id)
-    if not works:
-        logger.error(f"No works found for author {author.name} on Hardcover.")
-        return
-    for work in works:
-        # --- Check if series exists ---
-        series_obj = None
-        series_name = None
-        series_id = None
-        series_description = None
-        if work.get("book_series"):
-            # Take the first series if present
-            first_series = work["book_series"][0]
-            series_name = first_series.get("name")
-            series_id = first_series.get("series_id")
-            # Try to find existing series by name
-            if series_name:
-                stmt = select(Series).where(Series.name == series_name)
-                result = await db.execute(stmt)
-                series_obj = result.scalars().first()
-            if not series_obj and series_name:
-                # If not found, create new series
-                series_obj = Series(
-                    name=series_name,
-                    description=series_description,
-                    external_refs={"hardcover_id": series_id} if series_id else {},
-                )
-                db.add(series_obj)
-                await db.flush()  # assign id
-        # --- Check if book exists for this author ---
-        stmt = select(Book).where(Book.title == work.get("title"))
-        result = await db.execute(stmt)
-        book_obj = result.scalars().first()
-        if book_obj and author in book_obj.authors:
-            logger.info(
-                f"Book '{work.get('title')}' by author {author.name} already exists, skipping.",
-            )
-            continue
-        # --- Add new book ---
-        book = Book(
-            title=work.get("title"),
-            description=work.get("description"),
-            editions=work.get("editions"),
-            external_refs={
-                "hardcover_id": work.get("id"),
-                "hardcover_slug": work.get("slug"),
-            },
-        )
-        book.authors.append(author)
-        if series_obj:
-            book.series.append(series_obj)
-        db.add(book)
+        logger.error(f"No Hardcover ID found for author {name}.")
+        return None
+    known = await _known_books(db, author.id)
+    listed = set(known.by_ref)
+    seen: set[UUID] = set()
+    series_ids: dict[str, UUID] = {}
+    report = WorksRefresh()
+    try:
+        async for page in hcapi().get_works(hc_author_id):
+            listed -= {str(work["id"]) for work in page if work.get("id") is not None}
+            await _store_works(db, author, page, known, seen, series_ids, report)
+    except HardcoverError as e:
+        await db.rollback()
+        logger.error(f"Updating books for author {name} failed: {e}")
+        return None
+    finally:
+        # The relationship doesn't know about the inserted link rows
+        db.expire(author, ["books"])
+    author.last_refreshed_at = localtimestamp()
+    author.refresh_failures = 0
+    author.refresh_retry_at = None
+    if not report.works:
+        await db.commit()
+        logger.error(f"No works found for author {name} on Hardcover.")
+        return report
+    report.removed = len(listed)
+    if report.added or report.changed:
+        await publish(db, author_event(author, "updated"))
     await db.commit()
-    logger.info(f"Updated {len(works)} books for author {author.name}")
+    logger.info(
+        f"Updated books for author {name}: {report.added} added, "
+        f"{report.changed} changed, {report.unchanged} unchanged, "
+        f"{report.removed} no longer on Hardcover",
+    )
+    return report
 
 
 @router.post("/update_single_author_books/{author_id}", response_model=AuthorRead)
@@ -126,51 +352,77 @@ async def update_single_author_books(
     )
 
 
+async def _search_hardcover_author(name: str) -> dict | None:
+    """Hardcover's best match for ``name``, logging failures."""
+    try:
+        return await hcapi().search_author(name)
+    except Exception as e:
+        logger.warning(f"Hardcover author search for {name!r} failed: {e}")
+        raise
+
+
 @router.get("/find_authors", response_model=list[dict])
 async def find_authors(
     name: str,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ) -> list[dict]:
-    """Find authors by name from local DB and external services, merging results."""
+    """Find authors by name in the local DB and on Hardcover, merging results.
+
+    Both lookups run concurrently. Hardcover gets ``search_deadline``
+    seconds; when it is slower, local matches are returned on their own and
+    the Hardcover search keeps running so its cached result answers the next
+    request. ``X-Remote-Status`` says whether the Hardcover result is
+    included (``ok``), timed out, failed or is disabled (no API key).
+    """
+    apis = get_config().external_apis
+    remote = None
+    if hardcover.api_key(apis):
+        remote = asyncio.create_task(_search_hardcover_author(name))
+        _remote_searches.add(remote)
+        remote.add_done_callback(_remote_searches.discard)
+    deadline = asyncio.get_running_loop().time() + apis.search_deadline
+
     results = []
     seen_names = set()
 
     # --- Search local DB (case-insensitive, partial match) ---
     statement = select(Author).where(Author.name.ilike(f"%{name}%"))
     db_result = await db.execute(statement)
-    db_authors = db_result.scalars().all()
-    for author in db_authors:
+    for author in db_result.scalars().all():
         data = AuthorRead.model_validate(author).model_dump()
-
+        data["in_db"] = True
+        results.append(data)
         seen_names.add(author.name.lower())
 
     # --- Search Hardcover API ---
-    hc_api = hcapi()
-    hc_author = await hc_api.search_author(name)
+    if remote is None:
+        response.headers["X-Remote-Status"] = "disabled"
+        return results
+    remaining = max(deadline - asyncio.get_running_loop().time(), 0)
+    try:
+        # Shielded so a timeout leaves the search running to fill the cache
+        hc_author = await asyncio.wait_for(asyncio.shield(remote), remaining)
+    except asyncio.TimeoutError:
+        logger.info(f"Hardcover author search for {name!r} missed the deadline")
+        response.headers["X-Remote-Status"] = "timeout"
+        return results
+    except Exception:
+        response.headers["X-Remote-Status"] = "error"
+        return results
+    response.headers["X-Remote-Status"] = "ok"
     if hc_author:
-        hc_name = hc_author.get("name", "")
+        hc_name = hc_author.get("name") or ""
         if hc_name and hc_name.lower() not in seen_names:
             results.append(
                 {
                     "id": None,
-                    "name": hc_author.get("name"),
+                    "name": hc_name,
                     "bio": hc_author.get("bio"),
                     "external_refs": {"hardcover_id": hc_author.get("id")},
                     "in_db": False,
                 },
             )
-            seen_names.add(hc_name.lower())
-        else:
-            results.append(
-                {
-                    "id": None,
-                    "name": hc_author.get("name"),
-                    "bio": hc_author.get("bio"),
-                    "external_refs": {"hardcover_id": hc_author.get("id")},
-                    "in_db": True,
-                },
-            )
-
     return results
 
 
@@ -194,6 +446,8 @@ async def create_author(
         raise HTTPException(status_code=404, detail="Author not found on Hardcover")
     db_author = Author(name=name, bio=bio, external_refs=external_refs)
     db.add(db_author)
+    await db.flush()
+    await publish(db, author_event(db_author, "created"))
     await db.commit()
     await db.refresh(db_author)
     logger.debug(f"Created author: {db_author}")
@@ -211,38 +465,285 @@ async def create_author(
     )
 
 
+def author_read(a: Author) -> AuthorRead:
+    """Build an ``AuthorRead`` from an author with its books loaded."""
+    return AuthorRead(
+        id=a.id,
+        name=a.name,
+        bio=a.bio,
+        external_refs=dict(a.external_refs) if a.external_refs else None,
+        books=[BookShort(id=b.id, title=b.title) for b in a.books],
+    )
+
+
 @router.get("/", response_model=list[AuthorRead])
-async def list_authors(db: AsyncSession = Depends(get_db)) -> list[AuthorRead]:
+async def list_authors(db: AsyncSession = Depends(get_db)) -> Response:
     statement = select(Author)
     result = await db.execute(statement)
     authors = result.scalars().all()
-    return [
-        AuthorRead(
-            id=str(a.id),
-            name=a.name,
-            bio=a.bio,
-            external_refs=dict(a.external_refs) if a.external_refs else None,
-            books=[BookShort(id=str(b.id), title=b.title) for b in a.books],
+    return json_list_response(authors, author_read, AuthorRead)
+
+
+@router.get("/page", response_model=Page[AuthorSummary])
+async def list_authors_page(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    tag: str | None = None,
+    include: list[Literal["books"]] = Query(default=[]),
+    db: AsyncSession = Depends(get_db),
+) -> Page[AuthorSummary]:
+    """List authors by name, one page at a time, with book counts by status.
+
+    Pass the returned ``next_cursor`` to get the next page.
+    """
+    statement = select(Author.id, Author.name, Author.bio, Author.external_refs)
+    if tag:
+        statement = statement.where(
+            exists().where(
+                author_tags.c.author_id == Author.id,
+                author_tags.c.tag_id == Tags.id,
+                Tags.name == tag,
+            ),
         )
-        for a in authors
-    ]
+    try:
+        statement = keyset_page(statement, Author.name, Author.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    rows = (await db.execute(statement)).all()
+    ids = [row.id for row in rows[:limit]]
+    counts = await book_status_counts(db, author_books.c.author_id, ids)
+    books = (
+        await owned_books(db, author_books.c.author_id, ids)
+        if "books" in include
+        else None
+    )
+    return Page(
+        items=[
+            AuthorSummary(
+                id=row.id,
+                name=row.name,
+                bio=row.bio,
+                external_refs=row.external_refs or None,
+                book_counts=counts[row.id],
+                books=books.get(row.id, []) if books is not None else None,
+            )
+            for row in rows[:limit]
+        ],
+        next_cursor=next_cursor(rows, limit),
+    )
 
 
 @router.get("/{author_id}", response_model=AuthorRead)
-async def get_author(author_id: UUID, db: AsyncSession = Depends(get_db)) -> AuthorRead:
-    statement = select(Author).where(Author.id == author_id)
-    result = await db.execute(statement)
-    author = result.scalars().first()
-    if not author:
+async def get_author(author_id: UUID) -> AuthorRead:
+    author = await load_author(author_id)
+    if author is None:
         raise HTTPException(status_code=404, detail="Author not found")
-    books_short = [BookShort(id=str(b.id), title=b.title) for b in author.books]
-    return AuthorRead(
-        id=str(author.id),
+    return author
+
+
+async def load_author(author_id: UUID) -> AuthorRead | None:
+    """An author with their books, or None if there is no such author.
+
+    Concurrent loads of the same author share one query, run in its own
+    session, so a caller may get a load that started just before it asked.
+    """
+    return await _author_loads.do(author_id, lambda: _load_author(author_id))
+
+
+async def _load_author(author_id: UUID) -> AuthorRead | None:
+    async with AsyncSessionLocal() as db:
+        statement = select(Author).where(Author.id == author_id)
+        result = await db.execute(statement)
+        author = result.scalars().first()
+        if not author:
+            return None
+        books_short = [BookShort(id=str(b.id), title=b.title) for b in author.books]
+        return AuthorRead(
+            id=str(author.id),
+            name=author.name,
+            bio=author.bio,
+            external_refs=dict(author.external_refs) if author.external_refs else None,
+            books=books_short,
+        )
+
+
+def _book_json(position=None):
+    return func.json_build_object(
+        "id",
+        Book.id,
+        "title",
+        Book.title,
+        "position",
+        position,
+        "status",
+        Book.status,
+        "a_status",
+        Book.a_status,
+        "p_status",
+        Book.p_status,
+    )
+
+
+def bibliography_statement(author_id: UUID):
+    """Build an author's bibliography as one JSON document in a single query.
+
+    Series are ordered by name and their books by position, then title;
+    books in no series are listed separately by title.
+    """
+    empty = literal_column("'[]'::json")
+    by_series = (
+        select(
+            Series.id,
+            Series.name,
+            func.json_agg(
+                aggregate_order_by(
+                    _book_json(series_books.c.position),
+                    series_books.c.position.asc().nulls_last(),
+                    Book.title,
+                ),
+            ).label("books"),
+        )
+        .join(series_books, series_books.c.series_id == Series.id)
+        .join(Book, Book.id == series_books.c.book_id)
+        .join(author_books, author_books.c.book_id == Book.id)
+        .where(author_books.c.author_id == author_id)
+        .group_by(Series.id)
+        .subquery()
+    )
+    series_json = select(
+        func.coalesce(
+            func.json_agg(
+                aggregate_order_by(
+                    func.json_build_object(
+                        "id",
+                        by_series.c.id,
+                        "name",
+                        by_series.c.name,
+                        "books",
+                        by_series.c.books,
+                    ),
+                    by_series.c.name,
+                ),
+            ),
+            empty,
+        ),
+    ).scalar_subquery()
+    standalone_json = (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(_book_json(), Book.title)),
+                empty,
+            ),
+        )
+        .join(author_books, author_books.c.book_id == Book.id)
+        .where(
+            author_books.c.author_id == author_id,
+            ~exists().where(series_books.c.book_id == Book.id),
+        )
+        .scalar_subquery()
+    )
+    return select(
+        cast(
+            func.json_build_object(
+                "id",
+                Author.id,
+                "name",
+                Author.name,
+                "bio",
+                Author.bio,
+                "external_refs",
+                Author.external_refs,
+                "series",
+                series_json,
+                "standalone",
+                standalone_json,
+            ),
+            Text,
+        ),
+    ).where(Author.id == author_id)
+
+
+async def build_bibliography(db: AsyncSession, author_id: UUID) -> str | None:
+    """Build the bibliography document of ``bibliography_statement`` in Python.
+
+    For databases without PostgreSQL's JSON aggregates (SQLite).
+    """
+    result = await db.execute(
+        select(Author.id, Author.name, Author.bio, Author.external_refs).where(
+            Author.id == author_id,
+        ),
+    )
+    author = result.one_or_none()
+    if author is None:
+        return None
+    bibliography = AuthorBibliography(
+        id=author.id,
         name=author.name,
         bio=author.bio,
-        external_refs=dict(author.external_refs) if author.external_refs else None,
-        books=books_short,
+        external_refs=author.external_refs,
+    )
+    result = await db.execute(
+        select(
+            Book.id,
+            Book.title,
+            Book.status,
+            Book.a_status,
+            Book.p_status,
+            Series.id.label("series_id"),
+            Series.name.label("series_name"),
+            series_books.c.position,
+        )
+        .join(author_books, author_books.c.book_id == Book.id)
+        .outerjoin(series_books, series_books.c.book_id == Book.id)
+        .outerjoin(Series, Series.id == series_books.c.series_id)
+        .where(author_books.c.author_id == author_id)
+        .order_by(
+            Series.name,
+            Series.id,
+            series_books.c.position.asc().nulls_last(),
+            Book.title,
+        ),
     )
+    series: dict[UUID, BibliographySeries] = {}
+    for row in result.all():
+        book = BibliographyBook(
+            id=row.id,
+            title=row.title,
+            position=row.position,
+            status=row.status,
+            a_status=row.a_status,
+            p_status=row.p_status,
+        )
+        if row.series_id is None:
+            bibliography.standalone.append(book)
+            continue
+        if row.series_id not in series:
+            series[row.series_id] = BibliographySeries(
+                id=row.series_id,
+                name=row.series_name,
+            )
+            bibliography.series.append(series[row.series_id])
+        series[row.series_id].books.append(book)
+    return bibliography.model_dump_json()
+
+
+@router.get("/{author_id}/bibliography", response_model=AuthorBibliography)
+async def get_author_bibliography(
+    author_id: UUID,
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Get an author's books grouped by series, in reading order.
+
+    On PostgreSQL the JSON document is built by the database and returned
+    as is.
+    """
+    if db.bind.dialect.name == "postgresql":
+        document = await db.scalar(bibliography_statement(author_id))
+    else:
+        document = await build_bibliography(db, author_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Author not found")
+    return Response(document, media_type="application/json")
 
 
 @router.put("/{author_id}", response_model=AuthorRead)
@@ -258,6 +759,7 @@ async def update_author(
         raise HTTPException(status_code=404, detail="Author not found")
     for key, value in author.model_dump().items():
         setattr(db_author, key, value)
+    await publish(db, author_event(db_author, "updated"))
     await db.commit()
     await db.refresh(db_author)
     books_short = [BookShort(id=str(b.id), title=b.title) for b in db_author.books]
@@ -283,6 +785,7 @@ async def delete_author(
     if not db_author:
         raise HTTPException(status_code=404, detail="Author not found")
     await db.delete(db_author)
+    await publish(db, author_event(db_author, "deleted"))
     await db.commit()
     books_short = [BookShort(id=str(b.id), title=b.title) for b in db_author.books]
     return AuthorRead(
@@ -1,98 +1,44 @@
 """Routers for Book endpoints, supporting many-to-many author and series relationships."""
 
-from uuid import uuid4
+from typing import Any
+from uuid import UUID, uuid4
 
-import httpx
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from fastlibrarian.db import get_db
+from fastlibrarian.config import get_config
+from fastlibrarian.db import AsyncSessionLocal, get_db
+from fastlibrarian.events import author_event, book_event, publish, series_event
 from fastlibrarian.models import authors as author_models
 from fastlibrarian.models import books as models
 from fastlibrarian.models import series as series_models
-from fastlibrarian.models.schemas import AuthorShort, BookRead, SeriesShort
-
-from .shared import hardcover_headers
+from fastlibrarian.models.schemas import (
+    AuthorShort,
+    BookRead,
+    BookshopEnrichRequest,
+    SeriesShort,
+)
+from fastlibrarian.modules.bookshop import Bookshop
+from fastlibrarian.modules.hardcover import HardcoverAPI
+from fastlibrarian.modules.identifiers import (
+    normalize_identifier,
+    resolve_identifiers,
+    sync_book_identifiers,
+)
+from fastlibrarian.normalize import name_key
+from fastlibrarian.responses import json_list_response
+from fastlibrarian.singleflight import Group
 
 router = APIRouter(prefix="/books", tags=["books"])
-
-
-async def search_hardcover_book(title: str):
-    """Search for a book using the Hardcover GraphQL API."""
-    url = "https://api.hardcover.app/v1/graphql"
-
-    query = """
-    query searchBook($query: String!) {
-        search(query: $query, query_type: "Book", per_page: 5, page: 1) {
-            results
-        }
-    }
-    """
-
-    variables = {"query": title}
-    payload = {"query": query, "variables": variables}
-    async with httpx.AsyncClient(headers=hardcover_headers) as client:
-        resp = await client.post(url, json=payload)
-
-        if resp.status_code != 200:
-            return None
-
-        data = resp.json()
-        results = data.get("data", {}).get("search", {}).get("results", {})
-        hits = results.get("hits", [])
-        # Try to find an exact match (case-insensitive)
-        for hit in hits:
-            doc = hit.get("document", {})
-            if doc.get("title", "").lower() == title.lower():
-                # Extract author info
-                authors = []
-                for c in doc.get("contributions", []):
-                    author = c.get("author")
-                    if author:
-                        authors.append(
-                            {
-                                "id": author.get("id"),
-                                "name": author.get("name"),
-                                "bio": author.get("bio"),
-                            },
-                        )
-                if not authors and doc.get("author_names"):
-                    authors = [{"name": doc["author_names"][0]}]
-                return {
-                    "title": doc.get("title"),
-                    "description": doc.get("description"),
-                    "authors": authors,
-                    "series": doc.get("featured_series"),
-                }
-        if hits:
-            doc = hits[0].get("document", {})
-            authors = []
-            for c in doc.get("contributions", []):
-                author = c.get("author")
-                if author:
-                    authors.append(
-                        {
-                            "id": author.get("id"),
-                            "name": author.get("name"),
-                            "bio": author.get("bio"),
-                        },
-                    )
-            if not authors and doc.get("author_names"):
-                authors = [{"name": doc["author_names"][0]}]
-            return {
-                "title": doc.get("title"),
-                "description": doc.get("description"),
-                "authors": authors,
-                "series": doc.get("featured_series"),
-            }
-        return None
+# Book detail loads in flight, by ID
+_book_loads = Group("book")
 
 
 async def get_or_create_author(db: AsyncSession, author_data):
     statement = select(author_models.Author).where(
-        author_models.Author.name == author_data["name"],
+        author_models.Author.name_key == name_key(author_data["name"]),
     )
     result = await db.execute(statement)
     db_author = result.scalars().first()
@@ -104,6 +50,7 @@ async def get_or_create_author(db: AsyncSession, author_data):
         bio=author_data.get("bio"),
     )
     db.add(db_author)
+    await publish(db, author_event(db_author, "created"))
     await db.commit()
     await db.refresh(db_author)
     return db_author
@@ -111,7 +58,7 @@ async def get_or_create_author(db: AsyncSession, author_data):
 
 async def get_or_create_series(db: AsyncSession, series_data):
     statement = select(series_models.Series).where(
-        series_models.Series.name == series_data["name"],
+        series_models.Series.name_key == name_key(series_data["name"]),
     )
     result = await db.execute(statement)
     db_series = result.scalars().first()
@@ -123,6 +70,7 @@ async def get_or_create_series(db: AsyncSession, series_data):
         description=series_data.get("description"),
     )
     db.add(db_series)
+    await publish(db, series_event(db_series, "created"))
     await db.commit()
     await db.refresh(db_series)
     return db_series
@@ -136,7 +84,7 @@ async def create_book(request: Request) -> BookRead:
     title = data.get("title")
     if not title:
         raise HTTPException(status_code=400, detail="Title is required")
-    hc_book = await search_hardcover_book(title)
+    hc_book = await HardcoverAPI().search_book(title)
     if not hc_book:
         raise HTTPException(status_code=404, detail="Book not found on Hardcover")
     # Use Hardcover data
@@ -165,13 +113,74 @@ async def create_book(request: Request) -> BookRead:
     if db_series:
         db_book.series.append(db_series)
     db.add(db_book)
+    await publish(db, book_event(db_book, "created"))
     await db.commit()
     await db.refresh(db_book)
     return BookRead.model_validate(db_book)
 
 
+async def enrich_bookshop_availability(
+    db: AsyncSession,
+    book_ids: list[UUID],
+    formats: list[str],
+) -> dict[UUID, dict[str, Any]]:
+    """Store Bookshop format availability on books and their editions.
+
+    All title x format lookups go out as batched multi-search requests. The
+    per-format availability is stored under ``external_refs["bookshop"]`` and
+    editions whose ISBN-13 Bookshop knows get a ``bookshop`` entry.
+    """
+    statement = (
+        select(models.Book)
+        .where(models.Book.id.in_(book_ids))
+        .options(selectinload(models.Book.authors))
+    )
+    result = await db.execute(statement)
+    books = result.scalars().all()
+    editions = {
+        book.id: book.editions if isinstance(book.editions, list) else []
+        for book in books
+    }
+    lookups = [
+        (
+            " ".join([book.title, *(a.name for a in book.authors[:1])]),
+            [str(e["isbn_13"]) for e in editions[book.id] if e.get("isbn_13")],
+        )
+        for book in books
+    ]
+    bookshop = Bookshop()
+    availability = await bookshop.availability(lookups, formats)
+    for book, book_availability in zip(books, availability, strict=True):
+        book.external_refs = {
+            **(book.external_refs or {}),
+            "bookshop": book_availability,
+        }
+        enriched = []
+        for edition in editions[book.id]:
+            hit = edition.get("isbn_13") and bookshop.get_by_ean(edition["isbn_13"])
+            enriched.append({**edition, "bookshop": hit} if hit else edition)
+        if enriched:
+            book.editions = enriched
+    await publish(db, *(book_event(book, "updated") for book in books))
+    await db.commit()
+    return {
+        book.id: book_availability
+        for book, book_availability in zip(books, availability, strict=True)
+    }
+
+
+@router.post("/bookshop/enrich", response_model=dict[UUID, dict[str, Any]])
+async def enrich_books_from_bookshop(
+    request: BookshopEnrichRequest,
+    db: AsyncSession = Depends(get_db),
+) -> dict[UUID, dict[str, Any]]:
+    """Enrich books' editions with Bookshop price and format availability."""
+    formats = request.formats or get_config().external_apis.bookshop_formats
+    return await enrich_bookshop_availability(db, request.book_ids, formats)
+
+
 @router.get("/", response_model=list[BookRead])
-async def list_books(db: AsyncSession = Depends(get_db)) -> list[BookRead]:
+async def list_books(db: AsyncSession = Depends(get_db)) -> Response:
     """List all books."""
     statement = select(models.Book).options(
         selectinload(models.Book.authors),
@@ -181,25 +190,78 @@ async def list_books(db: AsyncSession = Depends(get_db)) -> list[BookRead]:
     books = result.scalars().all()
     # Sort books alphabetically by title
     books = sorted(books, key=lambda book: book.title.lower() if book.title else "")
-    return [BookRead.model_validate(b) for b in books]
+    return json_list_response(books, BookRead.model_validate, BookRead)
 
 
-@router.get("/{book_id}", response_model=BookRead)
-async def get_book(book_id: str, db: AsyncSession = Depends(get_db)) -> BookRead:
-    """Get a book by ID."""
+@router.get("/by-identifier/{identifier}", response_model=BookRead)
+async def get_book_by_identifier(
+    identifier: str,
+    db: AsyncSession = Depends(get_db),
+) -> BookRead:
+    """Get a book by the ISBN-10, ISBN-13 or ASIN of one of its editions."""
+    if normalize_identifier(identifier) is None:
+        raise HTTPException(status_code=400, detail="Not an ISBN or ASIN")
+    book_ids = (await resolve_identifiers(db, [identifier]))[identifier]
+    if not book_ids:
+        raise HTTPException(status_code=404, detail="Book not found")
     statement = (
         select(models.Book)
-        .where(models.Book.id == book_id)
+        .where(models.Book.id == book_ids[0])
         .options(
             selectinload(models.Book.authors),
             selectinload(models.Book.series),
         )
     )
     result = await db.execute(statement)
-    book = result.scalars().first()
-    if not book:
+    return BookRead.model_validate(result.scalars().one())
+
+
+@router.post("/by-identifier", response_model=dict[str, list[UUID]])
+async def resolve_book_identifiers(
+    identifiers: list[str] = Body(..., description="ISBNs and/or ASINs"),
+    db: AsyncSession = Depends(get_db),
+) -> dict[str, list[UUID]]:
+    """Resolve many ISBNs/ASINs to book ids in batched index lookups."""
+    return await resolve_identifiers(db, identifiers)
+
+
+@router.get("/{book_id}", response_model=BookRead)
+async def get_book(book_id: str) -> BookRead:
+    """Get a book by ID."""
+    book = await load_book(book_id)
+    if book is None:
         raise HTTPException(status_code=404, detail="Book not found")
-    return BookRead.model_validate(book)
+    return book
+
+
+async def load_book(book_id: str) -> BookRead | None:
+    """A book with its authors and series, or None if there is no such book.
+
+    Concurrent loads of the same book share one query, run in its own
+    session, so a caller may get a load that started just before it asked.
+    """
+    try:
+        key = UUID(book_id.strip())
+    except ValueError:
+        return None
+    return await _book_loads.do(key, lambda: _load_book(key))
+
+
+async def _load_book(book_id: UUID) -> BookRead | None:
+    async with AsyncSessionLocal() as db:
+        statement = (
+            select(models.Book)
+            .where(models.Book.id == book_id)
+            .options(
+                selectinload(models.Book.authors),
+                selectinload(models.Book.series),
+            )
+        )
+        result = await db.execute(statement)
+        book = result.scalars().first()
+        if not book:
+            return None
+        return BookRead.model_validate(book)
 
 
 @router.put("/{book_id}", response_model=BookRead)
@@ -227,6 +289,7 @@ async def update_book(request: Request, book_id: str) -> BookRead:
         db_book.external_refs = book["external_refs"]
     if "editions" in book:
         db_book.editions = book["editions"]
+        await sync_book_identifiers(db, db_book.id, db_book.editions)
     # Update authors
     if "author_ids" in book:
         author_objs = []
@@ -251,6 +314,7 @@ async def update_book(request: Request, book_id: str) -> BookRead:
             if series:
                 series_objs.append(series)
         db_book.series = series_objs
+    await publish(db, book_event(db_book, "updated"))
     await db.commit()
     await db.refresh(db_book)
     return BookRead.model_validate(db_book)
@@ -286,6 +350,7 @@ async def patch_book_status(
     if "p_status" in data:
         db_book.p_status = data["p_status"]
 
+    await publish(db, book_event(db_book, "updated"))
     await db.commit()
     await db.refresh(db_book, ["authors", "series"])
 
@@ -336,5 +401,6 @@ async def delete_book(request: Request, book_id: str) -> BookRead:
     if not db_book:
         raise HTTPException(status_code=404, detail="Book not found")
     await db.delete(db_book)
+    await publish(db, book_event(db_book, "deleted"))
     await db.commit()
     return BookRead.model_validate(db_book)
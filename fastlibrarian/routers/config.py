@@ -4,6 +4,7 @@ from fastapi import APIRouter, Body, HTTPException
 from fastapi.security import HTTPBearer
 from loguru import logger
 
+from fastlibrarian import coordination
 from fastlibrarian.config import (
     AppConfig,
     DownloadClientType,
@@ -71,7 +72,7 @@ async def update_config(config_update: dict[str, Any]) -> dict[str, str]:
 
         # Save the configuration
         config_manager.save_config(new_config)
-        config_manager._config = new_config
+        config_manager.set_config(new_config)
 
     except Exception as e:
         logger.error(f"Failed to update configuration: {e!s}")
@@ -135,7 +136,7 @@ async def validate_config_toml(
 
         # Validate configuration structure
         try:
-            temp_config = config_manager.load_config_from_string(toml_content)
+            temp_config = config_manager.parse_config_string(toml_content)
             return {
                 "valid": True,
                 "toml_valid": True,
@@ -199,7 +200,7 @@ async def config_health_check() -> dict[str, Any]:
             "status": "healthy",
             "environment": config.environment,
             "version": config.api.version,
-            "database_configured": bool(config.database.url),
+            "database_configured": bool(config.database.connection_url),
             "external_apis_configured": bool(config.external_apis.hardcover_api_key),
             "toml_parser": "rtoml",
             "config_file_exists": config_manager.config_path.exists(),
@@ -216,3 +217,18 @@ async def config_health_check() -> dict[str, Any]:
 async def get_download_client_types() -> dict[str, list[str]]:
     """Get valid download client types (enum values)."""
     return {"types": [e.value for e in DownloadClientType]}
+
+
+@router.get("/caches")
+async def list_caches() -> dict[str, list[str]]:
+    """List the in-process caches that can be invalidated."""
+    return {"caches": coordination.cache_namespaces()}
+
+
+@router.post("/caches/invalidate")
+async def invalidate_cache(namespace: str, key: str | None = None) -> dict[str, str]:
+    """Invalidate a cache entry, or a whole cache, on every worker."""
+    if namespace not in coordination.cache_namespaces():
+        raise HTTPException(status_code=404, detail=f"Unknown cache '{namespace}'")
+    await coordination.invalidate(namespace, key)
+    return {"message": f"Invalidated cache '{namespace}'"}
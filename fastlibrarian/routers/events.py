@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import json
+from uuid import UUID
+
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from fastlibrarian.events import EventKind, Subscription, event_bus
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+KEEPALIVE_SECONDS = 15.0
+
+
+class EventFilters(BaseModel):
+    """Filters sent by WebSocket clients to (re)subscribe."""
+
+    authors: list[UUID] = []
+    series: list[UUID] = []
+    books: list[UUID] = []
+    kinds: list[EventKind] = []
+
+
+def _resync(dropped: int) -> dict:
+    """Message telling a client it missed events and should reload."""
+    return {"event": "resync", "dropped": dropped}
+
+
+async def _sse_stream(request: Request, subscription: Subscription):
+    try:
+        while not await request.is_disconnected():
+            try:
+                await asyncio.wait_for(subscription.wait(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if dropped := subscription.take_dropped():
+                yield f"event: resync\ndata: {json.dumps(_resync(dropped))}\n\n"
+            while not subscription.queue.empty():
+                event = subscription.queue.get_nowait()
+                yield f"event: {event.kind}\ndata: {event.model_dump_json()}\n\n"
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    authors: list[UUID] = Query(default=[]),
+    series: list[UUID] = Query(default=[]),
+    books: list[UUID] = Query(default=[]),
+    kinds: list[EventKind] = Query(default=[]),
+) -> StreamingResponse:
+    """Stream change events as Server-Sent Events.
+
+    Without filters every book, author and series change is sent. A
+    ``resync`` event means changes were missed (a slow client or a lost
+    database connection) and the client should reload what it shows.
+    """
+    subscription = event_bus.subscribe()
+    subscription.set_filters(authors, series, books, kinds)
+    return StreamingResponse(
+        _sse_stream(request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket) -> None:
+    """Send change events over a WebSocket.
+
+    Clients send ``EventFilters`` as JSON at any time to change what they are
+    subscribed to; until then every change is sent. A ``{"event": "resync"}``
+    message means changes were missed and the client should reload.
+    """
+    await websocket.accept()
+    subscription = event_bus.subscribe()
+
+    async def receive_filters() -> None:
+        while True:
+            message = await websocket.receive_text()
+            try:
+                filters = EventFilters.model_validate(json.loads(message))
+            except (ValueError, ValidationError) as e:
+                await websocket.send_json({"error": f"Invalid filters: {e!s}"})
+                continue
+            subscription.set_filters(
+                filters.authors,
+                filters.series,
+                filters.books,
+                filters.kinds,
+            )
+
+    receiver = asyncio.create_task(receive_filters())
+    try:
+        while not receiver.done():
+            waiter = asyncio.create_task(subscription.wait())
+            done, _ = await asyncio.wait(
+                {waiter, receiver},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if waiter not in done:
+                waiter.cancel()
+                break
+            if dropped := subscription.take_dropped():
+                await websocket.send_json(_resync(dropped))
+            while not subscription.queue.empty():
+                event = subscription.queue.get_nowait()
+                await websocket.send_text(event.model_dump_json())
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Change event WebSocket failed: {e}")
+    finally:
+        event_bus.unsubscribe(subscription)
+        receiver.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await receiver
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.config import get_config
+from fastlibrarian.db import get_db
+from fastlibrarian.models.schemas import (
+    BookshopEnrichResult,
+    DedupeResult,
+    LibraryScanResult,
+    RefreshStatus,
+)
+from fastlibrarian.modules import bookshop, dedupe, scanner
+from fastlibrarian.scheduler import refresh_scheduler
+
+router = APIRouter(prefix="/library", tags=["library"])
+
+
+@router.post("/scan")
+async def start_library_scan(
+    background_tasks: BackgroundTasks,
+    full: bool = False,
+) -> dict[str, str]:
+    """Scan the configured library folders in the background."""
+    if scanner.scan_in_progress():
+        raise HTTPException(status_code=409, detail="Library scan already running")
+    background_tasks.add_task(scanner.run_library_scan, full)
+    return {"message": "Library scan started"}
+
+
+@router.get("/scan", response_model=LibraryScanResult | None)
+async def get_library_scan() -> LibraryScanResult | None:
+    """Get the result of the most recent library scan."""
+    return scanner.last_scan_result
+
+
+@router.post("/dedupe")
+async def start_dedupe(
+    background_tasks: BackgroundTasks,
+    full: bool = False,
+    dry_run: bool = False,
+) -> dict[str, str]:
+    """Find and merge duplicate books and authors in the background.
+
+    Only authors and books added since the previous run are checked unless
+    ``full`` is set. A ``dry_run`` reports clusters without merging them.
+    """
+    if dedupe.dedupe_in_progress():
+        raise HTTPException(status_code=409, detail="Dedupe already running")
+    background_tasks.add_task(dedupe.run_dedupe, full, dry_run)
+    return {"message": "Dedupe started"}
+
+
+@router.get("/dedupe", response_model=DedupeResult | None)
+async def get_dedupe() -> DedupeResult | None:
+    """Get the result of the most recent dedupe run."""
+    return dedupe.last_dedupe_result
+
+
+@router.post("/bookshop")
+async def start_bookshop_enrich(
+    background_tasks: BackgroundTasks,
+    formats: list[str] = Query(default=[]),
+) -> dict[str, str]:
+    """Enrich every book with Bookshop availability in the background.
+
+    Without ``formats`` the configured ``bookshop_formats`` are checked.
+    """
+    if bookshop.enrich_in_progress():
+        raise HTTPException(
+            status_code=409,
+            detail="Bookshop enrichment already running",
+        )
+    formats = formats or get_config().external_apis.bookshop_formats
+    background_tasks.add_task(bookshop.run_enrich_library, formats)
+    return {"message": "Bookshop enrichment started"}
+
+
+@router.get("/bookshop", response_model=BookshopEnrichResult | None)
+async def get_bookshop_enrich() -> BookshopEnrichResult | None:
+    """Get the result of the most recent whole-library Bookshop enrichment."""
+    return bookshop.last_enrich_result
+
+
+@router.get("/refresh", response_model=RefreshStatus)
+async def get_refresh_status(db: AsyncSession = Depends(get_db)) -> RefreshStatus:
+    """Get the state of the scheduled author refresh."""
+    return await refresh_scheduler.status(db)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from fastlibrarian import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """Prometheus metrics for this worker process."""
+    return PlainTextResponse(
+        await metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
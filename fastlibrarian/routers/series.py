@@ -1,57 +1,36 @@
+from typing import Literal
 from uuid import uuid4
 
-import httpx
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from fastlibrarian.db import get_db
+from fastlibrarian.events import publish, series_event
 from fastlibrarian.models import series as models
-from fastlibrarian.models.schemas import BookShort, SeriesCreate, SeriesRead
-
-from .shared import hardcover_headers  # Import the headers for Hardcover API
+from fastlibrarian.models.schemas import (
+    BookShort,
+    Page,
+    SeriesCreate,
+    SeriesRead,
+    SeriesSummary,
+)
+from fastlibrarian.models.shared import Tags, series_books, series_tags
+from fastlibrarian.modules.hardcover import HardcoverAPI
+from fastlibrarian.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    book_status_counts,
+    keyset_page,
+    next_cursor,
+    owned_books,
+)
+from fastlibrarian.responses import json_list_response
 
 router = APIRouter(prefix="/series", tags=["series"])
 
 
-async def search_hardcover_series(name: str):
-    """Search for a series using the Hardcover GraphQL API."""
-    url = "https://api.hardcover.app/v1/graphql"
-    query = """
-    query SearchSeries($query: String!) {
-      search(
-        query: $query,
-        query_type: "Series",
-        per_page: 5,
-        page: 1
-      ) {
-        results {
-          ... on SeriesSearchResult {
-            id
-            name
-            description
-          }
-        }
-      }
-    }
-    """
-    variables = {"query": name}
-    payload = {"query": query, "variables": variables}
-    async with httpx.AsyncClient(headers=hardcover_headers) as client:
-        resp = await client.post(url, json=payload)
-        if resp.status_code != 200:
-            return None
-        data = resp.json()
-        results = data.get("data", {}).get("search", {}).get("results", [])
-        for series in results:
-            if series.get("name", "").lower() == name.lower():
-                return series
-        if results:
-            return results[0]
-        return None
-
-
 @router.post("/", response_model=SeriesRead)
 async def create_series(
     data: dict,
@@ -61,7 +40,7 @@ async def create_series(
     name = data.get("name")
     if not name:
         raise HTTPException(status_code=400, detail="Name is required")
-    hc_series = await search_hardcover_series(name)
+    hc_series = await HardcoverAPI().search_series(name)
     if not hc_series:
         raise HTTPException(status_code=404, detail="Series not found on Hardcover")
     name = hc_series.get("name")
@@ -72,27 +51,86 @@ async def create_series(
         description=description,
     )
     db.add(db_series)
+    await publish(db, series_event(db_series, "created"))
     await db.commit()
     await db.refresh(db_series)
     return SeriesRead.model_validate(db_series)
 
 
+def series_read(s: models.Series) -> SeriesRead:
+    """Build a ``SeriesRead`` from a series with its books loaded."""
+    return SeriesRead(
+        id=s.id,
+        name=s.name,
+        description=s.description,
+        external_refs=dict(s.external_refs) if s.external_refs else None,
+        books=[BookShort(id=b.id, title=b.title) for b in s.books],
+    )
+
+
 @router.get("/", response_model=list[SeriesRead])
-async def list_series(db: AsyncSession = Depends(get_db)) -> list[SeriesRead]:
+async def list_series(db: AsyncSession = Depends(get_db)) -> Response:
     """List all series."""
     statement = select(models.Series).options(selectinload(models.Series.books))
     result = await db.execute(statement)
     series_list = result.scalars().all()
-    return [
-        SeriesRead(
-            id=str(s.id),
-            name=s.name,
-            description=s.description,
-            external_refs=dict(s.external_refs) if s.external_refs else None,
-            books=[BookShort(id=str(b.id), title=b.title) for b in s.books],
+    return json_list_response(series_list, series_read, SeriesRead)
+
+
+@router.get("/page", response_model=Page[SeriesSummary])
+async def list_series_page(
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    tag: str | None = None,
+    include: list[Literal["books"]] = Query(default=[]),
+    db: AsyncSession = Depends(get_db),
+) -> Page[SeriesSummary]:
+    """List series by name, one page at a time, with book counts by status.
+
+    Pass the returned ``next_cursor`` to get the next page.
+    """
+    statement = select(
+        models.Series.id,
+        models.Series.name,
+        models.Series.description,
+        models.Series.external_refs,
+    )
+    if tag:
+        statement = statement.where(
+            exists().where(
+                series_tags.c.series_id == models.Series.id,
+                series_tags.c.tag_id == Tags.id,
+                Tags.name == tag,
+            ),
+        )
+    try:
+        statement = keyset_page(
+            statement, models.Series.name, models.Series.id, cursor, limit
         )
-        for s in series_list
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    rows = (await db.execute(statement)).all()
+    ids = [row.id for row in rows[:limit]]
+    counts = await book_status_counts(db, series_books.c.series_id, ids)
+    books = (
+        await owned_books(db, series_books.c.series_id, ids)
+        if "books" in include
+        else None
+    )
+    return Page(
+        items=[
+            SeriesSummary(
+                id=row.id,
+                name=row.name,
+                description=row.description,
+                external_refs=row.external_refs or None,
+                book_counts=counts[row.id],
+                books=books.get(row.id, []) if books is not None else None,
+            )
+            for row in rows[:limit]
+        ],
+        next_cursor=next_cursor(rows, limit),
+    )
 
 
 @router.get("/{series_id}", response_model=SeriesRead)
@@ -130,6 +168,7 @@ async def update_series(
         raise HTTPException(status_code=404, detail="Series not found")
     for key, value in series.model_dump().items():
         setattr(db_series, key, value)
+    await publish(db, series_event(db_series, "updated"))
     await db.commit()
     await db.refresh(db_series)
     return SeriesRead.model_validate(db_series)
@@ -147,5 +186,6 @@ async def delete_series(
     if not db_series:
         raise HTTPException(status_code=404, detail="Series not found")
     await db.delete(db_series)
+    await publish(db, series_event(db_series, "deleted"))
     await db.commit()
     return SeriesRead.model_validate(db_series)
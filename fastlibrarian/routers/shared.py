@@ -1,7 +0,0 @@
-import os
-
-HARD_COVER_API_KEY = os.getenv("HARD_COVER_API_KEY")
-
-hardcover_headers = {
-    "authorization": f"Bearer {HARD_COVER_API_KEY}",
-}
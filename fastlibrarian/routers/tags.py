@@ -0,0 +1,319 @@
+"""Routers for tags and tag-faceted book browsing."""
+
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.db import get_db
+from fastlibrarian.events import ChangeEvent, book_update_events, publish
+from fastlibrarian.facets import STATUSES, FacetCounts, facet_index
+from fastlibrarian.models.authors import Author
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.schemas import (
+    BookFacets,
+    BookShort,
+    BookStatus,
+    Page,
+    TagCount,
+    TagCreate,
+    TagRead,
+)
+from fastlibrarian.models.series import Series
+from fastlibrarian.models.shared import (
+    Tags,
+    author_tags,
+    book_tags,
+    series_tags,
+)
+from fastlibrarian.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    keyset_page,
+    next_cursor,
+)
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+TaggedKind = Literal["books", "authors", "series"]
+
+# Link table, its owner column and the owner model for each taggable kind
+TAG_LINKS = {
+    "books": (book_tags, book_tags.c.book_id, Book),
+    "authors": (author_tags, author_tags.c.author_id, Author),
+    "series": (series_tags, series_tags.c.series_id, Series),
+}
+
+
+def _book_filters(tag_ids: list[UUID], status: BookStatus | None) -> list:
+    filters = [
+        exists().where(book_tags.c.book_id == Book.id, book_tags.c.tag_id == tag_id)
+        for tag_id in tag_ids
+    ]
+    if status is not None:
+        filters.append(Book.status == status)
+    return filters
+
+
+async def _count_facets(
+    db: AsyncSession,
+    tag_ids: list[UUID],
+    status: BookStatus | None,
+) -> FacetCounts:
+    """Facet counts with grouped queries, used until the facet index is built."""
+    result = await db.execute(
+        select(Book.status, func.count())
+        .where(*_book_filters(tag_ids, None))
+        .group_by(Book.status),
+    )
+    statuses = dict.fromkeys(STATUSES, 0)
+    for book_status, count in result.all():
+        statuses[book_status.value] = count
+    total = statuses[status.value] if status else sum(statuses.values())
+    matching = select(Book.id).where(*_book_filters(tag_ids, status))
+    result = await db.execute(
+        select(book_tags.c.tag_id, func.count())
+        .where(book_tags.c.book_id.in_(matching))
+        .group_by(book_tags.c.tag_id),
+    )
+    return FacetCounts(total=total, tags=dict(result.all()), statuses=statuses)
+
+
+async def _book_count(db: AsyncSession, tag_id: UUID) -> int:
+    result = await db.execute(
+        select(func.count()).select_from(book_tags).where(book_tags.c.tag_id == tag_id),
+    )
+    return result.scalar_one()
+
+
+async def _get_tag(db: AsyncSession, tag_id: UUID) -> Tags:
+    tag = await db.get(Tags, tag_id)
+    if not tag:
+        raise HTTPException(status_code=404, detail="Tag not found")
+    return tag
+
+
+async def _ensure_unique_name(db: AsyncSession, name: str, tag_id: UUID | None) -> None:
+    result = await db.execute(select(Tags.id).where(Tags.name == name))
+    existing = result.scalar_one_or_none()
+    if existing is not None and existing != tag_id:
+        raise HTTPException(status_code=409, detail=f"Tag '{name}' already exists")
+
+
+async def _publish_tag_changes(
+    db: AsyncSession,
+    kind: TaggedKind,
+    ids: list[UUID],
+) -> None:
+    if not ids:
+        return
+    if kind == "books":
+        await publish(db, *await book_update_events(db, ids))
+        return
+    event_kind = "author" if kind == "authors" else "series"
+    await publish(
+        db,
+        *(ChangeEvent(kind=event_kind, action="updated", id=id) for id in ids),
+    )
+
+
+@router.get("/", response_model=list[TagRead])
+async def list_tags(db: AsyncSession = Depends(get_db)) -> list[TagRead]:
+    """List all tags with the number of books having each."""
+    result = await db.execute(
+        select(Tags.id, Tags.name, Tags.description).order_by(Tags.name),
+    )
+    tags = result.all()
+    if facet_index.ready:
+        counts = facet_index.tag_counts()
+    else:
+        result = await db.execute(
+            select(book_tags.c.tag_id, func.count()).group_by(book_tags.c.tag_id),
+        )
+        counts = dict(result.all())
+    return [
+        TagRead(
+            id=tag.id,
+            name=tag.name,
+            description=tag.description,
+            book_count=counts.get(tag.id, 0),
+        )
+        for tag in tags
+    ]
+
+
+@router.post("/", response_model=TagRead)
+async def create_tag(
+    tag: TagCreate,
+    db: AsyncSession = Depends(get_db),
+) -> TagRead:
+    """Create a tag."""
+    await _ensure_unique_name(db, tag.name, None)
+    db_tag = Tags(name=tag.name, description=tag.description)
+    db.add(db_tag)
+    await db.commit()
+    await db.refresh(db_tag)
+    return TagRead(id=db_tag.id, name=db_tag.name, description=db_tag.description)
+
+
+@router.get("/facets", response_model=BookFacets)
+async def browse_books(
+    tag: list[str] = Query(default=[]),
+    status: BookStatus | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+) -> BookFacets:
+    """Browse books having every given tag and the given status.
+
+    Returns a page of matching books ordered by title and, to refine the
+    search, how many of the matches have each tag and each status. Counts
+    come from the in-memory facet index once it is built, which follows
+    changes within a second.
+    """
+    result = await db.execute(select(Tags.id, Tags.name))
+    names = dict(result.all())
+    ids_by_name = {name: id for id, name in names.items()}
+    unknown = [name for name in tag if name not in ids_by_name]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown tags: {unknown}")
+    tag_ids = [ids_by_name[name] for name in dict.fromkeys(tag)]
+
+    statement = select(Book.id, Book.title.label("name")).where(
+        *_book_filters(tag_ids, status),
+    )
+    try:
+        statement = keyset_page(statement, Book.title, Book.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    rows = (await db.execute(statement)).all()
+
+    indexed = facet_index.ready
+    if indexed:
+        counts = facet_index.counts(tag_ids, status.value if status else None)
+    else:
+        counts = await _count_facets(db, tag_ids, status)
+    # The index keeps bits of deleted tags until it is rebuilt
+    tag_counts = [
+        TagCount(id=id, name=names[id], count=count)
+        for id, count in counts.tags.items()
+        if id in names
+    ]
+    tag_counts.sort(key=lambda t: (-t.count, t.name))
+    return BookFacets(
+        total=counts.total,
+        tags=tag_counts,
+        statuses=counts.statuses,
+        books=Page(
+            items=[BookShort(id=row.id, title=row.name) for row in rows[:limit]],
+            next_cursor=next_cursor(rows, limit),
+        ),
+        indexed=indexed,
+    )
+
+
+@router.get("/{tag_id}", response_model=TagRead)
+async def get_tag(tag_id: UUID, db: AsyncSession = Depends(get_db)) -> TagRead:
+    """Get a tag by ID."""
+    tag = await _get_tag(db, tag_id)
+    return TagRead(
+        id=tag.id,
+        name=tag.name,
+        description=tag.description,
+        book_count=await _book_count(db, tag.id),
+    )
+
+
+@router.put("/{tag_id}", response_model=TagRead)
+async def update_tag(
+    tag_id: UUID,
+    tag: TagCreate,
+    db: AsyncSession = Depends(get_db),
+) -> TagRead:
+    """Rename a tag or change its description."""
+    db_tag = await _get_tag(db, tag_id)
+    await _ensure_unique_name(db, tag.name, tag_id)
+    db_tag.name = tag.name
+    db_tag.description = tag.description
+    await db.commit()
+    return TagRead(
+        id=db_tag.id,
+        name=db_tag.name,
+        description=db_tag.description,
+        book_count=await _book_count(db, tag_id),
+    )
+
+
+@router.delete("/{tag_id}", response_model=TagRead)
+async def delete_tag(tag_id: UUID, db: AsyncSession = Depends(get_db)) -> TagRead:
+    """Delete a tag, removing it from every book, author and series."""
+    tag = await _get_tag(db, tag_id)
+    deleted = TagRead(id=tag.id, name=tag.name, description=tag.description)
+    # Collected before the delete cascades to the link tables
+    for kind, (link, owner, _) in TAG_LINKS.items():
+        result = await db.execute(select(owner).where(link.c.tag_id == tag_id))
+        await _publish_tag_changes(db, kind, list(result.scalars().all()))
+    await db.delete(tag)
+    await db.commit()
+    return deleted
+
+
+@router.put("/{tag_id}/{kind}", response_model=TagRead)
+async def add_tag(
+    tag_id: UUID,
+    kind: TaggedKind,
+    ids: list[UUID] = Body(...),
+    db: AsyncSession = Depends(get_db),
+) -> TagRead:
+    """Tag books, authors or series. Already tagged ones are left as they are."""
+    tag = await _get_tag(db, tag_id)
+    link, owner, model = TAG_LINKS[kind]
+    ids = list(dict.fromkeys(ids))
+    result = await db.execute(select(model.id).where(model.id.in_(ids)))
+    found = set(result.scalars().all())
+    missing = [str(id) for id in ids if id not in found]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Unknown {kind}: {missing}")
+    result = await db.execute(
+        select(owner).where(link.c.tag_id == tag_id, owner.in_(ids)),
+    )
+    tagged = set(result.scalars().all())
+    new = [id for id in ids if id not in tagged]
+    if new:
+        await db.execute(
+            insert(link),
+            [{owner.name: id, "tag_id": tag_id} for id in new],
+        )
+        await _publish_tag_changes(db, kind, new)
+    await db.commit()
+    return TagRead(
+        id=tag.id,
+        name=tag.name,
+        description=tag.description,
+        book_count=await _book_count(db, tag_id),
+    )
+
+
+@router.delete("/{tag_id}/{kind}", response_model=TagRead)
+async def remove_tag(
+    tag_id: UUID,
+    kind: TaggedKind,
+    ids: list[UUID] = Body(...),
+    db: AsyncSession = Depends(get_db),
+) -> TagRead:
+    """Untag books, authors or series."""
+    tag = await _get_tag(db, tag_id)
+    link, owner, _ = TAG_LINKS[kind]
+    result = await db.execute(
+        delete(link).where(link.c.tag_id == tag_id, owner.in_(ids)).returning(owner),
+    )
+    await _publish_tag_changes(db, kind, list(result.scalars().all()))
+    await db.commit()
+    return TagRead(
+        id=tag.id,
+        name=tag.name,
+        description=tag.description,
+        book_count=await _book_count(db, tag_id),
+    )
@@ -0,0 +1,79 @@
+"""Router for name typeahead over authors, series and books."""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.config import get_config
+from fastlibrarian.db import get_db
+from fastlibrarian.models.schemas import Typeahead, TypeaheadHit, TypeaheadStats
+from fastlibrarian.typeahead import KINDS, SOURCES, typeahead_index
+
+router = APIRouter(prefix="/typeahead", tags=["typeahead"])
+
+MAX_LIMIT = 50
+
+
+async def _search_names(
+    db: AsyncSession,
+    q: str,
+    kinds: list[str],
+    limit: int,
+) -> list[TypeaheadHit]:
+    """Names with a word starting with ``q``, for when the index is not ready."""
+    hits = []
+    for kind, (model, column) in zip(KINDS, SOURCES, strict=True):
+        if kind not in kinds:
+            continue
+        result = await db.execute(
+            select(model.id, column)
+            .where(
+                or_(
+                    column.istartswith(q, autoescape=True),
+                    column.icontains(f" {q}", autoescape=True),
+                ),
+            )
+            .order_by(column)
+            .limit(limit),
+        )
+        hits.extend(
+            TypeaheadHit(kind=kind, id=id, name=name) for id, name in result.all()
+        )
+    hits.sort(key=lambda hit: hit.name.lower())
+    return hits[:limit]
+
+
+@router.get("", response_model=Typeahead)
+async def typeahead(
+    q: str = Query(min_length=1, max_length=100),
+    kind: list[Literal["author", "series", "book"]] = Query(default=[]),
+    limit: int = Query(10, ge=1, le=MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+) -> Typeahead:
+    """Authors, series and books with a word of their name starting with ``q``.
+
+    Served from this worker's in-memory prefix index; until it is built,
+    names are matched in the database instead.
+    """
+    kinds = kind or KINDS
+    if typeahead_index.ready:
+        hits = typeahead_index.lookup(q, kinds, limit)
+        return Typeahead(
+            items=[TypeaheadHit(kind=h.kind, id=h.id, name=h.name) for h in hits],
+            indexed=True,
+        )
+    return Typeahead(items=await _search_names(db, q, kinds, limit))
+
+
+@router.get("/stats", response_model=TypeaheadStats)
+async def typeahead_stats() -> TypeaheadStats:
+    """Size and memory use of this worker's typeahead index."""
+    return TypeaheadStats(
+        ready=typeahead_index.ready,
+        names=typeahead_index.size,
+        keys=typeahead_index.keys,
+        memory_bytes=typeahead_index.memory_bytes,
+        max_entries=get_config().library.typeahead_max_entries,
+    )
@@ -0,0 +1,297 @@
+"""Background refresh of authors' books from Hardcover, stalest first.
+
+Every author with a Hardcover id is due again ``refresh.interval_hours``
+after its ``last_refreshed_at``, divided by its weight: 1, plus
+``wanted_weight`` if it has Wanted books, plus ``recent_weight`` if books
+were added to it in the last ``recent_days`` (new releases found by earlier
+refreshes). The most overdue author by weighted age is refreshed next, one
+at a time.
+
+Refreshes are spaced evenly so that the whole library is refreshed once
+per interval, but never faster than ``budget_share`` of the Hardcover rate
+limit allows, counting the pages each refresh fetched. The time of the next
+refresh is kept in ``job_state`` and progress in ``last_refreshed_at``, so
+the schedule survives restarts and is shared by all workers; a lease makes
+sure one worker refreshes at a time. An author whose refresh fails is not
+picked again for ``failure_backoff_hours``, doubled for each failure in a
+row, so failing authors do not hold up the rest of the library.
+"""
+
+import asyncio
+import contextlib
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import case, exists, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.config import AppConfig, RefreshConfig, get_config
+from fastlibrarian.coordination import lease
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.metrics import track_job
+from fastlibrarian.models.authors import Author
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.coordination import job_state
+from fastlibrarian.models.schemas import BookStatus, RefreshStatus, WorksRefresh
+from fastlibrarian.models.shared import author_books
+from fastlibrarian.modules import hardcover
+from fastlibrarian.sql import ago, epoch, insert, localtimestamp
+
+JOB_NAME = "author-refresh"
+# Longest sleep between checks, so config changes and other workers'
+# progress are picked up
+IDLE_DELAY = 60.0
+# Age of never refreshed authors, which puts them first
+NEVER_REFRESHED_AGE = 10 * 365 * 86400.0
+
+
+def _weight(config: RefreshConfig):
+    """How many times per interval an author is refreshed."""
+    wanted = exists().where(
+        author_books.c.author_id == Author.id,
+        author_books.c.book_id == Book.id,
+        Book.status == BookStatus.Wanted,
+    )
+    recent = exists().where(
+        author_books.c.author_id == Author.id,
+        author_books.c.book_id == Book.id,
+        Book.add_date >= ago(timedelta(days=config.recent_days)),
+    )
+    return (
+        1.0
+        + case((wanted, config.wanted_weight), else_=0.0)
+        + case((recent, config.recent_weight), else_=0.0)
+    )
+
+
+def _age():
+    """Seconds since an author was last refreshed."""
+    return func.coalesce(
+        epoch(localtimestamp()) - epoch(Author.last_refreshed_at),
+        NEVER_REFRESHED_AGE,
+    )
+
+
+def _has_hardcover_id():
+    return Author.external_refs["hardcover_id"].as_string().isnot(None)
+
+
+def _not_backing_off():
+    return or_(
+        Author.refresh_retry_at.is_(None),
+        Author.refresh_retry_at <= localtimestamp(),
+    )
+
+
+def _backoff(config: RefreshConfig, failures: int) -> timedelta:
+    """Wait before retrying an author after ``failures`` failures in a row."""
+    hours = config.failure_backoff_hours * 2 ** min(failures - 1, 32)
+    return timedelta(hours=min(hours, config.interval_hours))
+
+
+class RefreshScheduler:
+    """Refreshes the most overdue author whenever the pacing allows."""
+
+    def __init__(self) -> None:
+        self._task: asyncio.Task | None = None
+        self.last_author_id: UUID | None = None
+        self.last_result: WorksRefresh | None = None
+        self.last_run_at: datetime | None = None
+
+    async def _next_author(
+        self,
+        db: AsyncSession,
+        config: RefreshConfig,
+    ) -> UUID | None:
+        """The due author with the highest weighted age, if any."""
+        priority = _age() * _weight(config)
+        result = await db.execute(
+            select(Author.id)
+            .where(
+                _has_hardcover_id(),
+                _not_backing_off(),
+                priority >= config.interval_hours * 3600,
+            )
+            .order_by(priority.desc())
+            .limit(1),
+        )
+        return result.scalar_one_or_none()
+
+    async def _totals(self, db: AsyncSession, config: RefreshConfig) -> tuple:
+        """Authors, due, never refreshed and failing ones, and the summed weight."""
+        weight = _weight(config)
+        due = (_age() * weight >= config.interval_hours * 3600) & _not_backing_off()
+        result = await db.execute(
+            select(
+                func.count(),
+                func.sum(case((due, 1), else_=0)),
+                func.sum(case((Author.last_refreshed_at.is_(None), 1), else_=0)),
+                func.sum(case((Author.refresh_failures > 0, 1), else_=0)),
+                func.sum(weight),
+            ).where(_has_hardcover_id()),
+        )
+        authors, due_count, never, failing, total_weight = result.one()
+        return (
+            authors,
+            due_count or 0,
+            never or 0,
+            failing or 0,
+            float(total_weight or 0.0),
+        )
+
+    def _spacing(self, config: AppConfig, total_weight: float, requests: int) -> float:
+        """Seconds to wait after a refresh that made ``requests`` requests.
+
+        The larger of the even spread of a whole interval's refreshes and
+        the time the rate budget needs to recover from this one.
+        """
+        spread = config.refresh.interval_hours * 3600 / max(total_weight, 1.0)
+        apis = config.external_apis
+        budget_rate = config.refresh.budget_share * apis.rate_limit_requests
+        return max(spread, requests * apis.rate_limit_window / budget_rate)
+
+    async def _next_run_at(self, db: AsyncSession) -> datetime | None:
+        result = await db.execute(
+            select(job_state.c.watermark).where(job_state.c.name == JOB_NAME),
+        )
+        return result.scalar_one_or_none()
+
+    async def _set_next_run_at(self, db: AsyncSession, next_run_at: datetime) -> None:
+        state = {"watermark": next_run_at, "updated_at": localtimestamp()}
+        await db.execute(
+            insert(job_state)
+            .values(name=JOB_NAME, **state)
+            .on_conflict_do_update(index_elements=["name"], set_=state),
+        )
+        await db.commit()
+
+    async def _record_failure(
+        self,
+        db: AsyncSession,
+        author_id: UUID,
+        config: RefreshConfig,
+        now: datetime,
+    ) -> None:
+        """Count a failed refresh and hold the author back until its retry time."""
+        failures = await db.scalar(
+            select(Author.refresh_failures).where(Author.id == author_id),
+        )
+        failures = (failures or 0) + 1
+        await db.execute(
+            update(Author)
+            .where(Author.id == author_id)
+            .values(
+                refresh_failures=failures,
+                refresh_retry_at=now + _backoff(config, failures),
+            ),
+        )
+
+    async def step(self) -> float:
+        """Refresh the next author if one is due and the pacing allows.
+
+        Returns:
+            Seconds to sleep before the next step.
+        """
+        from fastlibrarian.routers.authors import update_author_books
+
+        config = get_config()
+        if not hardcover.api_key(config.external_apis):
+            return IDLE_DELAY
+        async with lease(JOB_NAME) as acquired:
+            if not acquired:
+                return IDLE_DELAY
+            async with AsyncSessionLocal() as db:
+                now = await db.scalar(select(localtimestamp()))
+                next_run_at = await self._next_run_at(db)
+                if next_run_at is not None and next_run_at > now:
+                    return min((next_run_at - now).total_seconds(), IDLE_DELAY)
+                author_id = await self._next_author(db, config.refresh)
+                if author_id is None:
+                    return IDLE_DELAY
+
+            try:
+                with track_job(JOB_NAME):
+                    async with AsyncSessionLocal() as db:
+                        result = await update_author_books(author_id, db)
+            except Exception as e:
+                logger.error(f"Scheduled refresh of author {author_id} failed: {e}")
+                result = None
+            self.last_author_id = author_id
+            self.last_result = result
+            self.last_run_at = now
+
+            async with AsyncSessionLocal() as db:
+                now = await db.scalar(select(localtimestamp()))
+                if result is None:
+                    # Hardcover failed or the budget ran out: back off, and
+                    # move on to other authors until this one may be retried
+                    await self._record_failure(db, author_id, config.refresh, now)
+                    delay = IDLE_DELAY
+                else:
+                    _, _, _, _, total_weight = await self._totals(db, config.refresh)
+                    # One request per page of works
+                    requests = result.works // hardcover.WORKS_PAGE_SIZE + 1
+                    delay = self._spacing(config, total_weight, requests)
+                await self._set_next_run_at(db, now + timedelta(seconds=delay))
+            return min(delay, IDLE_DELAY)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                delay = await self.step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Scheduled author refresh failed: {e}")
+                delay = IDLE_DELAY
+            await asyncio.sleep(delay)
+
+    async def status(self, db: AsyncSession) -> RefreshStatus:
+        """Current state of the schedule."""
+        config = get_config()
+        authors, due, never, failing, total_weight = await self._totals(
+            db,
+            config.refresh,
+        )
+        spacing = self._spacing(config, total_weight, 1)
+        return RefreshStatus(
+            enabled=config.refresh.enabled,
+            running=self._task is not None,
+            authors=authors,
+            due=due,
+            never_refreshed=never,
+            failing=failing,
+            spacing_seconds=round(spacing, 1),
+            # Time to refresh every author at least once at this pace
+            cycle_hours=round(spacing * total_weight / 3600, 1),
+            next_run_at=await self._next_run_at(db),
+            last_run_at=self.last_run_at,
+            last_author_id=self.last_author_id,
+            last_result=self.last_result,
+        )
+
+    def start(self) -> None:
+        """Start refreshing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop refreshing; a refresh in progress is cancelled."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def on_config_change(self, old: AppConfig, new: AppConfig) -> None:
+        """Start or stop the scheduler when ``refresh.enabled`` changes."""
+        if old.refresh.enabled == new.refresh.enabled:
+            return
+        if new.refresh.enabled:
+            self.start()
+        else:
+            await self.stop()
+
+
+refresh_scheduler = RefreshScheduler()
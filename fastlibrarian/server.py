@@ -0,0 +1,22 @@
+"""Command line entry point for running the API server."""
+
+import uvicorn
+
+from fastlibrarian.config import get_config
+
+
+def main() -> None:
+    """Run the API with uvicorn using the host, port and workers from config."""
+    config = get_config().api
+    uvicorn.run(
+        "fastlibrarian.main:create_app",
+        factory=True,
+        host=config.host,
+        port=config.port,
+        workers=config.workers,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
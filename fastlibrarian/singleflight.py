@@ -0,0 +1,46 @@
+"""Coalescing of identical concurrent calls ("singleflight").
+
+``Group.do(key, fn)`` runs ``fn()`` unless a call with an equal key is
+already in flight, in which case the caller awaits that call's result or
+exception instead. Nothing is kept once the call finishes, so the next
+caller runs ``fn`` again; caching is left to the callers. The call runs as
+its own task, so one caller being cancelled (a client disconnecting) does
+not fail the others waiting on it. Groups are per process.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from fastlibrarian.metrics import coalesced_calls
+
+T = TypeVar("T")
+
+
+class Group:
+    """Calls in flight under one name, by key."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls running."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn()``, or join the running call with the same ``key``."""
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(fn())
+            self._calls[key] = call
+            call.add_done_callback(lambda _: self._forget(key, call))
+            coalesced_calls[self.name, "executed"] += 1
+        else:
+            coalesced_calls[self.name, "shared"] += 1
+        return await asyncio.shield(call)
+
+    def _forget(self, key: Hashable, call: asyncio.Future) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
@@ -0,0 +1,98 @@
+"""Query building blocks that run on both PostgreSQL and SQLite.
+
+PostgreSQL is the main database; SQLite serves embedded single-node
+installs and test runs (see ``fastlibrarian.db``). Models and queries use
+these helpers where the two differ, so the same code runs on either:
+
+- ``JSONType`` is ``JSONB`` on PostgreSQL and ``JSON`` elsewhere. Read keys
+  with ``column["key"].as_string()``, which both compile.
+- ``insert`` returns the dialect's ``INSERT`` with ``ON CONFLICT`` support.
+- ``localtimestamp``, ``ago`` and ``epoch`` cover the database clock and
+  date arithmetic.
+"""
+
+from datetime import timedelta
+
+from sqlalchemy import JSON, DateTime, Float, Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# SQLite has no datetime type; SQLAlchemy stores ISO 8601 text, which this
+# format matches so stored and computed times compare as text
+SQLITE_NOW = "STRFTIME('%Y-%m-%d %H:%M:%f', 'now', 'localtime'{})"
+
+
+def dialect_name() -> str:
+    """Name of the configured database's dialect."""
+    from fastlibrarian.db import get_engine
+
+    return get_engine().dialect.name
+
+
+def insert(table: Table | type):
+    """``INSERT`` for the configured database, with ``on_conflict_do_*``."""
+    if dialect_name() == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+class localtimestamp(FunctionElement):
+    """The database's current local time, without time zone."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+class ago(FunctionElement):
+    """The database's current local time minus a ``timedelta``."""
+
+    type = DateTime()
+    # The interval is rendered into the SQL, so it must not be cached
+    inherit_cache = False
+
+    def __init__(self, delta: timedelta) -> None:
+        self.seconds = int(delta.total_seconds())
+        super().__init__()
+
+
+class epoch(FunctionElement):
+    """Seconds since 1970 of a timestamp, as a float."""
+
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(localtimestamp)
+def _localtimestamp(element, compiler, **kw) -> str:
+    return "LOCALTIMESTAMP"
+
+
+@compiles(localtimestamp, "sqlite")
+def _localtimestamp_sqlite(element, compiler, **kw) -> str:
+    return SQLITE_NOW.format("")
+
+
+@compiles(ago)
+def _ago(element, compiler, **kw) -> str:
+    return f"(LOCALTIMESTAMP - INTERVAL '{element.seconds} seconds')"
+
+
+@compiles(ago, "sqlite")
+def _ago_sqlite(element, compiler, **kw) -> str:
+    return SQLITE_NOW.format(f", '{-element.seconds} seconds'")
+
+
+@compiles(epoch)
+def _epoch(element, compiler, **kw) -> str:
+    return f"EXTRACT(EPOCH FROM {compiler.process(element.clauses, **kw)})"
+
+
+@compiles(epoch, "sqlite")
+def _epoch_sqlite(element, compiler, **kw) -> str:
+    # Julian day 2440587.5 is the Unix epoch
+    timestamp = compiler.process(element.clauses, **kw)
+    return f"((JULIANDAY({timestamp}) - 2440587.5) * 86400.0)"
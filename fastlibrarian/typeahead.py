@@ -0,0 +1,445 @@
+"""In-memory prefix index of author, series and book names for typeahead.
+
+Names are normalized (``fastlibrarian.normalize.normalize``) and every word
+start of a normalized name is a key, so "sand" finds "Brandon Sanderson".
+The index built at startup is a frozen segment of a few flat buffers: ids,
+display names and normalized names are concatenated into ``bytes`` and
+located through ``array`` offsets, and the keys are one ``array`` of
+offsets into the normalized names, sorted by the text they start. A lookup
+is a binary search over that array and a short scan. There is no Python
+object per entry, so a million names take around a hundred megabytes, and
+a lookup takes tens of microseconds
+(``python -m benchmarks.typeahead --size 1m``). At most
+``library.typeahead_max_entries`` names are held.
+
+Changes arrive through the change feed: the changed rows are reloaded,
+their segment entries marked dead and their current names kept in a small
+sorted overlay. When the overlay outgrows ``COMPACT_AT`` entries, or the
+subscription dropped events, the index is rebuilt. Each worker process
+keeps its own index.
+"""
+
+import asyncio
+import contextlib
+import sys
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fastlibrarian.config import AppConfig, get_config
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.events import Subscription, event_bus
+from fastlibrarian.metrics import track_job
+from fastlibrarian.models.authors import Author
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.series import Series
+from fastlibrarian.normalize import normalize
+
+# Seconds to gather change events before reloading the rows they touch
+BATCH_DELAY = 0.5
+# Seconds to wait before retrying a failed build
+RETRY_DELAY = 30.0
+# Rows fetched per round trip while building
+STREAM_BATCH = 10_000
+# Change events buffered between batches; overflowing forces a rebuild
+QUEUE_SIZE = 10_000
+# Overlay entries after which the index is rebuilt
+COMPACT_AT = 50_000
+# Characters of a normalized name that are indexed
+MAX_NAME_LENGTH = 64
+# Word starts of a name that are keys, the first included
+MAX_WORDS = 4
+# Keys scanned per lookup, bounding short queries on large libraries
+MAX_SCAN = 10_000
+
+KINDS = ["author", "series", "book"]
+SOURCES = [(Author, Author.name), (Series, Series.name), (Book, Book.title)]
+# Ends every normalized name in the segment, so a key slice running past
+# its name compares below any query
+TERMINATOR = b"\0"
+
+
+@dataclass(slots=True, frozen=True)
+class Hit:
+    """A name matching a typeahead query."""
+
+    kind: str
+    id: UUID
+    name: str
+
+
+def _word_starts(norm: str) -> list[int]:
+    """Offsets of the first ``MAX_WORDS`` words of a normalized name."""
+    starts = [0]
+    pos = norm.find(" ")
+    while pos != -1 and len(starts) < MAX_WORDS:
+        starts.append(pos + 1)
+        pos = norm.find(" ", pos + 1)
+    return starts
+
+
+def _index_name(name: str) -> str:
+    return normalize(name)[:MAX_NAME_LENGTH].rstrip()
+
+
+@dataclass(slots=True)
+class _Segment:
+    """Frozen, sorted part of the index."""
+
+    kinds: bytes
+    ids: bytes  # 16 bytes per entry
+    names: bytes  # UTF-8 display names
+    name_starts: array  # n + 1 offsets into names
+    norms: bytes  # terminated normalized names
+    norm_starts: array  # n + 1 offsets into norms
+    keys: array  # offsets into norms, sorted by the text they start
+    id_order: array  # entries sorted by id
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            sys.getsizeof(part)
+            for part in (
+                self.kinds,
+                self.ids,
+                self.names,
+                self.name_starts,
+                self.norms,
+                self.norm_starts,
+                self.keys,
+                self.id_order,
+            )
+        )
+
+    def entry(self, offset: int) -> int:
+        """The entry whose normalized name contains ``offset``."""
+        return bisect_right(self.norm_starts, offset) - 1
+
+    def name(self, entry: int) -> str:
+        start, end = self.name_starts[entry], self.name_starts[entry + 1]
+        return self.names[start:end].decode()
+
+    def id(self, entry: int) -> UUID:
+        return UUID(bytes=self.ids[entry * 16 : entry * 16 + 16])
+
+    def find(self, id_: UUID) -> int | None:
+        """The entry of ``id_``, if indexed."""
+        key = id_.bytes
+        ids = self.ids
+        i = bisect_left(self.id_order, key, key=lambda e: ids[e * 16 : e * 16 + 16])
+        if i < len(self.id_order):
+            entry = self.id_order[i]
+            if ids[entry * 16 : entry * 16 + 16] == key:
+                return entry
+        return None
+
+    def scan(self, prefix: bytes) -> Iterable[tuple[bytes, int]]:
+        """Keys starting with ``prefix`` in order, with their entries."""
+        norms, keys, n = self.norms, self.keys, len(prefix)
+        i = bisect_left(keys, prefix, key=lambda s: norms[s : s + n])
+        for offset in keys[i : i + MAX_SCAN]:
+            if norms[offset : offset + n] != prefix:
+                return
+            end = norms.index(TERMINATOR, offset)
+            yield norms[offset:end], self.entry(offset)
+
+
+class _Builder:
+    """Accumulates rows into the buffers of a segment."""
+
+    def __init__(self) -> None:
+        self.kinds = bytearray()
+        self.ids = bytearray()
+        self.names = bytearray()
+        self.name_starts = array("I", [0])
+        self.norms = bytearray()
+        self.norm_starts = array("I", [0])
+        self.keys = array("I")
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def add(self, kind: str, rows: Iterable[tuple[UUID, str]]) -> None:
+        code = KINDS.index(kind)
+        for id_, name in rows:
+            if not name:
+                continue
+            norm = _index_name(name)
+            if not norm:
+                continue
+            self.kinds.append(code)
+            self.ids += id_.bytes
+            self.names += name.encode()
+            self.name_starts.append(len(self.names))
+            base = len(self.norms)
+            self.keys.extend(base + start for start in _word_starts(norm))
+            self.norms += norm.encode() + TERMINATOR
+            self.norm_starts.append(len(self.norms))
+
+    def freeze(self) -> _Segment:
+        norms = bytes(self.norms)
+        ids = bytes(self.ids)
+        keys = sorted(self.keys, key=lambda s: norms[s : norms.index(TERMINATOR, s)])
+        id_order = sorted(
+            range(len(self.kinds)), key=lambda e: ids[e * 16 : e * 16 + 16]
+        )
+        return _Segment(
+            kinds=bytes(self.kinds),
+            ids=ids,
+            names=bytes(self.names),
+            name_starts=self.name_starts,
+            norms=norms,
+            norm_starts=self.norm_starts,
+            keys=array("I", keys),
+            id_order=array("I", id_order),
+        )
+
+
+class TypeaheadIndex:
+    """Prefix index over author, series and book names."""
+
+    def __init__(self) -> None:
+        self._subscription: Subscription | None = None
+        self._task: asyncio.Task | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.ready = False
+        self._segment = _Builder().freeze()
+        self._dead = bytearray()
+        self._dead_count = 0
+        # Entries added or renamed since the build: id -> (kind, name), and
+        # their keys as sorted (key, id) pairs
+        self._overlay: dict[UUID, tuple[str, str]] = {}
+        self._overlay_keys: list[tuple[bytes, UUID]] = []
+        self._full_warned = False
+
+    @property
+    def size(self) -> int:
+        """Number of indexed names."""
+        return len(self._segment) - self._dead_count + len(self._overlay)
+
+    @property
+    def keys(self) -> int:
+        """Number of indexed word starts."""
+        return len(self._segment.keys) + len(self._overlay_keys)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index."""
+        overlay = sys.getsizeof(self._overlay) + sys.getsizeof(self._overlay_keys)
+        for key, _ in self._overlay_keys:
+            # The pair, the key and its share of the id and name
+            overlay += 56 + sys.getsizeof(key) + 64
+        return self._segment.nbytes + sys.getsizeof(self._dead) + overlay
+
+    def lookup(
+        self,
+        query: str,
+        kinds: Sequence[str] = (),
+        limit: int = 10,
+    ) -> list[Hit]:
+        """Names with a word starting with ``query``, in key order."""
+        prefix = _index_name(query).encode()
+        if not prefix:
+            return []
+        kinds = set(kinds or KINDS)
+        segment = self._segment
+        found: list[tuple[bytes, Hit]] = []
+        seen: set[UUID] = set()
+        for key, entry in segment.scan(prefix):
+            if self._dead[entry] or KINDS[segment.kinds[entry]] not in kinds:
+                continue
+            id_ = segment.id(entry)
+            if id_ not in seen:
+                seen.add(id_)
+                hit = Hit(KINDS[segment.kinds[entry]], id_, segment.name(entry))
+                found.append((key, hit))
+                if len(found) == limit:
+                    break
+        keys = self._overlay_keys
+        overlay_found = 0
+        for i in range(bisect_left(keys, (prefix,)), len(keys)):
+            key, id_ = keys[i]
+            if not key.startswith(prefix) or overlay_found == limit:
+                break
+            kind, name = self._overlay[id_]
+            if kind in kinds and id_ not in seen:
+                seen.add(id_)
+                found.append((key, Hit(kind, id_, name)))
+                overlay_found += 1
+        found.sort(key=lambda item: item[0])
+        return [hit for _, hit in found[:limit]]
+
+    def _add_overlay(self, kind: str, id_: UUID, name: str) -> None:
+        norm = _index_name(name)
+        if not norm:
+            return
+        self._overlay[id_] = (kind, name)
+        for start in _word_starts(norm):
+            insort(self._overlay_keys, (norm[start:].encode(), id_))
+
+    def _remove_overlay(self, id_: UUID) -> None:
+        if id_ not in self._overlay:
+            return
+        _, name = self._overlay.pop(id_)
+        norm = _index_name(name)
+        for start in _word_starts(norm):
+            pair = (norm[start:].encode(), id_)
+            i = bisect_left(self._overlay_keys, pair)
+            if i < len(self._overlay_keys) and self._overlay_keys[i] == pair:
+                del self._overlay_keys[i]
+
+    def _current_name(self, id_: UUID) -> str | None:
+        if id_ in self._overlay:
+            return self._overlay[id_][1]
+        entry = self._segment.find(id_)
+        if entry is None or self._dead[entry]:
+            return None
+        return self._segment.name(entry)
+
+    def apply(self, kind: str, ids: Iterable[UUID], names: dict[UUID, str]) -> None:
+        """Index the current ``names`` of ``ids``; ids without one are removed."""
+        max_entries = get_config().library.typeahead_max_entries
+        for id_ in ids:
+            name = names.get(id_)
+            if name == self._current_name(id_):
+                continue
+            entry = self._segment.find(id_)
+            if entry is not None and not self._dead[entry]:
+                self._dead[entry] = 1
+                self._dead_count += 1
+            self._remove_overlay(id_)
+            if not name:
+                continue
+            if self.size >= max_entries:
+                if not self._full_warned:
+                    logger.warning(f"Typeahead index is full ({max_entries} names)")
+                    self._full_warned = True
+                continue
+            self._add_overlay(kind, id_, name)
+
+    async def build(self) -> None:
+        """Rebuild the whole index from the database."""
+        max_entries = get_config().library.typeahead_max_entries
+        builder = _Builder()
+        async with AsyncSessionLocal() as db:
+            for kind, (model, column) in zip(KINDS, SOURCES, strict=True):
+                remaining = max_entries - len(builder)
+                if remaining <= 0:
+                    logger.warning(f"Typeahead index is full ({max_entries} names)")
+                    break
+                result = await db.stream(
+                    select(model.id, column)
+                    .limit(remaining)
+                    .execution_options(yield_per=STREAM_BATCH),
+                )
+                async for partition in result.partitions():
+                    # Normalizing is CPU bound; keep the event loop free
+                    await asyncio.to_thread(builder.add, kind, partition)
+        self._install(await asyncio.to_thread(builder.freeze))
+
+    def load(self, rows: dict[str, Iterable[tuple[UUID, str]]]) -> None:
+        """Replace the index with ``(id, name)`` rows per kind, in memory."""
+        builder = _Builder()
+        for kind, kind_rows in rows.items():
+            builder.add(kind, kind_rows)
+        self._install(builder.freeze())
+
+    def _install(self, segment: _Segment) -> None:
+        self._reset()
+        self._segment = segment
+        self._dead = bytearray(len(segment))
+        self.ready = True
+        logger.info(
+            f"Typeahead index built: {len(segment)} names, "
+            f"{len(segment.keys)} keys, {self.memory_bytes / 2**20:.1f} MiB",
+        )
+
+    async def refresh(self, db: AsyncSession, changed: dict[str, set[UUID]]) -> None:
+        """Reload the names of changed rows; missing rows are removed."""
+        for kind, (model, column) in zip(KINDS, SOURCES, strict=True):
+            ids = changed.get(kind)
+            if not ids:
+                continue
+            result = await db.execute(
+                select(model.id, column).where(model.id.in_(list(ids))),
+            )
+            self.apply(kind, ids, dict(result.all()))
+
+    async def _run(self) -> None:
+        queue = self._subscription.queue
+        while True:
+            try:
+                with track_job("typeahead-index-build"):
+                    await self.build()
+                while True:
+                    await self._subscription.wait()
+                    await asyncio.sleep(BATCH_DELAY)
+                    events = []
+                    while not queue.empty():
+                        events.append(queue.get_nowait())
+                    if self._subscription.dropped:
+                        logger.warning(
+                            "Typeahead index missed change events, rebuilding"
+                        )
+                        self._subscription.dropped = 0
+                        break
+                    changed: dict[str, set[UUID]] = {}
+                    for event in events:
+                        changed.setdefault(event.kind, set()).add(event.id)
+                    async with AsyncSessionLocal() as db:
+                        await self.refresh(db, changed)
+                    if len(self._overlay) > COMPACT_AT:
+                        logger.info("Typeahead index overlay is large, rebuilding")
+                        break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Typeahead index update failed: {e}")
+                self.ready = False
+                await asyncio.sleep(RETRY_DELAY)
+
+    def start(self) -> None:
+        """Build the index in the background and follow name changes."""
+        if self._task is not None:
+            return
+        # Subscribe before building so no change is missed in between
+        self._subscription = event_bus.subscribe(QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop following changes and free the index."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._subscription is not None:
+            event_bus.unsubscribe(self._subscription)
+            self._subscription = None
+        self._reset()
+
+    async def on_config_change(self, old: AppConfig, new: AppConfig) -> None:
+        """Start, stop or rebuild the index when its settings change."""
+        old_lib, new_lib = old.library, new.library
+        if (old_lib.typeahead_index, old_lib.typeahead_max_entries) == (
+            new_lib.typeahead_index,
+            new_lib.typeahead_max_entries,
+        ):
+            return
+        await self.stop()
+        if new_lib.typeahead_index:
+            self.start()
+
+
+typeahead_index = TypeaheadIndex()
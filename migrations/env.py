@@ -21,7 +21,13 @@ if config.config_file_name is not None:
 
 
 from fastlibrarian.db import Base
-from fastlibrarian.models import authors, books, series  # noqa: F401
+from fastlibrarian.models import (  # noqa: F401
+    authors,
+    books,
+    coordination,
+    library,
+    series,
+)
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,121 @@
+"""Add book identifiers index for ISBN/ASIN lookups
+
+Revision ID: a4e787cc1d61
+Revises: eaec09048613
+Create Date: 2026-10-19 11:02:17.551204
+
+"""
+
+import re
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e787cc1d61"
+down_revision: str | None = "eaec09048613"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Books read per keyset page while backfilling
+BACKFILL_BATCH_SIZE = 5000
+
+# Frozen copy of fastlibrarian.modules.identifiers as of this revision, so
+# later changes to the normalizer don't change what this migration writes
+SEPARATORS_RE = re.compile(r"[\s\-_.]")
+ISBN_10_RE = re.compile(r"^\d{9}[\dX]$")
+ISBN_13_RE = re.compile(r"^97[89]\d{10}$")
+ASIN_RE = re.compile(r"^B[0-9A-Z]{9}$")
+
+
+def isbn13_check_digit(first12: str) -> str:
+    """Compute the ISBN-13 check digit for the first 12 digits."""
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(first12))
+    return str((10 - total % 10) % 10)
+
+
+def normalize_identifier(value) -> tuple[str, str] | None:
+    """Normalize an ISBN-10, ISBN-13 or ASIN to ``(kind, identifier)``."""
+    if value is None:
+        return None
+    value = SEPARATORS_RE.sub("", str(value)).upper()
+    if ISBN_13_RE.match(value) and isbn13_check_digit(value[:12]) == value[12]:
+        return "isbn", value
+    if ISBN_10_RE.match(value):
+        total = sum(
+            (10 - i) * (10 if c == "X" else int(c)) for i, c in enumerate(value)
+        )
+        if total % 11 == 0:
+            first12 = f"978{value[:9]}"
+            return "isbn", first12 + isbn13_check_digit(first12)
+    if ASIN_RE.match(value):
+        return "asin", value
+    return None
+
+
+def edition_identifiers(editions) -> set[tuple[str, str]]:
+    """Collect the normalized identifiers of a book's editions."""
+    identifiers = set()
+    for edition in editions if isinstance(editions, list) else []:
+        for key in ("isbn_13", "isbn_10", "asin"):
+            normalized = normalize_identifier(edition.get(key))
+            if normalized:
+                identifiers.add(normalized)
+    return identifiers
+
+
+def backfill(book_identifiers: sa.Table) -> None:
+    """Index the editions of existing books, one keyset page at a time."""
+    conn = op.get_bind()
+    books = sa.table(
+        "books", sa.column("id", sa.UUID()), sa.column("editions", sa.JSON())
+    )
+    last_id = None
+    while True:
+        query = sa.select(books.c.id, books.c.editions).order_by(books.c.id)
+        if last_id is not None:
+            query = query.where(books.c.id > last_id)
+        page = conn.execute(query.limit(BACKFILL_BATCH_SIZE)).all()
+        if not page:
+            return
+        rows = [
+            {"identifier": identifier, "kind": kind, "book_id": book_id}
+            for book_id, editions in page
+            for kind, identifier in edition_identifiers(editions)
+        ]
+        if rows:
+            op.bulk_insert(book_identifiers, rows)
+        last_id = page[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    book_identifiers = op.create_table(
+        "book_identifiers",
+        sa.Column("identifier", sa.String(length=16), nullable=False),
+        sa.Column("book_id", sa.UUID(), nullable=False),
+        sa.Column("kind", sa.String(length=8), nullable=False),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("identifier", "book_id"),
+    )
+    op.create_index(
+        op.f("ix_book_identifiers_book_id"),
+        "book_identifiers",
+        ["book_id"],
+        unique=False,
+    )
+    # ### end Alembic commands ###
+
+    # Backfill from the editions JSONB of existing books
+    backfill(book_identifiers)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f("ix_book_identifiers_book_id"), table_name="book_identifiers")
+    op.drop_table("book_identifiers")
+    # ### end Alembic commands ###
@@ -0,0 +1,35 @@
+"""Fixtures running FastLibrarian against a throwaway SQLite database."""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import pytest
+
+from fastlibrarian import db
+from fastlibrarian.main import create_app
+
+# Building the app imports every model, which the mappers need
+create_app()
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch) -> Callable[[Callable[[], Awaitable]], object]:
+    """Run a coroutine function on a fresh event loop and SQLite database."""
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(db, "_engine", None)
+    db.AsyncSessionLocal.configure(bind=None)
+
+    def run(fn: Callable[[], Awaitable]) -> object:
+        async def main():
+            await db.create_tables()
+            db.get_engine().echo = False
+            try:
+                return await fn()
+            finally:
+                await db.get_engine().dispose()
+
+        return asyncio.run(main())
+
+    yield run
+    monkeypatch.setattr(db, "_engine", None)
+    db.AsyncSessionLocal.configure(bind=None)
@@ -0,0 +1,75 @@
+import asyncio
+
+from fastapi import Response
+
+from fastlibrarian.config import get_config
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.models.authors import Author
+from fastlibrarian.modules import hardcover
+from fastlibrarian.modules.hardcover import HardcoverAPI, HardcoverError
+from fastlibrarian.routers import authors
+from fastlibrarian.routers.authors import find_authors, update_author_books
+
+
+async def _add_author(**fields) -> Author:
+    async with AsyncSessionLocal() as session:
+        author = Author(**fields)
+        session.add(author)
+        await session.commit()
+        return author
+
+
+def test_update_author_books_returns_none_when_first_page_fails(run, monkeypatch):
+    async def get_works(self, id):
+        raise HardcoverError("rate limited")
+        yield []
+
+    monkeypatch.setattr(HardcoverAPI, "get_works", get_works)
+
+    async def scenario():
+        author = await _add_author(
+            name="Ursula K. Le Guin",
+            external_refs={"hardcover_id": 1},
+        )
+        async with AsyncSessionLocal() as session:
+            return await update_author_books(author.id, session)
+
+    assert run(scenario) is None
+
+
+def test_update_author_books_without_hardcover_id(run):
+    async def scenario():
+        author = await _add_author(name="Ursula K. Le Guin", external_refs={})
+        async with AsyncSessionLocal() as session:
+            return await update_author_books(author.id, session)
+
+    assert run(scenario) is None
+
+
+def test_find_authors_returns_local_results_when_hardcover_stalls(run, monkeypatch):
+    async def search_author(self, name):
+        await asyncio.Event().wait()
+
+    config = get_config()
+    config = config.model_copy(
+        update={
+            "external_apis": config.external_apis.model_copy(
+                update={"search_deadline": 0.05},
+            ),
+        },
+    )
+    monkeypatch.setattr(HardcoverAPI, "search_author", search_author)
+    monkeypatch.setattr(hardcover, "api_key", lambda apis: "key")
+    monkeypatch.setattr(authors, "get_config", lambda: config)
+
+    async def scenario():
+        await _add_author(name="Ursula K. Le Guin", external_refs={})
+        response = Response()
+        async with AsyncSessionLocal() as session:
+            results = await find_authors("le guin", response, session)
+        return response.headers["X-Remote-Status"], results
+
+    status, results = run(scenario)
+    assert status == "timeout"
+    assert [r["name"] for r in results] == ["Ursula K. Le Guin"]
+    assert results[0]["in_db"]
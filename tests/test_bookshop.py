@@ -0,0 +1,74 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from fastlibrarian.config import AppConfig, ExternalAPIConfig
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.schemas import BookshopEnrichRequest, BookStatus
+from fastlibrarian.modules import bookshop
+
+
+def test_enrich_request_needs_a_bounded_list_of_books():
+    with pytest.raises(ValidationError):
+        BookshopEnrichRequest(book_ids=[])
+    with pytest.raises(ValidationError):
+        BookshopEnrichRequest(book_ids=[f"{i:032x}" for i in range(501)])
+
+
+def test_enrich_library_works_in_batches(run, monkeypatch):
+    batches = []
+
+    async def availability(self, books, formats):
+        batches.append(len(books))
+        return [{"ebook": {"ean": "9780000000000"}} for _ in books]
+
+    monkeypatch.setattr(bookshop.Bookshop, "availability", availability)
+    monkeypatch.setattr(bookshop, "ENRICH_BATCH_SIZE", 2)
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            session.add_all(
+                Book(
+                    title=f"Book {i}",
+                    status=BookStatus.Wanted,
+                    a_status=BookStatus.Wanted,
+                    external_refs={},
+                    editions=[],
+                )
+                for i in range(5)
+            )
+            await session.commit()
+        summary = await bookshop.enrich_library(["ebook"])
+        async with AsyncSessionLocal() as session:
+            refs = (await session.scalars(select(Book.external_refs))).all()
+        return summary, refs
+
+    summary, refs = run(scenario)
+    assert batches == [2, 2, 1]
+    assert summary.books == 5
+    assert summary.available == 5
+    assert all(ref["bookshop"]["ebook"] for ref in refs)
+
+
+def test_cache_ttl_follows_the_config_not_new_instances(monkeypatch):
+    config = AppConfig.model_construct(
+        external_apis=ExternalAPIConfig(bookshop_cache_ttl=30),
+    )
+    monkeypatch.setattr(bookshop, "get_config", lambda: config)
+    monkeypatch.setattr(bookshop, "_query_cache", None)
+    monkeypatch.setattr(bookshop, "_ean_cache", None)
+    first = bookshop.Bookshop(client=object())
+    assert first.query_cache.ttl == first.ean_cache.ttl == 30
+
+    new = config.model_copy(
+        update={
+            "external_apis": config.external_apis.model_copy(
+                update={"bookshop_cache_ttl": 60},
+            ),
+        },
+    )
+    bookshop.on_config_change(config, new)
+    second = bookshop.Bookshop(client=object())
+    assert second.query_cache is first.query_cache
+    assert first.query_cache.ttl == first.ean_cache.ttl == 60
@@ -0,0 +1,151 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import func, insert, select
+
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.models.authors import Author
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.library import LibraryFile
+from fastlibrarian.models.schemas import BookStatus
+from fastlibrarian.models.series import Series
+from fastlibrarian.models.shared import Tags, author_books, book_tags, series_books
+from fastlibrarian.modules import dedupe
+from fastlibrarian.modules.dedupe import cluster_authors, cluster_books, run_dedupe
+
+
+def _book(title: str, status: BookStatus = BookStatus.Wanted) -> Book:
+    return Book(
+        title=title,
+        status=status,
+        a_status=BookStatus.Wanted,
+        external_refs={},
+        editions=[],
+    )
+
+
+async def _count(model) -> int:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(select(func.count()).select_from(model))
+
+
+async def _add_duplicate_books() -> dict:
+    """An author with two copies of a book; the Wanted one has the extras."""
+    async with AsyncSessionLocal() as session:
+        author = Author(name="Brandon Sanderson", external_refs={})
+        have = _book("The Way of Kings", BookStatus.Have)
+        wanted = _book("The Way of Kings (Hardcover)")
+        series = Series(name="The Stormlight Archive", external_refs={})
+        tag = Tags(name="fantasy")
+        session.add_all([author, have, wanted, series, tag])
+        await session.flush()
+        await session.execute(
+            insert(author_books),
+            [
+                {"author_id": author.id, "book_id": have.id},
+                {"author_id": author.id, "book_id": wanted.id},
+            ],
+        )
+        await session.execute(
+            insert(series_books),
+            [{"series_id": series.id, "book_id": wanted.id, "position": 1}],
+        )
+        await session.execute(
+            insert(book_tags),
+            [{"book_id": wanted.id, "tag_id": tag.id}],
+        )
+        session.add(
+            LibraryFile(
+                path="/library/The Way of Kings.epub",
+                size=1,
+                mtime=0.0,
+                inode=1,
+                media_type="ebook",
+                book_id=wanted.id,
+            ),
+        )
+        await session.commit()
+        return {"have": have.id, "wanted": wanted.id, "series": series.id}
+
+
+def test_cluster_authors_keeps_namesakes_apart():
+    now = datetime(2026, 1, 1)
+    linked, namesake, unlinked = uuid4(), uuid4(), uuid4()
+    rows = [
+        (linked, "john smith", "1", now),
+        (namesake, "john smith", "2", now),
+        (unlinked, "john smith", None, now),
+    ]
+    assert cluster_authors(rows) == []
+    assert cluster_authors(rows[:1] + rows[2:]) == [[linked, unlinked]]
+
+
+def test_cluster_books_joins_near_duplicates_within_an_author():
+    a, b, c = uuid4(), uuid4(), uuid4()
+    block = [(a, "way of kings"), (b, "way of king"), (c, "warbreaker")]
+    clusters, stats = cluster_books([block], 0.9)
+    assert [sorted(cluster) for cluster in clusters] == [sorted([a, b])]
+    assert stats.blocks == 1
+
+
+def test_merging_duplicate_authors_moves_their_books(run):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            first = Author(name="Brandon Sanderson", external_refs={"hardcover_id": 1})
+            second = Author(name="Sanderson, Brandon", external_refs={})
+            books = [_book("Elantris"), _book("Warbreaker")]
+            session.add_all([first, second, *books])
+            await session.flush()
+            await session.execute(
+                insert(author_books),
+                [
+                    {"author_id": first.id, "book_id": books[0].id},
+                    {"author_id": second.id, "book_id": books[1].id},
+                ],
+            )
+            await session.commit()
+        summary = await run_dedupe(full=True)
+        async with AsyncSessionLocal() as session:
+            authors = (await session.scalars(select(Author.id))).all()
+            linked = (await session.execute(select(author_books.c.author_id))).scalars()
+            return summary, first.id, authors, set(linked)
+
+    summary, first_id, authors, linked = run(scenario)
+    assert summary.authors_merged == 1
+    assert authors == [first_id]
+    assert linked == {first_id}
+    assert summary.books_checked == 2
+
+
+def test_merging_books_keeps_series_tags_and_files(run, monkeypatch):
+    monkeypatch.setattr(dedupe, "LOOKUP_BATCH_SIZE", 1)
+
+    async def scenario():
+        ids = await _add_duplicate_books()
+        summary = await run_dedupe(full=True)
+        async with AsyncSessionLocal() as session:
+            books = (await session.execute(select(Book.id, Book.status))).all()
+            series = (await session.scalars(select(series_books.c.book_id))).all()
+            tagged = (await session.scalars(select(book_tags.c.book_id))).all()
+            files = (await session.scalars(select(LibraryFile.book_id))).all()
+        return ids, summary, books, series, tagged, files
+
+    ids, summary, books, series, tagged, files = run(scenario)
+    assert summary.books_merged == 1
+    assert books == [(ids["have"], BookStatus.Have)]
+    assert series == [ids["have"]]
+    assert tagged == [ids["have"]]
+    assert files == [ids["have"]]
+
+
+def test_dry_run_writes_nothing(run):
+    async def scenario():
+        await _add_duplicate_books()
+        summary = await run_dedupe(full=True, dry_run=True)
+        return summary, await _count(Book), await _count(book_tags)
+
+    summary, books, tags = run(scenario)
+    assert summary.book_clusters == 1
+    assert summary.books_merged == 0
+    assert len(summary.examples) == 1
+    assert (books, tags) == (2, 1)
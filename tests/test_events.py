@@ -0,0 +1,111 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from fastlibrarian import events
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.events import (
+    ChangeEvent,
+    Subscription,
+    book_update_events,
+    event_bus,
+    publish,
+)
+from fastlibrarian.models.authors import Author
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.schemas import BookStatus
+from fastlibrarian.models.shared import author_books
+from fastlibrarian.routers.events import _sse_stream
+
+
+def test_book_update_events_looks_up_owners_in_batches(run, monkeypatch):
+    monkeypatch.setattr(events, "LOOKUP_BATCH_SIZE", 2)
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            author = Author(name="Octavia E. Butler", external_refs={})
+            books = [
+                Book(
+                    title=f"Book {i}",
+                    status=BookStatus.Wanted,
+                    a_status=BookStatus.Wanted,
+                    external_refs={},
+                    editions=[],
+                )
+                for i in range(5)
+            ]
+            session.add_all([author, *books])
+            await session.flush()
+            await session.execute(
+                insert(author_books),
+                [{"author_id": author.id, "book_id": book.id} for book in books],
+            )
+            await session.commit()
+            found = await book_update_events(session, [book.id for book in books])
+            return author.id, found
+
+    author_id, found = run(scenario)
+    assert len(found) == 5
+    assert all(event.author_ids == [author_id] for event in found)
+
+
+def test_subscription_wait_wakes_on_events_and_missed_events():
+    async def scenario():
+        subscription = Subscription()
+        waiter = asyncio.create_task(subscription.wait())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        subscription.mark_dropped()
+        await asyncio.wait_for(waiter, 1)
+
+        subscription.dropped = 0
+        waiter = asyncio.create_task(subscription.wait())
+        await asyncio.sleep(0)
+        subscription.put(ChangeEvent(kind="book", action="updated", id=uuid4()))
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(scenario())
+
+
+def test_events_are_dispatched_after_commit_only(run):
+    async def scenario():
+        subscription = event_bus.subscribe()
+        try:
+            change = ChangeEvent(kind="book", action="updated", id=uuid4())
+            async with AsyncSessionLocal() as session:
+                await publish(session, change)
+                await session.rollback()
+                await publish(session, change)
+                before_commit = subscription.queue.qsize()
+                await session.commit()
+            return before_commit, subscription.queue.qsize()
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    assert run(scenario) == (0, 1)
+
+
+def test_sse_stream_sends_resync_after_overflow():
+    class ConnectedRequest:
+        async def is_disconnected(self) -> bool:
+            return False
+
+    async def scenario():
+        subscription = event_bus.subscribe(maxsize=2)
+        changes = [
+            ChangeEvent(kind="book", action="updated", id=uuid4()) for _ in range(3)
+        ]
+        for change in changes:
+            subscription.put(change)
+        stream = _sse_stream(ConnectedRequest(), subscription)
+        try:
+            return [await stream.__anext__() for _ in range(3)], changes
+        finally:
+            await stream.aclose()
+
+    messages, changes = asyncio.run(scenario())
+    assert messages[0] == 'event: resync\ndata: {"event": "resync", "dropped": 1}\n\n'
+    assert str(changes[1].id) in messages[1]
+    assert str(changes[2].id) in messages[2]
+    assert event_bus.subscriber_count == 0
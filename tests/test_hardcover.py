@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from fastlibrarian.config import AppConfig, ExternalAPIConfig
+from fastlibrarian.modules import hardcover
+
+
+@pytest.fixture
+def sent(monkeypatch) -> list[dict]:
+    """Payloads sent to Hardcover, answered from ``responses`` in order."""
+    payloads: list[dict] = []
+    monkeypatch.setattr(hardcover, "_persisted_queries_supported", True)
+    monkeypatch.setattr(hardcover, "_response_cache", hardcover.TTLCache(10, 60))
+    return payloads
+
+
+def _answer(monkeypatch, sent: list[dict], *responses: dict) -> None:
+    answers = iter(responses)
+
+    async def send(payload):
+        sent.append(payload)
+        return next(answers)
+
+    monkeypatch.setattr(hardcover, "_send", send)
+
+
+def _search(name: str):
+    return asyncio.run(hardcover.execute(hardcover.SEARCH_AUTHORS, {"query": name}))
+
+
+def test_transient_error_keeps_persisted_queries(monkeypatch, sent):
+    _answer(monkeypatch, sent, {"errors": [{"message": "Too many requests"}]})
+    assert _search("le guin") is None
+    assert len(sent) == 1
+    assert hardcover._persisted_queries_supported
+
+
+def test_unsupported_server_falls_back_to_text(monkeypatch, sent):
+    _answer(
+        monkeypatch,
+        sent,
+        {"errors": [{"message": "the key 'query' was not present"}]},
+        {"data": {"search": {}}},
+    )
+    assert _search("le guin") == {"search": {}}
+    assert "query" in sent[1] and "extensions" not in sent[1]
+    assert not hardcover._persisted_queries_supported
+
+
+def test_unknown_hash_sends_text_once(monkeypatch, sent):
+    _answer(
+        monkeypatch,
+        sent,
+        {"errors": [{"message": hardcover.PERSISTED_QUERY_NOT_FOUND}]},
+        {"data": {"search": {}}},
+    )
+    assert _search("le guin") == {"search": {}}
+    assert "query" in sent[1] and "extensions" in sent[1]
+    assert hardcover._persisted_queries_supported
+
+
+def test_cache_and_rate_limit_follow_the_config(monkeypatch):
+    config = AppConfig.model_construct(
+        external_apis=ExternalAPIConfig(
+            hardcover_cache_ttl=30,
+            rate_limit_requests=5,
+            rate_limit_window=10,
+        ),
+    )
+    monkeypatch.setattr(hardcover, "get_config", lambda: config)
+    monkeypatch.setattr(hardcover, "_response_cache", None)
+    monkeypatch.setattr(hardcover, "_rate_limiter", None)
+    assert hardcover.get_response_cache().ttl == 30
+    assert hardcover.get_rate_limiter().limit == 5
+
+    new = config.model_copy(
+        update={
+            "external_apis": config.external_apis.model_copy(
+                update={"hardcover_cache_ttl": 60, "rate_limit_requests": 7},
+            ),
+        },
+    )
+    hardcover.on_config_change(config, new)
+    assert hardcover.get_response_cache().ttl == 60
+    assert hardcover.get_rate_limiter().limit == 7
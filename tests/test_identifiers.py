@@ -0,0 +1,46 @@
+"""Tests for ISBN/ASIN normalization."""
+
+import pytest
+
+from fastlibrarian.modules.identifiers import (
+    ASIN,
+    ISBN,
+    edition_identifiers,
+    normalize_identifier,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("9780306406157", (ISBN, "9780306406157")),
+        ("978-0-306-40615-7", (ISBN, "9780306406157")),
+        (9780306406157, (ISBN, "9780306406157")),
+        ("0306406152", (ISBN, "9780306406157")),
+        ("0 306 40615 2", (ISBN, "9780306406157")),
+        ("080442957x", (ISBN, "9780804429573")),
+        ("b00zv9pxp2", (ASIN, "B00ZV9PXP2")),
+    ],
+)
+def test_normalize_identifier(value, expected):
+    assert normalize_identifier(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, "", "9780306406158", "9790306406157", "0306406153", "B00ZV9PX", "hello"],
+)
+def test_normalize_identifier_rejects_invalid(value):
+    assert normalize_identifier(value) is None
+
+
+def test_edition_identifiers_merges_isbn_forms():
+    editions = [
+        {"isbn_13": "9780306406157", "isbn_10": "0306406152"},
+        {"asin": "B00ZV9PXP2", "isbn_13": "9780306406158"},
+    ]
+    assert edition_identifiers(editions) == {
+        (ISBN, "9780306406157"),
+        (ASIN, "B00ZV9PXP2"),
+    }
+    assert edition_identifiers(None) == set()
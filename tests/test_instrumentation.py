@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from fastlibrarian import instrumentation
+from fastlibrarian.db import AsyncSessionLocal
+
+
+def test_failed_statement_is_counted_and_unwound(run):
+    instrumentation.install()
+    stats = instrumentation.RequestStats()
+
+    async def scenario():
+        token = instrumentation._current.set(stats)
+        try:
+            async with AsyncSessionLocal() as session:
+                with pytest.raises(OperationalError):
+                    await session.execute(text("SELECT * FROM no_such_table"))
+                await session.rollback()
+                await session.execute(text("SELECT 1"))
+                conn = await session.connection()
+                return (await conn.get_raw_connection()).info.get("query_start")
+        finally:
+            instrumentation._current.reset(token)
+
+    assert run(scenario) == []
+    assert stats.queries == 2
+    assert stats.failed_queries == 1
@@ -0,0 +1,51 @@
+from sqlalchemy import select
+
+from fastlibrarian.config import get_config
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.schemas import BookStatus
+from fastlibrarian.modules import scanner
+
+
+def test_scan_marks_matched_books_in_batches(run, tmp_path, monkeypatch):
+    monkeypatch.setattr(scanner, "WRITE_BATCH_SIZE", 1)
+    titles = ["The Dispossessed", "The Left Hand of Darkness", "The Lathe of Heaven"]
+    library = tmp_path / "library"
+    library.mkdir()
+    for title in titles:
+        (library / f"{title}.epub").write_bytes(b"epub")
+    (library / "The Lathe of Heavem.m4b").write_bytes(b"audio")
+    config = get_config()
+    config = config.model_copy(
+        update={
+            "library": config.library.model_copy(
+                update={"root_folders": [str(library)]},
+            ),
+        },
+    )
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            session.add_all(
+                Book(
+                    title=title,
+                    status=BookStatus.Wanted,
+                    a_status=BookStatus.Wanted,
+                    external_refs={},
+                    editions=[],
+                )
+                for title in [*titles, "Always Coming Home"]
+            )
+            await session.commit()
+            summary = await scanner.scan_library(session, config)
+            result = await session.execute(
+                select(Book.title, Book.status, Book.a_status),
+            )
+            return summary, {title: (s, a) for title, s, a in result.all()}
+
+    summary, books = run(scenario)
+    assert summary.scanned == 4
+    assert summary.matched == 4
+    assert books["The Dispossessed"] == (BookStatus.Have, BookStatus.Wanted)
+    assert books["The Lathe of Heaven"] == (BookStatus.Have, BookStatus.Have)
+    assert books["Always Coming Home"] == (BookStatus.Wanted, BookStatus.Wanted)
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.models.authors import Author
+from fastlibrarian.modules import hardcover
+from fastlibrarian.modules.hardcover import HardcoverAPI, HardcoverError
+from fastlibrarian.scheduler import RefreshScheduler
+
+
+def test_failing_author_does_not_block_the_queue(run, monkeypatch):
+    async def get_works(self, id):
+        if int(id) == 1:
+            raise HardcoverError("server error")
+        return
+        yield []
+
+    monkeypatch.setattr(HardcoverAPI, "get_works", get_works)
+    monkeypatch.setattr(hardcover, "api_key", lambda apis: "key")
+    scheduler = RefreshScheduler()
+
+    async def step() -> None:
+        await scheduler.step()
+        async with AsyncSessionLocal() as session:
+            # Skip the pacing delay between refreshes
+            await scheduler._set_next_run_at(session, datetime(2000, 1, 1))
+
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            session.add_all(
+                [
+                    Author(name="Failing", external_refs={"hardcover_id": 1}),
+                    Author(name="Working", external_refs={"hardcover_id": 2}),
+                ],
+            )
+            await session.commit()
+        refreshed = []
+        for _ in range(3):
+            await step()
+            refreshed.append(scheduler.last_author_id)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(
+                    Author.name,
+                    Author.refresh_failures,
+                    Author.refresh_retry_at,
+                    Author.last_refreshed_at,
+                ),
+            )
+            return refreshed, {row.name: row for row in result.all()}
+
+    refreshed, authors = run(scenario)
+    # The third step finds nothing due: one author is backing off, the
+    # other was just refreshed
+    assert len(set(refreshed)) == 2
+    assert authors["Failing"].refresh_failures == 1
+    assert authors["Failing"].refresh_retry_at is not None
+    assert authors["Failing"].last_refreshed_at is None
+    assert authors["Working"].refresh_failures == 0
+    assert authors["Working"].last_refreshed_at is not None
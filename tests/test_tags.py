@@ -0,0 +1,37 @@
+from sqlalchemy import insert
+
+from fastlibrarian.db import AsyncSessionLocal
+from fastlibrarian.events import event_bus
+from fastlibrarian.models.books import Book
+from fastlibrarian.models.schemas import BookStatus
+from fastlibrarian.models.shared import Tags, book_tags
+from fastlibrarian.routers.tags import delete_tag
+
+
+def test_deleting_a_tag_publishes_its_books(run):
+    async def scenario():
+        subscription = event_bus.subscribe()
+        try:
+            async with AsyncSessionLocal() as session:
+                tag = Tags(name="solarpunk")
+                book = Book(
+                    title="A Psalm for the Wild-Built",
+                    status=BookStatus.Wanted,
+                    a_status=BookStatus.Wanted,
+                    external_refs={},
+                    editions=[],
+                )
+                session.add_all([tag, book])
+                await session.flush()
+                await session.execute(
+                    insert(book_tags),
+                    [{"book_id": book.id, "tag_id": tag.id}],
+                )
+                await session.commit()
+                await delete_tag(tag.id, db=session)
+            change = subscription.queue.get_nowait()
+            return change.kind, change.action, change.id == book.id
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    assert run(scenario) == ("book", "updated", True)